@@ -3,6 +3,7 @@ from hashlib import md5
 
 from misago.core import threadstore
 
+from . import version as acl_version
 from .forms import get_permissions_forms
 
 
@@ -34,4 +35,8 @@ def override_acl(user, new_acl):
         user.save(update_fields=['acl_key'])
         threadstore.set('acl_%s' % user.acl_key, final_cache)
     else:
+        # anonymous pages cache is keyed with ACL version, so it has to change
+        # for guests to see pages rendered with overridden permissions
+        acl_version.invalidate()
+        final_cache['_acl_version'] = acl_version.get_version()
         threadstore.set('acl_%s' % user.acl_key, final_cache)
@@ -0,0 +1,46 @@
+from django.db import connection
+from django.test import TestCase
+
+from misago.admin.views.generic.paginator import EstimatedCountPaginator
+from misago.core.models import CacheVersion
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        CacheVersion.objects.all().delete()
+        for _ in range(10):
+            CacheVersion.objects.create(cache='nomatter')
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE %s' % CacheVersion._meta.db_table)
+
+        # estimate is now stale and smaller than real count
+        for _ in range(5):
+            CacheVersion.objects.create(cache='nomatter')
+
+        self.paginator = EstimatedCountPaginator(CacheVersion.objects.order_by('id'), 4)
+        self.paginator.exact_count_below = 0
+
+    def test_page_past_estimate(self):
+        """paginator displays pages past estimated count"""
+        self.assertTrue(self.paginator.count < 15)
+        self.assertTrue(self.paginator.is_estimated)
+
+        page = self.paginator.page(4)
+        self.assertEqual(len(page.object_list), 3)
+        self.assertFalse(page.has_next())
+        self.assertEqual(page.end_index(), 15)
+
+    def test_page_has_next(self):
+        """paginator tells if there is next page from fetched rows"""
+        page = self.paginator.page(3)
+        self.assertEqual(len(page.object_list), 4)
+        self.assertTrue(page.has_next())
+
+    def test_use_exact_count(self):
+        """paginator counts rows exactly when asked to"""
+        self.paginator.use_exact_count()
+
+        self.assertFalse(self.paginator.is_estimated)
+        self.assertEqual(self.paginator.count, 15)
+        self.assertEqual(self.paginator.num_pages, 4)
@@ -1,7 +1,7 @@
 from urllib.parse import urlencode
 
 from django.contrib import messages
-from django.core.paginator import EmptyPage, Paginator
+from django.core.paginator import EmptyPage
 from django.db import transaction
 from django.shortcuts import redirect
 from django.urls import reverse
@@ -10,6 +10,7 @@ from django.utils.translation import ugettext_lazy as _
 from misago.core.exceptions import ExplicitFirstPage
 
 from .base import AdminView
+from .paginator import EstimatedCountPaginator
 
 
 class MassActionError(Exception):
@@ -27,11 +28,14 @@ class ListView(AdminView):
                      (enter 0 or don't define for no pagination)
     ordering = tuple of tuples defining allowed orderings
                typles should follow this format: (name, order_by)
+    keyset_ordering = orderings for which next page link points to items after
+                      last item on current page instead of using OFFSET
     """
     template = 'list.html'
 
     items_per_page = 0
     ordering = None
+    keyset_ordering = ('id', '-id')
 
     extra_actions = None
     mass_actions = None
@@ -76,6 +80,7 @@ class ListView(AdminView):
             'items': self.get_queryset(),
             'paginator': None,
             'page': None,
+            'next_page_querystring': '',
             'order_by': [],
             'order': None,
             'search_form': None,
@@ -146,7 +151,12 @@ class ListView(AdminView):
 
         if self.items_per_page:
             try:
-                self.paginate_items(context, kwargs.get('page', 0))
+                self.paginate_items(
+                    context,
+                    kwargs.get('page', 0),
+                    request.GET.get('cursor'),
+                    bool(request.GET.get('last')),
+                )
             except EmptyPage:
                 return redirect('%s%s' % (reverse(self.root_link), context['querystring']))
 
@@ -155,7 +165,7 @@ class ListView(AdminView):
 
         return self.render(request, context)
 
-    def paginate_items(self, context, page):
+    def paginate_items(self, context, page, cursor=None, last=False):
         try:
             page = int(page)
             if page == 1:
@@ -165,12 +175,58 @@ class ListView(AdminView):
         except ValueError:
             page = 1
 
-        context['paginator'] = Paginator(
+        context['paginator'] = EstimatedCountPaginator(
             context['items'], self.items_per_page, allow_empty_first_page=True
         )
-        context['page'] = context['paginator'].page(page)
+
+        if last:
+            # last page is only known from exact count
+            context['paginator'].use_exact_count()
+            page = context['paginator'].num_pages
+
+        keyset_queryset = None
+        if page > 1 and cursor:
+            keyset_queryset = self.get_keyset_queryset(context, cursor)
+
+        if keyset_queryset is not None:
+            context['page'] = context['paginator'].keyset_page(page, keyset_queryset)
+        else:
+            context['page'] = context['paginator'].page(page)
         context['items'] = context['page'].object_list
 
+        context['next_page_querystring'] = self.make_next_page_querystring(context)
+        context['last_page_querystring'] = self.make_last_page_querystring(context)
+
+    def is_keyset_ordering(self, context):
+        return context['order'] and context['order']['order_by'] in self.keyset_ordering
+
+    def get_keyset_queryset(self, context, cursor):
+        if not self.is_keyset_ordering(context):
+            return None
+
+        try:
+            cursor = int(cursor)
+        except ValueError:
+            return None
+
+        if context['order']['order_by'][0] == '-':
+            return context['items'].filter(pk__lt=cursor)
+        return context['items'].filter(pk__gt=cursor)
+
+    def make_next_page_querystring(self, context):
+        querystring = context['querystring']
+        items = list(context['items'])
+        if not items or not self.is_keyset_ordering(context):
+            return querystring
+
+        separator = '&' if querystring else '?'
+        return '%s%scursor=%s' % (querystring, separator, items[-1].pk)
+
+    def make_last_page_querystring(self, context):
+        querystring = context['querystring']
+        separator = '&' if querystring else '?'
+        return '%s%slast=1' % (querystring, separator)
+
     # Filter list items
     search_form = None
 
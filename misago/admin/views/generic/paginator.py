@@ -0,0 +1,84 @@
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.utils.functional import cached_property
+
+from misago.core.pgutils import estimate_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses planner's estimate for count of rows in big, unfiltered
+    tables instead of running COUNT(*) on every page load
+
+    Because estimate may be off, pages are not clamped to it. Instead one row
+    more than fits on page is fetched to tell if there is next page. Exact
+    count is only ran when use_exact_count() is called.
+    """
+    is_estimated = False
+    exact_count_below = 10000
+
+    @cached_property
+    def count(self):
+        estimated_count = estimate_count(self.object_list, self.exact_count_below)
+        if estimated_count is None:
+            return super().count
+
+        self.is_estimated = True
+        return estimated_count
+
+    @cached_property
+    def exact_count(self):
+        return self.object_list.count()
+
+    def use_exact_count(self):
+        self.__dict__['count'] = self.exact_count
+        self.__dict__.pop('num_pages', None)
+        self.is_estimated = False
+
+    def validate_number(self, number):
+        if not self.count or not self.is_estimated:
+            return super().validate_number(number)
+
+        # estimate may be off, so don't refuse to display pages past it
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_estimated:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        return self.get_page(self.object_list[bottom:bottom + self.per_page + 1], number)
+
+    def keyset_page(self, number, queryset):
+        """
+        Returns page with items from queryset that was already filtered to begin
+        after last item on previous page, avoiding deep OFFSET
+        """
+        number = self.validate_number(number)
+        return self.get_page(queryset[:self.per_page + 1], number)
+
+    def get_page(self, object_list, number):
+        object_list = list(object_list)
+        if number > 1 and not object_list:
+            raise EmptyPage("That page contains no results")
+
+        has_next = len(object_list) > self.per_page
+        return EstimatedCountPage(object_list[:self.per_page], number, self, has_next)
+
+
+class EstimatedCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
@@ -1,11 +1,19 @@
 from rest_framework import viewsets
 from rest_framework.response import Response
 
-from .serializers import CategoryWithPosterSerializer as CategorySerializer
-from .utils import get_categories_tree
+from misago.threads.etags import get_etag, get_not_modified_response
+
+from .tree import get_activity
+from .utils import get_categories_index
 
 
 class CategoryViewSet(viewsets.ViewSet):
     def list(self, request):
-        categories_tree = get_categories_tree(request.user, join_posters=True)
-        return Response(CategorySerializer(categories_tree, many=True).data)
+        etag = get_etag(request, get_activity()['version'])
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+
+        response = Response(get_categories_index(request.user))
+        response['ETag'] = etag
+        return response
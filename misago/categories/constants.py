@@ -1,2 +1,4 @@
 PRIVATE_THREADS_ROOT_NAME = 'private_threads'
 THREADS_ROOT_NAME = 'root_category'
+
+CATEGORIES_CACHEBUSTER = 'misago_categories'
@@ -4,6 +4,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from misago.categories.models import Category
+from misago.threads.delete import delete_threads
 
 
 class Command(BaseCommand):
@@ -26,24 +27,26 @@ class Command(BaseCommand):
             if category.prune_started_after:
                 cutoff = now - timedelta(days=category.prune_started_after)
                 prune_qs = threads_qs.filter(started_on__lte=cutoff)
-                for thread in prune_qs.iterator():
-                    if archive:
+                if archive:
+                    for thread in prune_qs.iterator():
                         thread.move(archive)
                         thread.save()
-                    else:
-                        thread.delete()
-                    pruned_threads += 1
+                        pruned_threads += 1
+                else:
+                    pruned_threads += prune_qs.count()
+                    delete_threads(prune_qs)
 
             if category.prune_replied_after:
                 cutoff = now - timedelta(days=category.prune_replied_after)
                 prune_qs = threads_qs.filter(last_post_on__lte=cutoff)
-                for thread in prune_qs.iterator():
-                    if archive:
+                if archive:
+                    for thread in prune_qs.iterator():
                         thread.move(archive)
                         thread.save()
-                    else:
-                        thread.delete()
-                    pruned_threads += 1
+                        pruned_threads += 1
+                else:
+                    pruned_threads += prune_qs.count()
+                    delete_threads(prune_qs)
 
             if pruned_threads:
                 if category not in synchronize_categories:
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from misago.categories.constants import CATEGORIES_CACHEBUSTER
+from misago.core.migrationutils import cachebuster_register_cache
+
+
+def register_categories_version_tracker(apps, schema_editor):
+    cachebuster_register_cache(apps, CATEGORIES_CACHEBUSTER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('misago_categories', '0007_best_answers_roles'),
+        ('misago_core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(register_categories_version_tracker),
+    ]
@@ -6,11 +6,13 @@ from django.db import models
 from misago.acl import version as acl_version
 from misago.acl.models import BaseRole
 from misago.conf import settings
+from misago.core import cachebuster
 from misago.core.cache import cache
 from misago.core.utils import slugify
 from misago.threads.threadtypes import trees_map
 
-from . import PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
+from . import CATEGORIES_CACHEBUSTER, PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
+from .tree import clear_activity, clear_tree, get_tree
 
 
 CACHE_NAME = 'misago_categories_tree'
@@ -54,6 +56,12 @@ class CategoryManager(TreeManager):
 
     def clear_cache(self):
         cache.delete(CACHE_NAME)
+        self.invalidate_tree()
+        clear_activity()
+
+    def invalidate_tree(self):
+        cachebuster.invalidate(CATEGORIES_CACHEBUSTER)
+        clear_tree()
 
 
 class Category(MPTTModel):
@@ -113,6 +121,14 @@ class Category(MPTTModel):
     def thread_type(self):
         return trees_map.get_type_for_tree_id(self.tree_id)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # counters and last thread change with every post, don't rebuild tree for them
+        if get_tree().is_structure_changed(self):
+            Category.objects.invalidate_tree()
+        clear_activity()
+
     def delete(self, *args, **kwargs):
         Category.objects.clear_cache()
         acl_version.invalidate()
@@ -1,8 +1,11 @@
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 
+from misago.acl import version as acl_version
 from misago.users.signals import anonymize_user_data, username_changed
 
-from .models import Category
+from .models import Category, RoleCategoryACL
+from .tree import clear_activity
 
 
 delete_category_content = Signal()
@@ -15,3 +18,9 @@ def update_usernames(sender, **kwargs):
         last_poster_name=sender.username,
         last_poster_slug=sender.slug,
     )
+    clear_activity()
+
+
+@receiver([post_save, post_delete], sender=RoleCategoryACL)
+def invalidate_acl_version(sender, **kwargs):
+    acl_version.invalidate()
@@ -0,0 +1,83 @@
+from misago.categories.models import Category
+from misago.categories.tree import get_tree
+from misago.core.testutils import MisagoTestCase
+
+
+class CategoriesTreeTests(MisagoTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.root = Category.objects.root_category()
+        self.first_category = Category.objects.get(slug='first-category')
+
+        self.category = Category(name='Category', slug='category')
+        self.category.insert_at(self.root, position='last-child', save=True)
+
+        self.subcategory = Category(name='Subcategory', slug='subcategory')
+        self.subcategory.insert_at(self.category, position='last-child', save=True)
+
+        self.category = Category.objects.get(pk=self.category.pk)
+        self.subcategory = Category.objects.get(pk=self.subcategory.pk)
+
+    def test_get_categories(self):
+        """get_categories returns visible categories in tree order"""
+        categories = get_tree().get_categories([self.subcategory.pk, self.first_category.pk])
+        self.assertEqual(categories, [self.first_category, self.subcategory])
+
+    def test_get_categories_include_root(self):
+        """get_categories includes root category with linked parents"""
+        categories = get_tree().get_categories([self.category.pk], include_root=True)
+        self.assertEqual(categories, [self.root, self.category])
+        self.assertIs(categories[1].parent, categories[0])
+
+    def test_get_categories_for_parent(self):
+        """get_categories returns only parent's descendants"""
+        visible_categories = [self.first_category.pk, self.category.pk, self.subcategory.pk]
+
+        categories = get_tree().get_categories(visible_categories, parent=self.category)
+        self.assertEqual(categories, [self.subcategory])
+
+    def test_get_path(self):
+        """get_path returns category's ancestors"""
+        path = get_tree().get_path(self.subcategory)
+        self.assertEqual(path, [self.root, self.category, self.subcategory])
+
+    def test_categories_are_copies(self):
+        """changes in returned categories don't leak to snapshot"""
+        category = get_tree().get_categories([self.category.pk])[0]
+        category.name = 'Changed'
+
+        category = get_tree().get_categories([self.category.pk])[0]
+        self.assertEqual(category.name, 'Category')
+
+    def test_tree_is_cached(self):
+        """tree snapshot is reused until it's invalidated"""
+        tree = get_tree()
+        with self.assertNumQueries(0):
+            self.assertIs(get_tree(), tree)
+
+    def test_save_invalidates_tree(self):
+        """saving category invalidates tree snapshot"""
+        get_tree()
+
+        self.category.name = 'Renamed'
+        self.category.save()
+
+        category = get_tree().get_categories([self.category.pk])[0]
+        self.assertEqual(category.name, 'Renamed')
+
+    def test_activity_change_keeps_tree(self):
+        """saving category counters doesn't invalidate tree, but updates its activity"""
+        tree = get_tree()
+
+        self.category.threads = 5
+        self.category.posts = 10
+        self.category.last_thread_title = 'Last thread'
+        self.category.save()
+
+        self.assertIs(get_tree(), tree)
+
+        category = get_tree().get_categories([self.category.pk])[0]
+        self.assertEqual(category.threads, 5)
+        self.assertEqual(category.posts, 10)
+        self.assertEqual(category.last_thread_title, 'Last thread')
@@ -1,7 +1,11 @@
 from misago.acl.testutils import override_acl
 from misago.categories.models import Category
-from misago.categories.utils import get_categories_tree, get_category_path
+from misago.categories.utils import (
+    INDEX_CACHE, get_categories_index, get_categories_tree, get_category_path)
 from misago.core import threadstore
+from misago.core.cache import cache
+from misago.readtracker import poststracker
+from misago.threads import testutils
 from misago.users.testutils import AuthenticatedUserTestCase
 
 
@@ -112,6 +116,48 @@ class CategoriesUtilsTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(len(categories_tree), 0)
 
+    def test_get_categories_index(self):
+        """get_categories_index returns serialized categories tree"""
+        index = get_categories_index(self.user)
+        self.assertEqual([c['id'] for c in index], [
+            self.first_category.pk,
+            self.category_a.pk,
+            self.category_e.pk,
+        ])
+        self.assertEqual(index[1]['subcategories'][0]['id'], self.category_b.pk)
+
+    def test_get_categories_index_is_cached(self):
+        """get_categories_index caches index for user's acl key"""
+        get_categories_index(self.user)
+
+        cached_index = cache.get('%s_%s' % (INDEX_CACHE, self.user.acl_key))
+        self.assertEqual(len(cached_index['categories']), 3)
+
+    def test_get_categories_index_read_state(self):
+        """get_categories_index sets read state for user on cached index"""
+        testutils.post_thread(self.category_b)
+
+        index = get_categories_index(self.user)
+        self.assertFalse(index[1]['is_read'])
+        self.assertFalse(index[1]['subcategories'][0]['is_read'])
+        self.assertTrue(index[0]['is_read'])
+
+        cached_index = cache.get('%s_%s' % (INDEX_CACHE, self.user.acl_key))
+        self.assertTrue(cached_index['categories'][1]['is_read'])
+
+    def test_get_categories_index_read_state_after_read(self):
+        """get_categories_index updates read state after user reads post"""
+        thread = testutils.post_thread(self.category_b)
+
+        index = get_categories_index(self.user)
+        self.assertFalse(index[1]['subcategories'][0]['is_read'])
+
+        poststracker.save_read(self.user, thread.first_post)
+
+        index = get_categories_index(self.user)
+        self.assertTrue(index[1]['is_read'])
+        self.assertTrue(index[1]['subcategories'][0]['is_read'])
+
     def test_get_category_path(self):
         """get_categories_tree returns all children of root nodes"""
         for node in get_categories_tree(self.user):
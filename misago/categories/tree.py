@@ -0,0 +1,163 @@
+"""
+Process-wide snapshot of categories tree
+
+Instead of querying categories table on every request, categories rows are
+loaded once per process and kept in immutable snapshot. Snapshot is rebuilt
+lazily when categories cachebuster's version changes.
+
+Snapshot is invalidated only by changes to categories structure. Categories
+activity (counters and last thread) changes with every post, so it's kept
+separately in cache, which is cleared after posting, and set on categories
+returned from snapshot.
+
+Snapshot never hands out its own data. Every call returns new Category
+instances, that can be safely mutated by views (eg. with acl or counters).
+"""
+from threading import Lock
+from uuid import uuid4
+
+from django.db import transaction
+
+from misago.core import cachebuster
+from misago.core.cache import cache
+from misago.threads.threadtypes import trees_map
+
+from .constants import CATEGORIES_CACHEBUSTER, THREADS_ROOT_NAME
+
+
+ACTIVITY_CACHE = 'misago_categories_activity'
+ACTIVITY_FIELDS = (
+    'threads',
+    'posts',
+    'last_post_on',
+    'last_thread_id',
+    'last_thread_title',
+    'last_thread_slug',
+    'last_poster_id',
+    'last_poster_name',
+    'last_poster_slug',
+)
+
+_tree_cache = {}
+_tree_lock = Lock()
+
+
+class CategoriesTree(object):
+    def __init__(self, version, db, fields, rows):
+        self.version = version
+        self.db = db
+        self.fields = tuple(fields)
+        self.rows = tuple(rows)
+        self.rows_dict = {row['id']: row for row in self.rows}
+
+    def is_structure_changed(self, category):
+        """tells if category differs from snapshot in other fields than activity"""
+        row = self.rows_dict.get(category.pk)
+        if not row:
+            return True
+
+        for field in self.fields:
+            if field not in ACTIVITY_FIELDS and getattr(category, field) != row[field]:
+                return True
+        return False
+
+    def get_categories(self, categories_ids, parent=None, include_root=False):
+        threads_tree_id = trees_map.get_tree_id_for_root(THREADS_ROOT_NAME)
+        categories_ids = set(categories_ids)
+
+        rows = []
+        for row in self.rows:
+            if row['tree_id'] != threads_tree_id:
+                continue
+
+            if parent:
+                if row['lft'] <= parent.lft or row['rght'] >= parent.rght:
+                    continue
+            elif include_root and not row['level']:
+                rows.append(row)
+                continue
+
+            if row['id'] in categories_ids:
+                rows.append(row)
+
+        return self.build_categories(rows, get_activity())
+
+    def get_path(self, category):
+        rows = []
+        for row in self.rows:
+            if row['tree_id'] != category.tree_id:
+                continue
+            if row['lft'] <= category.lft and row['rght'] >= category.rght:
+                rows.append(row)
+
+        return self.build_categories(sorted(rows, key=lambda r: r['level']))
+
+    def build_categories(self, rows, activity=None):
+        from .models import Category
+
+        categories = []
+        categories_dict = {}
+
+        for row in rows:
+            category = Category.from_db(self.db, self.fields, [row[f] for f in self.fields])
+            if activity and category.pk in activity['categories']:
+                category.__dict__.update(activity['categories'][category.pk])
+            categories_dict[category.pk] = category
+            categories.append(category)
+
+            if category.parent_id in categories_dict:
+                category.parent = categories_dict[category.parent_id]
+
+        return categories
+
+
+def get_tree():
+    version = cachebuster.get_version(CATEGORIES_CACHEBUSTER)
+
+    tree = _tree_cache.get('tree')
+    if tree is None or tree.version != version:
+        with _tree_lock:
+            tree = _tree_cache.get('tree')
+            if tree is None or tree.version != version:
+                tree = build_tree(version)
+                _tree_cache['tree'] = tree
+    return tree
+
+
+def build_tree(version):
+    from .models import Category
+
+    fields = [f.attname for f in Category._meta.concrete_fields]
+    queryset = Category.objects.order_by('tree_id', 'lft').values(*fields)
+    return CategoriesTree(version, queryset.db, fields, queryset.iterator())
+
+
+def clear_tree():
+    _tree_cache.pop('tree', None)
+
+
+def get_activity():
+    activity = cache.get(ACTIVITY_CACHE)
+    if activity is None:
+        activity = build_activity()
+        cache.set(ACTIVITY_CACHE, activity)
+    return activity
+
+
+def build_activity():
+    from .models import Category
+
+    categories = {}
+    for row in Category.objects.values('id', *ACTIVITY_FIELDS):
+        categories[row.pop('id')] = row
+
+    return {
+        'version': uuid4().hex,
+        'categories': categories,
+    }
+
+
+def clear_activity():
+    cache.delete(ACTIVITY_CACHE)
+    # clear it again after commit, in case it was rebuilt from stale data
+    transaction.on_commit(lambda: cache.delete(ACTIVITY_CACHE))
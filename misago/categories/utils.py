@@ -1,23 +1,33 @@
+from django.contrib.auth import get_user_model
+
 from misago.acl import add_acl
+from misago.acl import version as acl_version
+from misago.core.cache import cache
 from misago.readtracker import categoriestracker
+from misago.readtracker import version as read_version
+from misago.readtracker.dates import get_cutoff_date
+
+from .serializers import CategoryWithPosterSerializer
+from .tree import get_activity, get_tree
+
 
-from .models import Category
+INDEX_CACHE = 'misago_categories_index'
+UNREAD_CACHE = 'misago_categories_unread'
+UNREAD_CACHE_TIMEOUT = 15 * 60  # posts get older than cutoff date as time passes
 
+UserModel = get_user_model()
 
-def get_categories_tree(user, parent=None, join_posters=False):
+
+def get_categories_tree(user, parent=None, join_posters=False, read_aware=True):
     if not user.acl_cache['visible_categories']:
         return []
 
-    if parent:
-        queryset = parent.get_descendants().order_by('lft')
-    else:
-        queryset = Category.objects.all_categories()
-
-    queryset_with_acl = queryset.filter(id__in=user.acl_cache['visible_categories'])
+    visible_categories = get_tree().get_categories(
+        user.acl_cache['visible_categories'],
+        parent=parent,
+    )
     if join_posters:
-        queryset_with_acl = queryset_with_acl.select_related('last_poster')
-
-    visible_categories = list(queryset_with_acl)
+        add_last_posters(visible_categories)
 
     categories_dict = {}
     categories_list = []
@@ -33,7 +43,10 @@ def get_categories_tree(user, parent=None, join_posters=False):
             categories_dict[category.parent_id].subcategories.append(category)
 
     add_acl(user, categories_list)
-    categoriestracker.make_read_aware(user, categories_list)
+    if read_aware:
+        categoriestracker.make_read_aware(user, categories_list)
+    else:
+        categoriestracker.make_read(categories_list)
 
     for category in reversed(visible_categories):
         if category.acl['can_browse']:
@@ -69,6 +82,112 @@ def get_categories_tree(user, parent=None, join_posters=False):
     return flat_list
 
 
+def add_last_posters(categories):
+    posters_ids = set(c.last_poster_id for c in categories if c.last_poster_id)
+    if not posters_ids:
+        return
+
+    posters = UserModel.objects.in_bulk(posters_ids)
+    for category in categories:
+        if category.last_poster_id:
+            # poster may have been deleted since categories tree was loaded
+            category.last_poster = posters.get(category.last_poster_id)
+
+
+def get_categories_index(user):
+    """
+    Returns serialized categories index for user
+
+    Index is serialized once for all users sharing acl key and is rebuilt only
+    when categories activity changes. Only read state is set on it for current
+    user, from unread categories cached until user reads post or activity changes.
+    """
+    if not user.acl_cache['visible_categories']:
+        return []
+
+    index = get_cached_categories_index(user)
+    set_categories_read_state(index, get_unread_categories(user))
+    return index
+
+
+def get_cached_categories_index(user):
+    cache_key = '%s_%s' % (INDEX_CACHE, user.acl_key)
+    version = [acl_version.get_version(), get_tree().version, get_activity()['version']]
+    visible_categories = sorted(user.acl_cache['visible_categories'])
+
+    index = cache.get(cache_key)
+    if index:
+        index_is_valid = (
+            index['version'] == version and
+            index['visible_categories'] == visible_categories
+        )
+        if index_is_valid:
+            return index['categories']
+
+    categories_tree = get_categories_tree(user, join_posters=True, read_aware=False)
+    categories = CategoryWithPosterSerializer(categories_tree, many=True).data
+
+    cache.set(cache_key, {
+        'version': version,
+        'visible_categories': visible_categories,
+        'categories': categories,
+    })
+
+    return categories
+
+
+def get_unread_categories(user):
+    if user.is_anonymous:
+        return set()
+
+    cache_key = '%s_%s' % (UNREAD_CACHE, user.pk)
+    version = [
+        acl_version.get_version(),
+        user.acl_key,
+        get_tree().version,
+        get_activity()['version'],
+        read_version.get_version(user.pk),
+    ]
+
+    unread_categories = cache.get(cache_key)
+    if unread_categories and unread_categories['version'] == version:
+        return set(unread_categories['categories'])
+
+    # only categories with posts newer than cutoff date can have unread posts
+    cutoff_date = get_cutoff_date(user)
+    categories = []
+    for category in get_tree().get_categories(user.acl_cache['visible_categories']):
+        if category.last_post_on and category.last_post_on > cutoff_date:
+            categories.append(category)
+
+    add_acl(user, categories)
+    categoriestracker.make_read_aware(user, categories)
+    categories_ids = [c.pk for c in categories if not c.is_read]
+
+    cache.set(cache_key, {
+        'version': version,
+        'categories': categories_ids,
+    }, UNREAD_CACHE_TIMEOUT)
+
+    return set(categories_ids)
+
+
+def set_categories_read_state(categories, unread_categories):
+    for category in categories:
+        set_categories_read_state(category['subcategories'], unread_categories)
+
+        category['is_read'] = category['id'] not in unread_categories
+        for subcategory in category['subcategories']:
+            if subcategory['acl'].get('can_browse') and not subcategory['is_read']:
+                category['is_read'] = False
+
+
+def flatten_categories_tree(categories_tree, key=lambda c: c.subcategories):
+    for category in categories_tree:
+        yield category
+        yield from flatten_categories_tree(key(category), key)
+
+
 def get_category_path(category):
     if category.special_role:
         return [category]
@@ -1,18 +1,33 @@
 from django.shortcuts import render
 from django.urls import reverse
 
-from misago.categories.serializers import CategoryWithPosterSerializer as CategorySerializer
-from misago.categories.utils import get_categories_tree
+from misago.categories.utils import get_categories_index
+from misago.core.utils import parse_iso8601_string
+from misago.threads.anonymouscache import make_response_cacheable
 
 
 def categories(request):
-    categories_tree = get_categories_tree(request.user, join_posters=True)
+    categories_index = get_categories_index(request.user)
 
     request.frontend_context.update({
-        'CATEGORIES': CategorySerializer(categories_tree, many=True).data,
+        'CATEGORIES': categories_index,
         'CATEGORIES_API': reverse('misago:api:category-list'),
     })
 
-    return render(request, 'misago/categories/list.html', {
-        'categories': categories_tree,
+    response = render(request, 'misago/categories/list.html', {
+        'categories': hydrate_categories_index(categories_index),
     })
+
+    make_response_cacheable(request, response)
+    return response
+
+
+def hydrate_categories_index(categories_index):
+    categories = []
+    for category in categories_index:
+        category = dict(category)
+        category['subcategories'] = hydrate_categories_index(category['subcategories'])
+        if category['last_post_on']:
+            category['last_post_on'] = parse_iso8601_string(category['last_post_on'])
+        categories.append(category)
+    return categories
@@ -197,6 +197,12 @@ MISAGO_ADMIN_SESSION_EXPIRATION = 60
 MISAGO_THREADS_ON_INDEX = True
 
 
+# Number of seconds for which threads lists, threads and categories pages are cached for guests
+# Cached pages are also invalidated when threads, posts or categories change. Change to 0 to disable.
+
+MISAGO_ANONYMOUS_CACHE_TIMEOUT = 300
+
+
 # Max age of notifications in days
 # Notifications older than this are deleted. On very active forums its better to keep this smaller.
 
@@ -271,6 +277,12 @@ MISAGO_ATTACHMENT_SECRET_LENGTH = 64
 MISAGO_ATTACHMENT_ORPHANED_EXPIRE = 24 * 60
 
 
+# Image served in place of image attachment's thumbnail until "processattachments"
+# task creates its renditions. This file will be sought within STATIC_ROOT directory
+
+MISAGO_ATTACHMENT_PROCESSING_IMAGE = 'misago/img/processing.png'
+
+
 # Names of files served when user requests file that doesn't exist or is unavailable
 # Those files will be sought within STATIC_ROOT directory
 
@@ -291,6 +303,15 @@ MISAGO_RANKING_LENGTH = 30
 MISAGO_RANKING_SIZE = 50
 
 
+# Controls if online tracker saves time of user's last click in database on every request
+# Users presence is also tracked in cache, so you may disable this on busy forums
+# to save database writes, providing your cache is shared between all processes
+# running your site. With this setting disabled, users last activity time is saved
+# only when they sign out.
+
+MISAGO_ONLINE_TRACKER_SAVE_CLICKS = True
+
+
 # Specifies the number of days that IP addresses are stored in the database before removing.
 # Change this setting to None to never remove old IP addresses.
 
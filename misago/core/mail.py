@@ -46,6 +46,6 @@ def mail_users(recipients, subject, template, sender=None, context=None):
         send_messages(messages)
 
 
-def send_messages(messages):
-    connection = djmail.get_connection()
+def send_messages(messages, connection=None):
+    connection = connection or djmail.get_connection()
     connection.send_messages(messages)
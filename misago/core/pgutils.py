@@ -1,7 +1,11 @@
 from django.core.paginator import Paginator
+from django.db import connection
 from django.db.models import Index
 
 
+ESTIMATE_COUNT_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+
+
 class PgPartialIndex(Index):
     suffix = 'part'
     max_name_length = 31
@@ -103,3 +107,22 @@ def chunk_queryset(queryset, chunk_size=20):
             last_pk = item.pk
             yield item
         chunk = ordered_queryset.filter(pk__lt=last_pk)[:chunk_size]
+
+
+def estimate_count(queryset, exact_below=10000):
+    """
+    Returns planner's estimate of number of rows in unfiltered queryset's table
+
+    Returns None if queryset is filtered or estimate is smaller than exact_below,
+    in which case exact count is cheap and should be used instead.
+    """
+    if queryset.query.where:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(ESTIMATE_COUNT_SQL, [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+
+    if not row or row[0] < exact_below:
+        return None
+    return row[0]
@@ -0,0 +1,28 @@
+from django.db import connection
+from django.test import TestCase
+
+from misago.core.models import CacheVersion
+from misago.core.pgutils import estimate_count
+
+
+class EstimateCountTests(TestCase):
+    def setUp(self):
+        for _ in range(10):
+            CacheVersion.objects.create(cache='nomatter')
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE %s' % CacheVersion._meta.db_table)
+
+    def test_estimate_count(self):
+        """estimate_count returns planner's estimate for unfiltered queryset"""
+        estimated_count = estimate_count(CacheVersion.objects.all(), exact_below=0)
+        self.assertIsNotNone(estimated_count)
+
+    def test_estimate_small_table(self):
+        """estimate_count returns None for tables that are cheap to count"""
+        self.assertIsNone(estimate_count(CacheVersion.objects.all()))
+
+    def test_estimate_filtered_queryset(self):
+        """estimate_count returns None for filtered queryset"""
+        queryset = CacheVersion.objects.filter(cache='nomatter')
+        self.assertIsNone(estimate_count(queryset, exact_below=0))
@@ -1,18 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_save
 from django.dispatch import Signal, receiver
 
 from misago.categories import PRIVATE_THREADS_ROOT_NAME
 from misago.categories.signals import delete_category_content, move_category_content
-from misago.threads.signals import merge_thread, move_thread, merge_post, move_post
+from misago.threads.signals import (
+    delete_threads_content, merge_post, merge_thread, move_post, move_thread)
 
+from . import version as read_version
+from .models import PostRead
+
+
+UserModel = get_user_model()
 
 thread_read = Signal(providing_args=["thread"])
 
 
+@receiver(post_save, sender=PostRead)
+def invalidate_read_version(sender, instance, created, **kwargs):
+    if created:
+        read_version.invalidate(instance.user_id)
+
+
 @receiver(delete_category_content)
 def delete_category_threads(sender, **kwargs):
     sender.postread_set.all().delete()
 
 
+@receiver(delete_threads_content)
+def delete_threads_tracker(sender, **kwargs):
+    PostRead.objects.filter(thread_id__in=kwargs['threads']).delete()
+
+
 @receiver(move_category_content)
 def move_category_tracker(sender, **kwargs):
     sender.postread_set.update(category=kwargs['new_category'])
@@ -55,4 +75,6 @@ def decrease_unread_private_count(sender, **kwargs):
 
     if user.unread_private_threads:
         user.unread_private_threads -= 1
-        user.save(update_fields=['unread_private_threads'])
+        UserModel.objects.filter(pk=user.pk, unread_private_threads__gt=0).update(
+            unread_private_threads=F('unread_private_threads') - 1,
+        )
@@ -0,0 +1,19 @@
+from uuid import uuid4
+
+from misago.core.cache import cache
+
+
+READ_VERSION_CACHE = 'misago_readtracker_version'
+
+
+def get_version(user_id):
+    cache_key = '%s_%s' % (READ_VERSION_CACHE, user_id)
+    version = cache.get(cache_key)
+    if not version:
+        version = uuid4().hex
+        cache.set(cache_key, version, None)
+    return version
+
+
+def invalidate(user_id):
+    cache.set('%s_%s' % (READ_VERSION_CACHE, user_id), uuid4().hex, None)
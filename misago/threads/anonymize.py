@@ -1,3 +1,4 @@
+from django.db.models.expressions import RawSQL
 from django.urls import reverse
 
 
@@ -10,21 +11,43 @@ ANONYMIZABLE_EVENTS = (
     'removed_participant',
 )
 
+ANONYMIZE_LAST_LIKES_SQL = """
+    SELECT COALESCE(jsonb_agg(
+        CASE WHEN likes.item->'id' = to_jsonb(%s::integer)
+        THEN jsonb_build_object('id', NULL, 'username', %s::text)
+        ELSE likes.item END
+        ORDER BY likes.position
+    ), '[]'::jsonb)
+    FROM jsonb_array_elements(last_likes) WITH ORDINALITY AS likes(item, position)
+"""
 
-def anonymize_event(user, event):
-    if event.event_type not in ANONYMIZABLE_EVENTS:
-        raise ValueError('event of type "{}" can\'t be ananymized'.format(event.event_type))
 
-    event.event_context = {
+def get_anonymized_event_context(user):
+    return {
         'user': {
             'id': None,
             'username': user.username,
             'url': reverse('misago:index'),
         },
     }
+
+
+def anonymize_event(user, event):
+    if event.event_type not in ANONYMIZABLE_EVENTS:
+        raise ValueError('event of type "{}" can\'t be ananymized'.format(event.event_type))
+
+    event.event_context = get_anonymized_event_context(user)
     event.save(update_fields=['event_context'])
 
 
+def anonymize_events(user, queryset):
+    """anonymizes user in all events from queryset using single UPDATE"""
+    return queryset.filter(
+        is_event=True,
+        event_type__in=ANONYMIZABLE_EVENTS,
+    ).update(event_context=get_anonymized_event_context(user))
+
+
 def anonymize_post_last_likes(user, post):
     cleaned_likes = []
     for like in post.last_likes:
@@ -38,4 +61,16 @@ def anonymize_post_last_likes(user, post):
 
     if cleaned_likes != post.last_likes:
         post.last_likes = cleaned_likes
-        post.save(update_fields=['last_likes'])
\ No newline at end of file
+        post.save(update_fields=['last_likes'])
+
+
+def anonymize_posts_last_likes(user, queryset):
+    """
+    anonymizes user in last_likes of all posts from queryset
+
+    last_likes are rewritten in the database with single UPDATE, preserving
+    order of likes and leaving other likers untouched
+    """
+    return queryset.filter(
+        last_likes__contains=[{'id': user.id}],
+    ).update(last_likes=RawSQL(ANONYMIZE_LAST_LIKES_SQL, (user.id, user.username)))
@@ -0,0 +1,128 @@
+"""
+Pages cache for anonymous users
+
+Threads lists, threads and categories list look the same for all guests.
+Those pages are rendered once and stored in cache under key made of request's
+url, language, ACL version, categories version and content version.
+
+Content version is kept in cache and changed whenever thread or post is saved
+or deleted. AnonymousCacheMiddleware serves cached pages before session and
+user middlewares run.
+
+Pages are stored without CSRF tokens, which are inserted into page again for
+every guest that it's served to.
+"""
+import re
+from hashlib import md5
+from uuid import uuid4
+
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.utils.translation import get_language
+
+from misago.acl import version as acl_version
+from misago.categories import CATEGORIES_CACHEBUSTER
+from misago.conf import settings
+from misago.core import cachebuster
+from misago.core.cache import cache
+
+
+CACHE_KEY = 'misago_anonymous_cache'
+VERSION_CACHE_KEY = 'misago_anonymous_cache_version'
+
+CSRF_TOKEN = re.compile(br'(?<=name="csrfmiddlewaretoken" value=")[^"]*')
+CSRF_PLACEHOLDER = b'__MISAGO_CSRF_TOKEN__'
+
+
+def is_request_cacheable(request):
+    if not settings.MISAGO_ANONYMOUS_CACHE_TIMEOUT:
+        return False
+    if request.method != 'GET':
+        return False
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def get_cache_key(request):
+    key_parts = [
+        request.build_absolute_uri(),
+        get_language(),
+        str(acl_version.get_version()),
+        str(cachebuster.get_version(CATEGORIES_CACHEBUSTER)),
+        get_content_version(),
+    ]
+
+    key_hash = md5('\n'.join(key_parts).encode()).hexdigest()
+    return '%s_%s' % (CACHE_KEY, key_hash)
+
+
+def get_content_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if not version:
+        version = uuid4().hex
+        cache.set(VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def invalidate():
+    cache.set(VERSION_CACHE_KEY, uuid4().hex, None)
+
+    # invalidate again after transaction is committed, so pages rendered by
+    # other processes before commit don't stay in cache
+    transaction.on_commit(lambda: cache.set(VERSION_CACHE_KEY, uuid4().hex, None))
+
+
+def make_response_cacheable(request, response, last_modified=None):
+    if request.user.is_authenticated:
+        return
+
+    response.anonymous_cache = True
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+
+
+def get_cached_response(request):
+    page = cache.get(request.anonymous_cache_key)
+    if not page:
+        return None
+
+    csrf_token = get_token(request).encode()
+    content = page['content'].replace(CSRF_PLACEHOLDER, csrf_token)
+
+    response = HttpResponse(content, content_type=page['content_type'])
+    response['ETag'] = page['etag']
+    if page['last_modified']:
+        response['Last-Modified'] = page['last_modified']
+    patch_vary_headers(response, ('Cookie', ))
+
+    return get_conditional_response_for_page(request, response)
+
+
+def cache_response(request, response):
+    if not getattr(response, 'anonymous_cache', False):
+        return response
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return response
+
+    content = CSRF_TOKEN.sub(CSRF_PLACEHOLDER, response.content)
+    response['ETag'] = quote_etag(md5(content).hexdigest())
+
+    cache.set(request.anonymous_cache_key, {
+        'content': content,
+        'content_type': response['Content-Type'],
+        'etag': response['ETag'],
+        'last_modified': response.get('Last-Modified'),
+    }, settings.MISAGO_ANONYMOUS_CACHE_TIMEOUT)
+
+    return get_conditional_response_for_page(request, response)
+
+
+def get_conditional_response_for_page(request, response):
+    return get_conditional_response(
+        request,
+        etag=response['ETag'],
+        last_modified=parse_http_date_safe(response.get('Last-Modified')),
+        response=response,
+    )
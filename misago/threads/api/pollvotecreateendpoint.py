@@ -1,8 +1,9 @@
-from copy import deepcopy
-
 from rest_framework.response import Response
 
 from misago.acl import add_acl
+from misago.threads import anonymouscache
+from misago.threads.etags import invalidate_thread_version
+from misago.threads.models import PollVote
 from misago.threads.permissions import allow_vote_poll
 from misago.threads.serializers import PollSerializer, NewVoteSerializer
 
@@ -30,49 +31,55 @@ def poll_vote_create(request, thread, poll):
             status=400,
         )
 
-    remove_user_votes(request.user, poll, serializer.data['choices'])
-    set_new_votes(request, poll, serializer.data['choices'])
-
-    add_acl(request.user, poll)
-    serialized_poll = PollSerializer(poll).data
+    final_votes = serializer.data['choices']
+    removed_votes = remove_user_votes(request.user, poll, final_votes)
+    added_votes = set_new_votes(request, poll, final_votes)
 
-    poll.choices = list(map(presave_clean_choice, deepcopy(poll.choices)))
-    poll.save()
+    if removed_votes is None:
+        # some of removed votes were deleted by other request, recount votes
+        poll.synchronize_votes()
+    else:
+        poll.update_votes(added_votes, removed_votes)
 
-    return Response(serialized_poll)
+    anonymouscache.invalidate()
+    invalidate_thread_version(poll.thread_id)
 
+    for choice in poll.choices:
+        choice['selected'] = choice['hash'] in final_votes
 
-def presave_clean_choice(choice):
-    del choice['selected']
-    return choice
+    add_acl(request.user, poll)
+    return Response(PollSerializer(poll).data)
 
 
 def remove_user_votes(user, poll, final_votes):
     removed_votes = []
     for choice in poll.choices:
         if choice['selected'] and choice['hash'] not in final_votes:
-            poll.votes -= 1
-            choice['votes'] -= 1
-
-            choice['selected'] = False
             removed_votes.append(choice['hash'])
 
     if removed_votes:
-        poll.pollvote_set.filter(voter=user, choice_hash__in=removed_votes).delete()
+        queryset = poll.pollvote_set.filter(voter=user, choice_hash__in=removed_votes)
+        if queryset.delete()[0] != len(removed_votes):
+            return None
+
+    return removed_votes
 
 
 def set_new_votes(request, poll, final_votes):
+    new_votes = []
     for choice in poll.choices:
         if not choice['selected'] and choice['hash'] in final_votes:
-            poll.votes += 1
-            choice['votes'] += 1
-
-            choice['selected'] = True
-            poll.pollvote_set.create(
-                category=poll.category,
-                thread=poll.thread,
-                voter=request.user,
-                voter_name=request.user.username,
-                voter_slug=request.user.slug,
-                choice_hash=choice['hash'],
+            new_votes.append(
+                PollVote(
+                    category=poll.category,
+                    thread=poll.thread,
+                    poll=poll,
+                    voter=request.user,
+                    voter_name=request.user.username,
+                    voter_slug=request.user.slug,
+                    choice_hash=choice['hash'],
+                )
             )
+
+    PollVote.objects.bulk_create(new_votes)
+    return [vote.choice_hash for vote in new_votes]
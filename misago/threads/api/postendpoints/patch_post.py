@@ -7,7 +7,7 @@ from django.utils.translation import ugettext as _
 from misago.acl import add_acl
 from misago.conf import settings
 from misago.core.apipatch import ApiPatch
-from misago.threads.models import PostLike
+from misago.threads.likes import acquire_like_lock, like_post, release_like_lock, unlike_post
 from misago.threads.moderation import posts as moderation
 from misago.threads.permissions import (
     allow_approve_post, allow_hide_best_answer, allow_hide_post, allow_protect_post,
@@ -36,47 +36,20 @@ def patch_is_liked(request, post, value):
     if not post.acl['can_like']:
         raise PermissionDenied(_("You can't like posts in this category."))
 
-    # lock user to protect us from likes flood
-    request.user.lock()
+    # serialize user's likes to protect us from likes flood
+    if not acquire_like_lock(request.user):
+        raise PermissionDenied(_("You can't like posts so quickly."))
 
-    # grab like state for this post and user
     try:
-        user_like = post.postlike_set.get(liker=request.user)
-    except PostLike.DoesNotExist:
-        user_like = None
-
-    # no change
-    if (value and user_like) or (not value and not user_like):
-        return {
-            'likes': post.likes,
-            'last_likes': post.last_likes or [],
-            'is_liked': value,
-        }
-
-    # like
-    if value:
-        post.postlike_set.create(
-            category=post.category,
-            thread=post.thread,
-            liker=request.user,
-            liker_name=request.user.username,
-            liker_slug=request.user.slug,
-        )
-        post.likes += 1
-
-    # unlike
-    if not value:
-        user_like.delete()
-        post.likes -= 1
-
-    post.last_likes = []
-    for like in post.postlike_set.all()[:4]:
-        post.last_likes.append({
-            'id': like.liker_id,
-            'username': like.liker_name,
-        })
-
-    post.save(update_fields=['likes', 'last_likes'])
+        # grab like state for this post and user
+        is_liked = post.postlike_set.filter(liker=request.user).exists()
+
+        if value and not is_liked:
+            like_post(request.user, post)
+        elif not value and is_liked:
+            unlike_post(request.user, post)
+    finally:
+        release_like_lock(request.user)
 
     return {
         'likes': post.likes,
@@ -5,6 +5,7 @@ from django.utils.translation import ungettext
 
 from misago.acl import add_acl
 from misago.conf import settings
+from misago.threads.models import DeletedAttachmentFile
 from misago.threads.serializers import AttachmentSerializer
 
 from . import PostingEndpoint, PostingMiddleware
@@ -93,12 +94,11 @@ class AttachmentsSerializer(serializers.Serializer):
             return
 
         if self.removed_attachments:
-            for attachment in self.removed_attachments:
-                attachment.delete_files()
-
-            self.context['post'].attachment_set.filter(
-                id__in=[a.id for a in self.removed_attachments]
-            ).delete()
+            DeletedAttachmentFile.objects.delete_attachments(
+                self.context['post'].attachment_set.filter(
+                    id__in=[a.id for a in self.removed_attachments]
+                )
+            )
 
         if self.final_attachments:
             # sort final attachments by id, descending
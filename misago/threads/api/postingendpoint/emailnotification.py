@@ -1,12 +1,16 @@
-from django.utils.translation import ugettext as _
-
-from misago.core.mail import build_mail, send_messages
-from misago.threads.permissions import can_see_post, can_see_thread
+from misago.threads.models import EmailNotification
+from misago.threads.permissions import filter_users_that_can_see_post
 
 from . import PostingEndpoint, PostingMiddleware
 
 
 class EmailNotificationMiddleware(PostingMiddleware):
+    """
+    Queues reply notifications for subscribers
+
+    Notifications are rendered and sent outside of request by the
+    sendemailnotifications management command.
+    """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -21,34 +25,8 @@ class EmailNotificationMiddleware(PostingMiddleware):
             last_read_on__gte=self.previous_last_post_on,
         ).exclude(user=self.user).select_related('user')
 
-        notifications = []
-        for subscription in queryset.iterator():
-            if self.notify_user_of_post(subscription.user):
-                notifications.append(self.build_mail(subscription.user))
-
-        if notifications:
-            send_messages(notifications)
-
-    def notify_user_of_post(self, subscriber):
-        see_thread = can_see_thread(subscriber, self.thread)
-        see_post = can_see_post(subscriber, self.post)
-        return see_thread and see_post
-
-    def build_mail(self, subscriber):
-        if subscriber.id == self.thread.starter_id:
-            subject = _('%(user)s has replied to your thread "%(thread)s"')
-        else:
-            subject = _('%(user)s has replied to thread "%(thread)s" that you are watching')
-
-        subject_formats = {'user': self.user.username, 'thread': self.thread.title}
-
-        return build_mail(
-            subscriber,
-            subject % subject_formats,
-            'misago/emails/thread/reply',
-            sender=self.user,
-            context={
-                'thread': self.thread,
-                'post': self.post,
-            },
-        )
+        subscribers = [subscription.user for subscription in queryset.iterator()]
+        recipients = filter_users_that_can_see_post(subscribers, self.thread, self.post)
+
+        if recipients:
+            EmailNotification.objects.queue_reply(self.post, recipients)
@@ -1,11 +1,11 @@
 from misago.categories import PRIVATE_THREADS_ROOT_NAME
-from misago.threads.participants import set_users_unread_private_threads_sync
+from misago.threads.participants import increase_unread_private_threads
 
 from . import PostingEndpoint, PostingMiddleware
 
 
 class SyncPrivateThreadsMiddleware(PostingMiddleware):
-    """middleware that sets private thread participants to sync unread threads"""
+    """middleware that updates private thread participants unread threads counts"""
 
     def use_this_middleware(self):
         if self.mode == PostingEndpoint.REPLY:
@@ -13,7 +13,4 @@ class SyncPrivateThreadsMiddleware(PostingMiddleware):
         return False
 
     def post_save(self, serializer):
-        set_users_unread_private_threads_sync(
-            participants=self.thread.participants_list,
-            exclude_user=self.user,
-        )
+        increase_unread_private_threads(self.thread, self.post, exclude_user=self.user)
@@ -1,6 +1,7 @@
 from django.db.models import F
 
 from misago.categories import THREADS_ROOT_NAME
+from misago.users.activepostersranking import record_user_post
 
 from . import PostingEndpoint, PostingMiddleware
 
@@ -49,3 +50,4 @@ class UpdateStatsMiddleware(PostingMiddleware):
             if self.mode != PostingEndpoint.EDIT:
                 user.posts = F('posts') + 1
                 user.update_fields.append('posts')
+                record_user_post(user, post)
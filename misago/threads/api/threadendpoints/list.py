@@ -1,6 +1,7 @@
 from rest_framework.response import Response
 
 from misago.core.shortcuts import get_int_or_404
+from misago.threads.etags import get_categories_version, get_etag, get_not_modified_response
 from misago.threads.viewmodels import (
     ForumThreads, PrivateThreads, PrivateThreadsCategory, ThreadsCategory, ThreadsRootCategory)
 
@@ -16,9 +17,19 @@ class ThreadsList(object):
         list_type = request.query_params.get('list', 'all')
 
         category = self.get_category(request, pk=request.query_params.get('category'))
+
+        # list is made of threads from category and its subcategories
+        categories_ids = [category.pk] + [c.pk for c in category.subcategories]
+        etag = get_etag(request, get_categories_version(categories_ids))
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+
         threads = self.get_threads(request, category, list_type, page)
 
-        return Response(self.get_response_json(request, category, threads)['THREADS'])
+        response = Response(self.get_response_json(request, category, threads)['THREADS'])
+        response['ETag'] = etag
+        return response
 
     def get_category(self, request, pk=None):
         raise NotImplementedError('Threads list has to implement get_category(request, pk=None)')
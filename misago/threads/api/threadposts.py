@@ -8,6 +8,7 @@ from django.utils.translation import ugettext as _
 
 from misago.acl import add_acl
 from misago.core.shortcuts import get_int_or_404
+from misago.threads.etags import get_etag, get_not_modified_response, get_thread_version
 from misago.threads.models import Post
 from misago.threads.permissions import allow_edit_post, allow_reply_thread
 from misago.threads.serializers import AttachmentSerializer, PostSerializer
@@ -58,12 +59,20 @@ class ViewSet(viewsets.ViewSet):
             read_aware=True,
             subscription_aware=True,
         )
+
+        etag = get_etag(request, get_thread_version(thread.pk))
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+
         posts = self.get_posts(request, thread, page)
 
         data = thread.get_frontend_context()
         data['post_set'] = posts.get_frontend_context()
 
-        return Response(data)
+        response = Response(data)
+        response['ETag'] = etag
+        return response
 
     @list_route(methods=['post'])
     @transaction.atomic
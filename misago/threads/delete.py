@@ -0,0 +1,53 @@
+from django.db import transaction
+
+from misago.categories.models import Category
+from misago.categories.tree import clear_activity
+
+from .etags import invalidate_categories_version
+from .models import Post, Thread
+
+
+DELETE_THREADS_CHUNK_SIZE = 100
+
+
+def delete_threads(queryset, chunk_size=DELETE_THREADS_CHUNK_SIZE):
+    """
+    deletes threads from queryset together with all their content
+
+    threads are deleted in chunks, each within its own transaction. For every
+    chunk single delete_threads_content signal is sent, letting apps clear
+    their data using set-based DELETEs, after which posts and threads are
+    deleted without loading them into memory.
+
+    returns set of ids of categories that need to be synchronized
+    """
+    from .signals import delete_threads_content
+
+    ids_queryset = queryset.order_by('-pk').values_list('pk', 'category_id')
+    deleted_categories = set()
+
+    chunk = list(ids_queryset[:chunk_size])
+    while chunk:
+        threads = [thread_id for thread_id, _ in chunk]
+        deleted_categories.update([category_id for _, category_id in chunk])
+
+        with transaction.atomic():
+            delete_threads_content.send(sender=Thread, threads=threads)
+
+            Category.objects.filter(last_thread_id__in=threads).update(last_thread=None)
+
+            # posts and threads have their relations cleared by signal handlers
+            # so we skip the collector and delete them using single query
+            posts_queryset = Post.objects.filter(thread_id__in=threads)
+            posts_queryset._raw_delete(posts_queryset.db)
+
+            threads_queryset = Thread.objects.filter(pk__in=threads)
+            threads_queryset._raw_delete(threads_queryset.db)
+
+        chunk = list(ids_queryset[:chunk_size])
+
+    if deleted_categories:
+        clear_activity()
+        invalidate_categories_version(deleted_categories)
+
+    return deleted_categories
@@ -0,0 +1,110 @@
+"""
+ETags for threads, posts and categories API responses
+
+ETag is built from versions that are cheap to get: request's url, ACL and
+categories versions, version of content that response is made of, and user's
+read and subscriptions versions. Content versions are kept in cache for every
+thread and category, and are changed when thread, its post or poll is saved,
+so activity in one thread doesn't change ETags of other threads. If client
+already has current response, API returns 304 before serializing anything.
+"""
+from hashlib import md5
+from uuid import uuid4
+
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+from misago.acl import version as acl_version
+from misago.categories import CATEGORIES_CACHEBUSTER
+from misago.core import cachebuster
+from misago.core.cache import cache
+from misago.readtracker import version as read_version
+
+
+CATEGORY_VERSION_CACHE = 'misago_category_version'
+THREAD_VERSION_CACHE = 'misago_thread_version'
+SUBSCRIPTIONS_CACHE = 'misago_subscriptions_version'
+
+
+def get_etag(request, *extra_parts):
+    etag_parts = [
+        request.get_full_path(),
+        get_language(),
+        str(acl_version.get_version()),
+        str(cachebuster.get_version(CATEGORIES_CACHEBUSTER)),
+        get_user_version(request.user),
+    ]
+    etag_parts.extend(str(part) for part in extra_parts)
+
+    return quote_etag(md5('\n'.join(etag_parts).encode()).hexdigest())
+
+
+def get_user_version(user):
+    if user.is_anonymous:
+        return 'anonymous'
+
+    return '%s_%s_%s_%s' % (
+        user.pk,
+        user.acl_key,
+        read_version.get_version(user.pk),
+        get_subscriptions_version(user.pk),
+    )
+
+
+def get_thread_version(thread_id):
+    return get_versions(THREAD_VERSION_CACHE, [thread_id])
+
+
+def get_categories_version(categories_ids):
+    return get_versions(CATEGORY_VERSION_CACHE, sorted(categories_ids))
+
+
+def get_versions(prefix, ids):
+    cache_keys = ['%s_%s' % (prefix, i) for i in ids]
+    versions = cache.get_many(cache_keys)
+
+    missing_versions = {}
+    for cache_key in cache_keys:
+        if cache_key not in versions:
+            missing_versions[cache_key] = uuid4().hex
+    if missing_versions:
+        cache.set_many(missing_versions, None)
+        versions.update(missing_versions)
+
+    return '_'.join(versions[cache_key] for cache_key in cache_keys)
+
+
+def invalidate_thread_version(thread_id):
+    invalidate_versions(THREAD_VERSION_CACHE, [thread_id])
+
+
+def invalidate_categories_version(categories_ids):
+    invalidate_versions(CATEGORY_VERSION_CACHE, categories_ids)
+
+
+def invalidate_versions(prefix, ids):
+    cache_keys = ['%s_%s' % (prefix, i) for i in ids]
+    cache.delete_many(cache_keys)
+
+    # invalidate again after transaction is committed, so ETags for responses
+    # built by other processes before commit don't stay valid
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+def get_subscriptions_version(user_id):
+    cache_key = '%s_%s' % (SUBSCRIPTIONS_CACHE, user_id)
+    version = cache.get(cache_key)
+    if not version:
+        version = uuid4().hex
+        cache.set(cache_key, version, None)
+    return version
+
+
+def invalidate_subscriptions_version(user_id):
+    cache.set('%s_%s' % (SUBSCRIPTIONS_CACHE, user_id), uuid4().hex, None)
+
+
+def get_not_modified_response(request, etag):
+    return get_conditional_response(request, etag=etag)
@@ -0,0 +1,81 @@
+"""
+Posts likes
+
+Post's likes counter and last_likes list are updated with single UPDATE
+statement, so concurrent likes of same post don't overwrite each other's
+changes and don't need to lock anything beside post's row for the time of
+that UPDATE.
+
+Instead of locking user's row in database, user's likes are serialized with
+cache lock that is held for the time of like or unlike, so single user can't
+flood posts with multiple likes sent at once.
+"""
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+
+from misago.core.cache import cache
+
+from .models import Post, PostLike
+
+
+LAST_LIKES_LENGTH = 4
+
+LIKE_LOCK_CACHE = 'misago_like_lock'
+LIKE_LOCK_TIMEOUT = 10
+
+ADD_LAST_LIKE_SQL = """
+    SELECT jsonb_build_array(jsonb_build_object('id', %s::integer, 'username', %s::text))
+        || COALESCE(jsonb_agg(likes.item ORDER BY likes.position), '[]'::jsonb)
+    FROM jsonb_array_elements(COALESCE(last_likes, '[]'::jsonb))
+        WITH ORDINALITY AS likes(item, position)
+    WHERE likes.position < %s
+"""
+
+BUILD_LAST_LIKES_SQL = """
+    SELECT COALESCE(jsonb_agg(
+        jsonb_build_object('id', likes.liker_id, 'username', likes.liker_name)
+        ORDER BY likes.id DESC
+    ), '[]'::jsonb)
+    FROM (
+        SELECT id, liker_id, liker_name FROM {table}
+        WHERE post_id = %s ORDER BY id DESC LIMIT %s
+    ) AS likes
+""".format(table=PostLike._meta.db_table)
+
+
+def acquire_like_lock(user):
+    return cache.add(get_like_lock_key(user), True, LIKE_LOCK_TIMEOUT)
+
+
+def release_like_lock(user):
+    cache.delete(get_like_lock_key(user))
+
+
+def get_like_lock_key(user):
+    return '%s_%s' % (LIKE_LOCK_CACHE, user.pk)
+
+
+def like_post(user, post):
+    post.postlike_set.create(
+        category=post.category,
+        thread=post.thread,
+        liker=user,
+        liker_name=user.username,
+        liker_slug=user.slug,
+    )
+
+    last_likes = RawSQL(ADD_LAST_LIKE_SQL, (user.pk, user.username, LAST_LIKES_LENGTH))
+    Post.objects.filter(pk=post.pk).update(likes=F('likes') + 1, last_likes=last_likes)
+
+    post.refresh_from_db(fields=['likes', 'last_likes'])
+
+
+def unlike_post(user, post):
+    deleted = post.postlike_set.filter(liker=user).delete()[0]
+    if not deleted:
+        return
+
+    last_likes = RawSQL(BUILD_LAST_LIKES_SQL, (post.pk, LAST_LIKES_LENGTH))
+    Post.objects.filter(pk=post.pk).update(likes=F('likes') - deleted, last_likes=last_likes)
+
+    post.refresh_from_db(fields=['likes', 'last_likes'])
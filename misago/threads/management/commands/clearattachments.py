@@ -6,13 +6,21 @@ from django.utils import timezone
 
 from misago.conf import settings
 from misago.core.management.progressbar import show_progress
-from misago.core.pgutils import chunk_queryset
-from misago.threads.models import Attachment
+from misago.threads.models import Attachment, DeletedAttachmentFile
 
 
 class Command(BaseCommand):
     help = "Deletes attachments unassociated with any posts"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            default=500,
+            help="Number of attachments deleted in single query",
+            type=int,
+        )
+
     def handle(self, *args, **options):
         cutoff = timezone.now() - timedelta(minutes=settings.MISAGO_ATTACHMENT_ORPHANED_EXPIRE)
         queryset = Attachment.objects.filter(
@@ -25,19 +33,26 @@ class Command(BaseCommand):
         if not attachments_to_sync:
             self.stdout.write("\n\nNo attachments were found")
         else:
-            self.sync_attachments(queryset, attachments_to_sync)
+            self.sync_attachments(queryset, attachments_to_sync, options['chunk_size'])
 
-    def sync_attachments(self, queryset, attachments_to_sync):
+    def sync_attachments(self, queryset, attachments_to_sync, chunk_size):
         self.stdout.write("Clearing {} attachments...\n".format(attachments_to_sync))
 
         cleared_count = 0
         show_progress(self, cleared_count, attachments_to_sync)
         start_time = time.time()
-        
-        for attachment in chunk_queryset(queryset):
-            attachment.delete()
 
-            cleared_count += 1
+        ids_queryset = queryset.order_by('-pk').values_list('pk', flat=True)
+        chunk = list(ids_queryset[:chunk_size])
+        while chunk:
+            # attachments files are queued for deletion by deleteattachmentsfiles
+            DeletedAttachmentFile.objects.delete_attachments(
+                Attachment.objects.filter(pk__in=chunk)
+            )
+
+            cleared_count += len(chunk)
             show_progress(self, cleared_count, attachments_to_sync, start_time)
 
+            chunk = list(ids_queryset.filter(pk__lt=chunk[-1])[:chunk_size])
+
         self.stdout.write("\n\nCleared {} attachments".format(cleared_count))
@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from misago.core.management.progressbar import show_progress
+from misago.threads.models import DeletedAttachmentFile
+
+
+class Command(BaseCommand):
+    help = "Deletes files of deleted attachments from storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            default=100,
+            help="Number of files deleted in single batch",
+            type=int,
+        )
+        parser.add_argument(
+            '--workers',
+            dest='workers',
+            default=8,
+            help="Number of files deleted concurrently",
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        files_to_delete = DeletedAttachmentFile.objects.count()
+
+        if not files_to_delete:
+            self.stdout.write("\n\nNo files were found")
+        else:
+            self.delete_files(files_to_delete, options['batch_size'], options['workers'])
+
+    def delete_files(self, files_to_delete, batch_size, workers):
+        self.stdout.write("Deleting {} files...\n".format(files_to_delete))
+
+        deleted_count = 0
+        failed_count = 0
+        show_progress(self, deleted_count, files_to_delete)
+        start_time = time.time()
+
+        # limit queue to files that were counted, so progress won't overflow
+        last_queued_file = DeletedAttachmentFile.objects.order_by('id').last()
+        queryset = DeletedAttachmentFile.objects.filter(
+            pk__lte=last_queued_file.pk,
+        ).order_by('id')
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batch = list(queryset[:batch_size])
+            while batch:
+                deleted_files = []
+                for queued_file, deleted in zip(batch, executor.map(delete_file, batch)):
+                    if deleted:
+                        deleted_files.append(queued_file.pk)
+                    else:
+                        failed_count += 1
+
+                DeletedAttachmentFile.objects.filter(pk__in=deleted_files).delete()
+
+                deleted_count += len(batch)
+                show_progress(self, deleted_count, files_to_delete, start_time)
+
+                # failed files are kept in queue for next run to retry them
+                batch = list(queryset.filter(pk__gt=batch[-1].pk)[:batch_size])
+
+        self.stdout.write("\n\nDeleted {} files".format(deleted_count - failed_count))
+        if failed_count:
+            self.stderr.write("Failed to delete {} files".format(failed_count))
+
+
+def delete_file(queued_file):
+    try:
+        queued_file.delete_file()
+        return True
+    except Exception:  # pylint: disable=broad-except
+        return False
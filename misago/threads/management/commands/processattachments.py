@@ -0,0 +1,116 @@
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from PIL import Image
+
+from django.core.management.base import BaseCommand
+
+from misago.conf import settings
+from misago.core.management.progressbar import show_progress
+from misago.threads.models import Attachment, DeletedAttachmentFile
+from misago.threads.renditions import create_renditions
+
+
+# errors raised by PIL for malformed or malicious images
+# (DecompressionBombError is available since Pillow 5.0)
+IMAGE_ERRORS = (IOError, OverflowError, SyntaxError, ValueError)
+if hasattr(Image, 'DecompressionBombError'):
+    IMAGE_ERRORS += (Image.DecompressionBombError, )
+
+
+class Command(BaseCommand):
+    help = "Creates thumbnails and renditions for uploaded images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            default=20,
+            help="Number of images processed in single batch",
+            type=int,
+        )
+        parser.add_argument(
+            '--workers',
+            dest='workers',
+            default=None,
+            help="Number of processes used to process images (defaults to number of CPUs)",
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        queryset = Attachment.objects.select_related('filetype').filter(is_processed=False)
+        attachments_to_process = queryset.count()
+
+        if not attachments_to_process:
+            self.stdout.write("\n\nNo attachments were found")
+        else:
+            self.process_attachments(
+                queryset, attachments_to_process, options['batch_size'], options['workers'])
+
+    def process_attachments(self, queryset, attachments_to_process, batch_size, workers):
+        self.stdout.write("Processing {} attachments...\n".format(attachments_to_process))
+
+        processed_count = 0
+        failed_count = 0
+        show_progress(self, processed_count, attachments_to_process)
+        start_time = time.time()
+
+        queryset = queryset.order_by('id')
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batch = list(queryset[:batch_size])
+            while batch:
+                # images are read here, so worker processes don't need storage access
+                jobs = [submit_image(executor, attachment) for attachment in batch]
+
+                for attachment, job in zip(batch, jobs):
+                    try:
+                        attachment.set_renditions(job.result())
+                    except IMAGE_ERRORS:
+                        # image was corrupted, leave it without thumbnail
+                        attachment.is_processed = True
+                        failed_count += 1
+
+                    # attachment could have been deleted while it was processed
+                    updated = Attachment.objects.filter(pk=attachment.pk).update(
+                        thumbnail=attachment.thumbnail,
+                        webp=attachment.webp,
+                        image_width=attachment.image_width,
+                        image_height=attachment.image_height,
+                        is_processed=attachment.is_processed,
+                    )
+                    if not updated:
+                        queue_renditions(attachment)
+
+                processed_count += len(batch)
+                show_progress(self, processed_count, attachments_to_process, start_time)
+
+                batch = list(queryset.filter(pk__gt=batch[-1].pk)[:batch_size])
+
+        self.stdout.write("\n\nProcessed {} attachments".format(processed_count))
+        if failed_count:
+            self.stderr.write("Failed to process {} images".format(failed_count))
+
+
+def queue_renditions(attachment):
+    """queue renditions of deleted attachment for deleteattachmentsfiles"""
+    paths = [field.name for field in (attachment.thumbnail, attachment.webp) if field]
+    DeletedAttachmentFile.objects.queue_paths(paths)
+
+
+def submit_image(executor, attachment):
+    try:
+        attachment.image.open('rb')
+        image_data = attachment.image.read()
+        attachment.image.close()
+    except IOError as e:
+        job = Future()
+        job.set_exception(e)
+        return job
+
+    return executor.submit(
+        create_renditions,
+        image_data,
+        attachment.filetype.extensions_list[0],
+        settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT,
+    )
@@ -0,0 +1,127 @@
+import logging
+import time
+from smtplib import SMTPServerDisconnected
+
+from django.core import mail as djmail
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from misago.core.mail import send_messages
+from misago.core.management.progressbar import show_progress
+from misago.threads.models import EmailNotification
+
+
+logger = logging.getLogger('misago.threads.emailnotifications')
+
+MAX_ATTEMPTS = 5
+
+
+class Command(BaseCommand):
+    help = "Sends queued e-mail notifications"
+    leave_locale_alone = True
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            default=100,
+            help="Number of notifications sent in single batch",
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        notifications_to_send = EmailNotification.objects.count()
+
+        if not notifications_to_send:
+            self.stdout.write("\n\nNo notifications were found")
+        else:
+            self.send_notifications(notifications_to_send, options['batch_size'])
+
+    def send_notifications(self, notifications_to_send, batch_size):
+        self.stdout.write("Sending {} notifications...\n".format(notifications_to_send))
+
+        processed_count = 0
+        sent_count = 0
+        show_progress(self, processed_count, notifications_to_send)
+        start_time = time.time()
+
+        # limit queue to notifications that were counted, so progress won't overflow
+        last_queued_notification = EmailNotification.objects.order_by('id').last()
+        queryset = EmailNotification.objects.filter(pk__lte=last_queued_notification.pk)
+
+        # all batches are sent over single connection to mail server
+        connection = djmail.get_connection()
+        connection.open()
+
+        try:
+            last_id = 0
+            is_server_available = True
+            while is_server_available:
+                with transaction.atomic():
+                    batch = self.claim_batch(queryset.filter(pk__gt=last_id), batch_size)
+                    if not batch:
+                        break
+
+                    last_id = batch[-1].pk
+                    sent, failed, is_server_available = self.send_batch(batch, connection)
+
+                    EmailNotification.objects.filter(pk__in=sent).delete()
+                    self.record_failed_attempts(failed)
+
+                processed_count += len(sent) + len(failed)
+                sent_count += len(sent)
+                show_progress(self, processed_count, notifications_to_send, start_time)
+        finally:
+            connection.close()
+
+        self.stdout.write("\n\nSent {} notifications".format(sent_count))
+
+    def claim_batch(self, queryset, batch_size):
+        # claimed notifications stay locked until their batch is sent,
+        # so overlapping runs of this command skip them instead of sending them again
+        claimed_ids = list(
+            queryset.select_for_update(skip_locked=True).order_by('id').values_list(
+                'pk', flat=True
+            )[:batch_size]
+        )
+
+        return list(
+            EmailNotification.objects.select_related(
+                'recipient',
+                'post',
+                'post__poster',
+                'post__thread',
+            ).filter(pk__in=claimed_ids).order_by('id')
+        )
+
+    def send_batch(self, batch, connection):
+        sent = []
+        failed = []
+
+        # notifications are sent one by one, so one that can't be sent
+        # doesn't stop notifications queued after it from being sent
+        for notification in batch:
+            try:
+                send_messages([notification.build_mail()], connection=connection)
+            except (SMTPServerDisconnected, ConnectionError) as e:
+                # mail server is unavailable, unsent notifications are retried next run
+                logger.exception(e)
+                self.stderr.write("Failed to send notifications: {}".format(e))
+                return sent, failed, False
+            except Exception as e:  # pylint: disable=broad-except
+                logger.exception(e)
+                failed.append(notification.pk)
+            else:
+                sent.append(notification.pk)
+
+        return sent, failed, True
+
+    def record_failed_attempts(self, failed):
+        if not failed:
+            return
+
+        # notifications that keep failing are dropped from queue
+        queryset = EmailNotification.objects.filter(pk__in=failed)
+        queryset.filter(attempts__gte=MAX_ATTEMPTS - 1).delete()
+        queryset.update(attempts=F('attempts') + 1)
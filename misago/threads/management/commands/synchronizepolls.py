@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from misago.core.management.progressbar import show_progress
+from misago.core.pgutils import chunk_queryset
+from misago.threads import anonymouscache
+from misago.threads.etags import invalidate_thread_version
+from misago.threads.models import Poll
+
+
+class Command(BaseCommand):
+    help = "Synchronizes polls votes"
+
+    def handle(self, *args, **options):
+        polls_to_sync = Poll.objects.count()
+
+        if not polls_to_sync:
+            self.stdout.write("\n\nNo polls were found")
+        else:
+            self.sync_polls(polls_to_sync)
+
+    def sync_polls(self, polls_to_sync):
+        self.stdout.write("Synchronizing {} polls...\n".format(polls_to_sync))
+
+        synchronized_count = 0
+        show_progress(self, synchronized_count, polls_to_sync)
+        start_time = time.time()
+
+        for poll in chunk_queryset(Poll.objects.all()):
+            poll.synchronize_votes()
+            invalidate_thread_version(poll.thread_id)
+
+            synchronized_count += 1
+            show_progress(self, synchronized_count, polls_to_sync, start_time)
+
+        anonymouscache.invalidate()
+
+        self.stdout.write("\n\nSynchronized {} polls".format(synchronized_count))
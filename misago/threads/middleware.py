@@ -1,11 +1,42 @@
 from django.utils.deprecation import MiddlewareMixin
 
 from misago.categories.models import Category
+from misago.core import threadstore
 
+from . import anonymouscache
 from .models import Thread
 from .viewmodels import filter_read_threads_queryset
 
 
+class AnonymousCacheMiddleware(MiddlewareMixin):
+    """
+    Serves pages cached for anonymous users
+
+    This middleware should be placed after CsrfViewMiddleware and before
+    SessionMiddleware, so cached pages are served with CSRF cookie, but
+    without session and user being loaded.
+    """
+    def process_request(self, request):
+        if not anonymouscache.is_request_cacheable(request):
+            return None
+
+        response = None
+        try:
+            request.anonymous_cache_key = anonymouscache.get_cache_key(request)
+            response = anonymouscache.get_cached_response(request)
+            return response
+        finally:
+            # cached response skips middlewares below, including ThreadStoreMiddleware,
+            # so threadstore filled by reading cache versions has to be cleared here
+            if response is not None:
+                threadstore.clear()
+
+    def process_response(self, request, response):
+        if getattr(request, 'anonymous_cache_key', None):
+            return anonymouscache.cache_response(request, response)
+        return response
+
+
 class UnreadThreadsCountMiddleware(MiddlewareMixin):
     def process_request(self, request):
         if request.user.is_anonymous:
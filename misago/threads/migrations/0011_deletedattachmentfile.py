@@ -0,0 +1,21 @@
+# Generated by Django 1.11.16 on 2018-11-04 18:20
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('misago_threads', '0010_auto_20180609_1523'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedAttachmentFile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255)),
+                ('queued_on', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 1.11.16 on 2018-11-11 14:02
+from django.db import migrations, models
+
+import misago.core.pgutils
+import misago.threads.models.attachment
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('misago_threads', '0011_deletedattachmentfile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='is_processed',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='webp',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to=misago.threads.models.attachment.rendition_upload_to),
+        ),
+        migrations.AddIndex(
+            model_name='attachment',
+            index=misago.core.pgutils.PgPartialIndex(fields=['is_processed'], name='misago_thre_is_proc_6aecf5_part', where={'is_processed': False}),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+SET_POSTS_POSITIONS_SQL = """
+    UPDATE misago_threads_post AS post
+    SET position = positions.position
+    FROM (
+        SELECT
+            id,
+            count(*) FILTER (WHERE NOT is_event AND NOT is_unapproved)
+                OVER (PARTITION BY thread_id ORDER BY id) AS position
+        FROM misago_threads_post
+    ) AS positions
+    WHERE post.id = positions.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('misago_threads', '0012_attachment_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(SET_POSTS_POSITIONS_SQL, migrations.RunSQL.noop),
+    ]
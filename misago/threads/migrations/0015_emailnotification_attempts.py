@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('misago_threads', '0014_emailnotification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailnotification',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -8,3 +8,5 @@ from .attachmenttype import AttachmentType
 from .attachment import Attachment
 from .poll import Poll
 from .pollvote import PollVote
+from .deletedattachmentfile import DeletedAttachmentFile
+from .emailnotification import EmailNotification
@@ -1,17 +1,17 @@
 import os
 from hashlib import md5
-from io import BytesIO
 
 from PIL import Image
 
 from django.core.files import File
 from django.core.files.base import ContentFile
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 
 from misago.conf import settings
+from misago.core.pgutils import PgPartialIndex
 from misago.core.utils import slugify
 
 
@@ -29,6 +29,16 @@ def upload_to(instance, filename):
     return os.path.join('attachments', spread_path[:2], spread_path[2:4], secret, filename_clean)
 
 
+def rendition_upload_to(instance, filename):
+    spread_path = md5(str(instance.secret[:16]).encode()).hexdigest()
+    secret = Attachment.generate_new_secret()
+
+    name, extension = os.path.splitext(filename)
+    filename_clean = ''.join((slugify(name)[:16], extension.lower()))
+
+    return os.path.join('attachments', spread_path[:2], spread_path[2:4], secret, filename_clean)
+
+
 class Attachment(models.Model):
     secret = models.CharField(max_length=64)
     filetype = models.ForeignKey('AttachmentType', on_delete=models.CASCADE)
@@ -52,12 +62,29 @@ class Attachment(models.Model):
     image = models.ImageField(max_length=255, blank=True, null=True, upload_to=upload_to)
     file = models.FileField(max_length=255, blank=True, null=True, upload_to=upload_to)
 
+    webp = models.ImageField(
+        max_length=255, blank=True, null=True, upload_to=rendition_upload_to)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    is_processed = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            PgPartialIndex(
+                fields=['is_processed'],
+                where={'is_processed': False},
+            ),
+        ]
+
     def __str__(self):
         return self.filename
 
     def delete(self, *args, **kwargs):
-        self.delete_files()
-        return super().delete(*args, **kwargs)
+        from .deletedattachmentfile import DeletedAttachmentFile
+
+        with transaction.atomic():
+            DeletedAttachmentFile.objects.queue_attachments([self])
+            return super().delete(*args, **kwargs)
 
     def delete_files(self):
         if self.thumbnail:
@@ -88,7 +115,7 @@ class Attachment(models.Model):
         )
 
     def get_thumbnail_url(self):
-        if self.thumbnail:
+        if self.thumbnail or not self.is_processed:
             return reverse(
                 'misago:attachment-thumbnail', kwargs={
                     'pk': self.pk,
@@ -102,27 +129,23 @@ class Attachment(models.Model):
         self.file = File(upload, upload.name)
 
     def set_image(self, upload):
-        fileformat = self.filetype.extensions_list[0]
-
         self.image = File(upload, upload.name)
 
-        thumbnail = Image.open(upload)
-        downscale_image = (
-            thumbnail.size[0] > settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT[0]
-            or thumbnail.size[1] > settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT[1]
-        )
-        strip_animation = fileformat == 'gif'
-
-        thumb_stream = BytesIO()
-        if downscale_image:
-            thumbnail.thumbnail(settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT)
-            if fileformat == 'jpg':
-                # normalize jpg to jpeg for Pillow
-                thumbnail.save(thumb_stream, 'jpeg')
-            else:
-                thumbnail.save(thumb_stream, fileformat)
-        elif strip_animation:
-            thumbnail.save(thumb_stream, fileformat)
-
-        if downscale_image or strip_animation:
-            self.thumbnail = ContentFile(thumb_stream.getvalue(), upload.name)
+        # opening image only reads its header, renditions are created later
+        # by "processattachments" task
+        image = Image.open(upload)
+        self.image_width, self.image_height = image.size
+        self.is_processed = False
+
+    def set_renditions(self, renditions):
+        self.image_width = renditions['width']
+        self.image_height = renditions['height']
+
+        if renditions['thumbnail']:
+            self.thumbnail.save(
+                self.filename, ContentFile(renditions['thumbnail']), save=False)
+        if renditions['webp']:
+            webp_name = '.'.join((os.path.splitext(self.filename)[0], 'webp'))
+            self.webp.save(webp_name, ContentFile(renditions['webp']), save=False)
+
+        self.is_processed = True
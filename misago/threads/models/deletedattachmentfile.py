@@ -0,0 +1,42 @@
+from django.db import models, transaction
+from django.utils import timezone
+
+
+class DeletedAttachmentFileManager(models.Manager):
+    def queue_attachments(self, attachments):
+        paths = []
+        for attachment in attachments:
+            for field in (attachment.thumbnail, attachment.webp, attachment.image, attachment.file):
+                if field:
+                    paths.append(field.name)
+
+        self.queue_paths(paths)
+
+    def queue_paths(self, paths):
+        self.bulk_create([self.model(path=path) for path in paths])
+
+    def delete_attachments(self, queryset):
+        with transaction.atomic():
+            paths = []
+            for files in queryset.values_list('thumbnail', 'webp', 'image', 'file'):
+                paths.extend(filter(None, files))
+
+            self.queue_paths(paths)
+            return queryset.delete()
+
+
+class DeletedAttachmentFile(models.Model):
+    path = models.CharField(max_length=255)
+    queued_on = models.DateTimeField(default=timezone.now)
+
+    objects = DeletedAttachmentFileManager()
+
+    def __str__(self):
+        return self.path
+
+    def get_storage(self):
+        from .attachment import Attachment
+        return Attachment._meta.get_field('file').storage
+
+    def delete_file(self):
+        self.get_storage().delete(self.path)
@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext as _
+
+from misago.conf import settings
+from misago.core.mail import build_mail
+
+
+class EmailNotificationManager(models.Manager):
+    def queue_reply(self, post, recipients):
+        self.bulk_create([self.model(recipient=recipient, post=post) for recipient in recipients])
+
+
+class EmailNotification(models.Model):
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    post = models.ForeignKey(
+        'misago_threads.Post',
+        on_delete=models.CASCADE,
+    )
+    queued_on = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+
+    objects = EmailNotificationManager()
+
+    def build_mail(self):
+        thread = self.post.thread
+
+        if self.recipient_id == thread.starter_id:
+            subject = _('%(user)s has replied to your thread "%(thread)s"')
+        else:
+            subject = _('%(user)s has replied to thread "%(thread)s" that you are watching')
+
+        subject_formats = {'user': self.post.poster_name, 'thread': thread.title}
+
+        return build_mail(
+            self.recipient,
+            subject % subject_formats,
+            'misago/emails/thread/reply',
+            sender=self.post.poster,
+            context={
+                'thread': thread,
+                'post': self.post,
+            },
+        )
@@ -3,10 +3,46 @@ from math import ceil
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
-from django.db import models
+from django.db import connection, models
 from django.utils import timezone
 
 
+UPDATE_VOTES_SQL = """
+    UPDATE misago_threads_poll AS poll
+    SET
+        choices = COALESCE((
+            SELECT jsonb_agg(
+                jsonb_set(choices.item, '{votes}', to_jsonb(
+                    (choices.item->>'votes')::integer
+                    + (choices.item->>'hash' = ANY(%s))::integer
+                    - (choices.item->>'hash' = ANY(%s))::integer
+                ))
+                ORDER BY choices.position
+            )
+            FROM jsonb_array_elements(poll.choices) WITH ORDINALITY AS choices(item, position)
+        ), '[]'::jsonb),
+        votes = poll.votes + %s
+    WHERE poll.id = %s
+"""
+
+SYNCHRONIZE_VOTES_SQL = """
+    UPDATE misago_threads_poll AS poll
+    SET
+        choices = COALESCE((
+            SELECT jsonb_agg(
+                jsonb_set(choices.item, '{votes}', to_jsonb((
+                    SELECT count(*) FROM misago_threads_pollvote AS vote
+                    WHERE vote.poll_id = poll.id AND vote.choice_hash = choices.item->>'hash'
+                )))
+                ORDER BY choices.position
+            )
+            FROM jsonb_array_elements(poll.choices) WITH ORDINALITY AS choices(item, position)
+        ), '[]'::jsonb),
+        votes = (SELECT count(*) FROM misago_threads_pollvote AS vote WHERE vote.poll_id = poll.id)
+    WHERE poll.id = %s
+"""
+
+
 class Poll(models.Model):
     category = models.ForeignKey(
         'misago_categories.Category',
@@ -44,6 +80,22 @@ class Poll(models.Model):
 
             self.pollvote_set.update(thread=self.thread, category_id=self.category_id)
 
+    def update_votes(self, added_choices, removed_choices):
+        """updates choices votes counts in single query, not overwriting concurrent votes"""
+        votes_change = len(added_choices) - len(removed_choices)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                UPDATE_VOTES_SQL,
+                [list(added_choices), list(removed_choices), votes_change, self.pk],
+            )
+        self.refresh_from_db(fields=['choices', 'votes'])
+
+    def synchronize_votes(self):
+        """recounts choices votes from poll's votes"""
+        with connection.cursor() as cursor:
+            cursor.execute(SYNCHRONIZE_VOTES_SQL, [self.pk])
+        self.refresh_from_db(fields=['choices', 'votes'])
+
     @property
     def ends_on(self):
         if self.length:
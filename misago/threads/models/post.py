@@ -3,7 +3,7 @@ import copy
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.fields import JSONField
 from django.contrib.postgres.search import SearchVector, SearchVectorField
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from misago.conf import settings
@@ -72,6 +72,9 @@ class Post(models.Model):
     event_type = models.CharField(max_length=255, null=True, blank=True)
     event_context = JSONField(null=True, blank=True)
 
+    # number of approved posts in thread up to and including this one, events not counted
+    position = models.PositiveIntegerField(default=0)
+
     likes = models.PositiveIntegerField(default=0)
     last_likes = JSONField(null=True, blank=True)
 
@@ -110,6 +113,27 @@ class Post(models.Model):
     def __str__(self):
         return '%s...' % self.original[10:].strip()
 
+    def save(self, *args, **kwargs):
+        if not self.pk and self.thread_id:
+            with transaction.atomic():
+                self.position = self.get_new_position()
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+
+    def get_new_position(self):
+        # lock thread's row until post is inserted, so concurrent replies
+        # read their previous posts one after another and get unique positions
+        from .thread import Thread
+        Thread.objects.select_for_update().filter(pk=self.thread_id).values_list('pk').first()
+
+        previous_post = Post.objects.filter(thread_id=self.thread_id).order_by('-id')
+        position = previous_post.values_list('position', flat=True).first() or 0
+
+        if self.is_event or self.is_unapproved:
+            return position
+        return position + 1
+
     def delete(self, *args, **kwargs):
         from misago.threads.signals import delete_post
         delete_post.send(sender=self)
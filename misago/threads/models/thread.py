@@ -1,5 +1,5 @@
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import connection, models
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
@@ -8,6 +8,20 @@ from misago.core.pgutils import PgPartialIndex
 from misago.core.utils import slugify
 
 
+UPDATE_POSTS_POSITIONS_SQL = """
+    UPDATE misago_threads_post AS post
+    SET position = positions.position
+    FROM (
+        SELECT
+            id,
+            count(*) FILTER (WHERE NOT is_event AND NOT is_unapproved) OVER (ORDER BY id) AS position
+        FROM misago_threads_post
+        WHERE thread_id = %s
+    ) AS positions
+    WHERE post.id = positions.id AND post.position <> positions.position
+"""
+
+
 class Thread(models.Model):
     WEIGHT_DEFAULT = 0
     WEIGHT_PINNED = 1
@@ -158,8 +172,12 @@ class Thread(models.Model):
         merge_thread.send(sender=self, other_thread=other_thread)
 
     def move(self, new_category):
+        from misago.threads.etags import invalidate_categories_version
         from misago.threads.signals import move_thread
 
+        # post_save only invalidates category thread is moved to
+        invalidate_categories_version([self.category_id])
+
         self.category = new_category
         move_thread.send(sender=self)
 
@@ -207,6 +225,12 @@ class Thread(models.Model):
             else:
                 self.has_events = self.post_set.filter(is_event=True).exists()
 
+        self.update_posts_positions()
+
+    def update_posts_positions(self):
+        with connection.cursor() as cursor:
+            cursor.execute(UPDATE_POSTS_POSITIONS_SQL, [self.pk])
+
     @property
     def has_best_answer(self):
         return bool(self.best_answer_id)
@@ -1,15 +1,46 @@
-from django.db import models
+from django.db import models, transaction
 
 from misago.conf import settings
+from misago.core import threadstore
+from misago.core.cache import cache
+
+
+PARTICIPANTS_CACHE = 'misago_thread_participants'
+PENDING_CHANGES = 'misago_thread_participants_pending'
 
 
 class ThreadParticipantManager(models.Manager):
+    def get_participants(self, thread):
+        """returns list of (user id, is owner) tuples for thread, cached"""
+        cache_key = get_participants_cache_key(thread)
+        participants = cache.get(cache_key)
+        if participants is None:
+            queryset = ThreadParticipant.objects.filter(thread=thread)
+            participants = list(queryset.values_list('user_id', 'is_owner'))
+
+            # don't cache participants changed by transaction that may still be rolled back
+            if cache_key not in get_pending_changes():
+                cache.set(cache_key, participants)
+        return participants
+
+    def clear_cache(self, thread):
+        cache_key = get_participants_cache_key(thread)
+        cache.delete(cache_key)
+
+        if transaction.get_connection().in_atomic_block:
+            get_pending_changes().add(cache_key)
+
+        # clear cache again after transaction is committed, so participants
+        # read by other processes before commit don't stay in cache
+        transaction.on_commit(lambda: clear_pending_change(cache_key))
+
     def set_owner(self, thread, user):
         ThreadParticipant.objects.filter(thread=thread, is_owner=True).update(is_owner=False)
 
         self.remove_participant(thread, user)
 
         ThreadParticipant.objects.create(thread=thread, user=user, is_owner=True)
+        self.clear_cache(thread)
 
     def add_participants(self, thread, users):
         bulk = []
@@ -17,9 +48,11 @@ class ThreadParticipantManager(models.Manager):
             bulk.append(ThreadParticipant(thread=thread, user=user, is_owner=False))
 
         ThreadParticipant.objects.bulk_create(bulk)
+        self.clear_cache(thread)
 
     def remove_participant(self, thread, user):
         ThreadParticipant.objects.filter(thread=thread, user=user).delete()
+        self.clear_cache(thread)
 
 
 class ThreadParticipant(models.Model):
@@ -34,3 +67,19 @@ class ThreadParticipant(models.Model):
     is_owner = models.BooleanField(default=False)
 
     objects = ThreadParticipantManager()
+
+
+def get_participants_cache_key(thread):
+    return '%s_%s' % (PARTICIPANTS_CACHE, thread.pk)
+
+
+def get_pending_changes():
+    pending_changes = threadstore.get(PENDING_CHANGES)
+    if pending_changes is None:
+        pending_changes = threadstore.set(PENDING_CHANGES, set())
+    return pending_changes
+
+
+def clear_pending_change(cache_key):
+    get_pending_changes().discard(cache_key)
+    cache.delete(cache_key)
@@ -2,6 +2,8 @@ from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import ugettext as _
 
+from misago.users.activepostersranking import record_approved_post
+
 from .exceptions import ModerationError
 
 
@@ -19,6 +21,7 @@ def approve_post(user, post):
     if post.is_unapproved:
         post.is_unapproved = False
         post.save(update_fields=['is_unapproved'])
+        record_approved_post(post)
         return True
     else:
         return False
@@ -2,6 +2,7 @@ from django.db import transaction
 from django.utils import timezone
 
 from misago.threads.events import record_event
+from misago.users.activepostersranking import record_approved_post
 
 
 __all__ = [
@@ -106,6 +107,8 @@ def approve_thread(request, thread):
     if thread.is_unapproved:
         thread.first_post.is_unapproved = False
         thread.first_post.save(update_fields=['is_unapproved'])
+        record_approved_post(thread.first_post)
+        thread.update_posts_positions()
 
         thread.is_unapproved = False
 
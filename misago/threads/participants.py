@@ -1,10 +1,15 @@
+from copy import copy
+
 from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.utils.translation import ugettext as _
 
 from misago.core.mail import build_mail, send_messages
+from misago.readtracker.dates import get_cutoff_date
 
 from .events import record_event
 from .models import ThreadParticipant
+from .permissions import exclude_invisible_posts
 
 
 UserModel = get_user_model()
@@ -41,13 +46,19 @@ def make_thread_participants_aware(user, thread):
     thread.participants_list = []
     thread.participant = None
 
-    participants_qs = ThreadParticipant.objects.filter(thread=thread)
-    participants_qs = participants_qs.select_related('user')
-    for participant in participants_qs.order_by('-is_owner', 'user__slug'):
-        participant.thread = thread
+    participants = ThreadParticipant.objects.get_participants(thread)
+    users = UserModel.objects.in_bulk([user_id for user_id, is_owner in participants])
+
+    for user_id, is_owner in participants:
+        if user_id not in users:
+            continue
+
+        participant = ThreadParticipant(thread=thread, user=users[user_id], is_owner=is_owner)
         thread.participants_list.append(participant)
         if participant.user == user:
             thread.participant = participant
+
+    thread.participants_list.sort(key=lambda p: (not p.is_owner, p.user.slug))
     return thread.participants_list
 
 
@@ -66,6 +77,44 @@ def set_users_unread_private_threads_sync(users=None, participants=None, exclude
     UserModel.objects.filter(id__in=set(users_ids)).update(sync_unread_private_threads=True)
 
 
+def set_threads_participants_unread_private_threads_sync(threads_ids):
+    """set "recount private threads" flag on participants of deleted or changed threads"""
+    UserModel.objects.filter(threadparticipant__thread_id__in=threads_ids).update(
+        sync_unread_private_threads=True,
+    )
+
+
+def increase_unread_private_threads(thread, post, exclude_user=None):
+    """
+    Increase unread private threads count of participants that have read thread
+    before post was made, without recounting all their private threads
+    """
+    users_ids = []
+    for participant in thread.participants_list:
+        if exclude_user and participant.user_id == exclude_user.pk:
+            continue
+        if not has_unread_posts(participant.user, thread, exclude_post=post):
+            users_ids.append(participant.user_id)
+
+    if not users_ids:
+        return
+
+    UserModel.objects.filter(id__in=users_ids).update(
+        unread_private_threads=F('unread_private_threads') + 1,
+    )
+
+
+def has_unread_posts(user, thread, exclude_post=None):
+    queryset = thread.post_set.filter(posted_on__gt=get_cutoff_date(user))
+    if exclude_post:
+        queryset = queryset.exclude(pk=exclude_post.pk)
+    queryset = queryset.exclude(id__in=user.postread_set.values('post'))
+
+    # add participant's acl to copy, leaving acl of request's user on thread's category
+    category = copy(thread.category)
+    return exclude_invisible_posts(user, category, queryset).exists()
+
+
 def set_owner(thread, user):
     ThreadParticipant.objects.set_owner(thread, user)
 
@@ -170,7 +219,7 @@ def remove_participant(request, thread, user):
     if not remaining_participants:
         thread.delete()
     else:
-        thread.threadparticipant_set.filter(user=user).delete()
+        ThreadParticipant.objects.remove_participant(thread, user)
         thread.subscription_set.filter(user=user).delete()
 
         if removed_owner:
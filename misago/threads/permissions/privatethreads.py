@@ -9,7 +9,7 @@ from misago.acl.models import Role
 from misago.categories import PRIVATE_THREADS_ROOT_NAME
 from misago.categories.models import Category
 from misago.core.forms import YesNoSwitch
-from misago.threads.models import Thread
+from misago.threads.models import Thread, ThreadParticipant
 
 
 __all__ = [
@@ -187,7 +187,8 @@ def allow_see_private_thread(user, target):
     else:
         can_see_reported = False
 
-    can_see_participating = user in [p.user for p in target.participants_list]
+    participants = ThreadParticipant.objects.get_participants(target)
+    can_see_participating = user.pk in [user_id for user_id, is_owner in participants]
 
     if not (can_see_participating or can_see_reported):
         raise Http404()
@@ -65,6 +65,7 @@ __all__ = [
     'can_delete_event',
     'exclude_invisible_threads',
     'exclude_invisible_posts',
+    'filter_users_that_can_see_post',
 ]
 
 
@@ -851,6 +852,34 @@ def allow_see_post(user, target):
 can_see_post = return_boolean(allow_see_post)
 
 
+def filter_users_that_can_see_post(users, thread, post):
+    """
+    Filter users list to ones that can see thread and post
+
+    Users with same acl_key have same permissions, so thread and post
+    visibility is evaluated once for every acl_key. Thread's starter and post's
+    author have it evaluated separately, because ownership changes it, and so
+    do users that have no acl_key set yet.
+    """
+    acl_keys_results = {}
+
+    visible_users = []
+    for user in users:
+        if not user.acl_key or user.pk in (thread.starter_id, post.poster_id):
+            can_see = can_see_thread(user, thread) and can_see_post(user, post)
+        else:
+            if user.acl_key not in acl_keys_results:
+                acl_keys_results[user.acl_key] = (
+                    can_see_thread(user, thread) and can_see_post(user, post)
+                )
+            can_see = acl_keys_results[user.acl_key]
+
+        if can_see:
+            visible_users.append(user)
+
+    return visible_users
+
+
 def allow_edit_post(user, target):
     if user.is_anonymous:
         raise PermissionDenied(_("You have to sign in to edit posts."))
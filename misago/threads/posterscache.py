@@ -0,0 +1,139 @@
+"""
+Posters cards cache
+
+Poster card is everything that posts API shows about post's author except
+author's online status, which depends on user that is viewing the post. Same
+few users repeat through thread's pages, so their cards are serialized once
+and kept in process memory and in cache.
+
+Cards are cached under key made of poster's id and profile version, which is
+checksum of poster's fields displayed on card and poster's rank, so there's no need
+to invalidate cards when user or rank changes.
+"""
+from hashlib import md5
+
+from misago.core.cache import cache
+from misago.users.serializers import StatusSerializer, UserSerializer
+
+
+CACHE_KEY = 'misago_poster_card'
+CACHE_TIMEOUT = 3600 * 24
+
+LOCAL_CACHE_SIZE = 1000
+
+PosterCardSerializer = UserSerializer.subset_fields(
+    'id',
+    'username',
+    'real_name',
+    'rank',
+    'avatars',
+    'signature',
+    'title',
+    'posts',
+    'url',
+)
+
+_local_cache = {}
+
+
+def get_poster_card(poster):
+    try:
+        card = poster.card
+    except AttributeError:
+        card = get_posters_cards([poster])[poster.pk]
+    return add_status_to_card(poster, card)
+
+
+def add_posters_cards(posters):
+    """sets card on posters, fetching cards missing from memory in one go"""
+    cards = get_posters_cards(posters)
+    for poster in posters:
+        poster.card = cards[poster.pk]
+
+
+def get_posters_cards(posters):
+    posters_keys = {}
+    for poster in posters:
+        posters_keys[poster.pk] = get_cache_key(poster)
+
+    cards = {}
+    missing_keys = []
+    for poster_id, cache_key in posters_keys.items():
+        if cache_key in _local_cache:
+            cards[poster_id] = _local_cache[cache_key]
+        else:
+            missing_keys.append(cache_key)
+
+    if not missing_keys:
+        return cards
+
+    cached_cards = cache.get_many(missing_keys)
+    new_cards = {}
+
+    for poster in posters:
+        if poster.pk in cards:
+            continue
+
+        cache_key = posters_keys[poster.pk]
+        card = cached_cards.get(cache_key)
+        if card is None:
+            card = PosterCardSerializer(poster).data
+            new_cards[cache_key] = card
+
+        cards[poster.pk] = card
+        set_local_card(cache_key, card)
+
+    if new_cards:
+        cache.set_many(new_cards, CACHE_TIMEOUT)
+
+    return cards
+
+
+def set_local_card(cache_key, card):
+    if len(_local_cache) >= LOCAL_CACHE_SIZE:
+        _local_cache.clear()
+    _local_cache[cache_key] = card
+
+
+def clear_local_cache():
+    _local_cache.clear()
+
+
+def get_cache_key(poster):
+    return '%s_%s_%s' % (CACHE_KEY, poster.pk, get_profile_version(poster))
+
+
+def get_profile_version(poster):
+    version_parts = [
+        poster.username,
+        poster.slug,
+        poster.get_real_name(),
+        poster.title,
+        poster.posts,
+        poster.avatars,
+        poster.signature_checksum,
+    ]
+
+    if poster.rank_id:
+        rank = poster.rank
+        version_parts += [
+            rank.pk,
+            rank.name,
+            rank.slug,
+            rank.description,
+            rank.title,
+            rank.css_class,
+            rank.is_default,
+            rank.is_tab,
+        ]
+
+    return md5(repr(version_parts).encode()).hexdigest()
+
+
+def add_status_to_card(poster, card):
+    card = dict(card)
+    try:
+        card['status'] = StatusSerializer(poster.status).data
+    except AttributeError:
+        card['status'] = None
+    return card
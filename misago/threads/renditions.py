@@ -0,0 +1,51 @@
+from io import BytesIO
+
+from PIL import Image, features
+
+
+WEBP_MODES = ('RGB', 'RGBA')
+
+
+def create_renditions(image_data, fileformat, size_limit):
+    """
+    creates renditions for uploaded image
+
+    this function works on raw image data and returns raw renditions data,
+    so it can be ran in separate process without access to storage or database
+    """
+    image = Image.open(BytesIO(image_data))
+    width, height = image.size
+
+    renditions = {
+        'width': width,
+        'height': height,
+        'thumbnail': None,
+        'webp': None,
+    }
+
+    downscale_image = width > size_limit[0] or height > size_limit[1]
+    strip_animation = fileformat == 'gif'
+
+    if not (downscale_image or strip_animation):
+        return renditions
+
+    if downscale_image:
+        image.thumbnail(size_limit)
+
+    thumb_stream = BytesIO()
+    if fileformat == 'jpg':
+        # normalize jpg to jpeg for Pillow
+        image.save(thumb_stream, 'jpeg')
+    else:
+        image.save(thumb_stream, fileformat)
+    renditions['thumbnail'] = thumb_stream.getvalue()
+
+    if features.check_module('webp'):
+        if image.mode not in WEBP_MODES:
+            image = image.convert('RGBA')
+
+        webp_stream = BytesIO()
+        image.save(webp_stream, 'webp')
+        renditions['webp'] = webp_stream.getvalue()
+
+    return renditions
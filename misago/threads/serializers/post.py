@@ -4,27 +4,14 @@ from django.urls import reverse
 
 from misago.core.serializers import MutableFields
 from misago.threads.models import Post
-from misago.users.serializers import UserSerializer as BaseUserSerializer
+from misago.threads.posterscache import get_poster_card
 
 
 __all__ = ['PostSerializer']
 
-UserSerializer = BaseUserSerializer.subset_fields(
-    'id',
-    'username',
-    'real_name',
-    'rank',
-    'avatars',
-    'signature',
-    'title',
-    'status',
-    'posts',
-    'url',
-)
-
 
 class PostSerializer(serializers.ModelSerializer, MutableFields):
-    poster = UserSerializer(many=False, read_only=True)
+    poster = serializers.SerializerMethodField()
     content = serializers.SerializerMethodField()
     attachments = serializers.SerializerMethodField()
     last_editor = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -74,6 +61,12 @@ class PostSerializer(serializers.ModelSerializer, MutableFields):
             'url',
         ]
 
+    def get_poster(self, obj):
+        if obj.poster:
+            return get_poster_card(obj.poster)
+        else:
+            return None
+
     def get_content(self, obj):
         if obj.is_valid and not obj.is_event and (not obj.is_hidden or obj.acl['can_see_hidden']):
             return obj.content
@@ -2,7 +2,7 @@ from collections import OrderedDict
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django.utils.translation import ugettext as _
 
@@ -12,18 +12,69 @@ from misago.core.pgutils import chunk_queryset
 from misago.users.signals import (
     anonymize_user_data, archive_user_data, delete_user_content, username_changed)
 
-from .anonymize import ANONYMIZABLE_EVENTS, anonymize_event, anonymize_post_last_likes
-from .models import Attachment, Poll, PollVote, Post, PostEdit, PostLike, Thread
+from . import anonymouscache
+from .anonymize import anonymize_events, anonymize_posts_last_likes
+from .delete import delete_threads
+from .etags import (
+    invalidate_categories_version, invalidate_subscriptions_version, invalidate_thread_version)
+from .models import (
+    Attachment, DeletedAttachmentFile, EmailNotification, Poll, PollVote, Post, PostEdit, PostLike,
+    Subscription, Thread, ThreadParticipant)
+from .participants import set_threads_participants_unread_private_threads_sync
 
 
 delete_post = Signal()
 delete_thread = Signal()
+delete_threads_content = Signal(providing_args=["threads"])
 merge_post = Signal(providing_args=["other_post"])
 merge_thread = Signal(providing_args=["other_thread"])
 move_post = Signal()
 move_thread = Signal()
 
 
+@receiver([post_save, post_delete], sender=Poll)
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=PostLike)
+@receiver([post_save, post_delete], sender=Thread)
+@receiver(delete_threads_content)
+def invalidate_anonymous_cache(sender, **kwargs):
+    anonymouscache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Poll)
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=PostLike)
+@receiver([post_save, post_delete], sender=ThreadParticipant)
+def invalidate_thread_etags(sender, instance, **kwargs):
+    invalidate_thread_version(instance.thread_id)
+
+
+@receiver([post_save, post_delete], sender=Thread)
+def invalidate_thread_and_category_etags(sender, instance, **kwargs):
+    invalidate_thread_version(instance.pk)
+    invalidate_categories_version([instance.category_id])
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_etags(sender, instance, **kwargs):
+    invalidate_categories_version([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Subscription)
+def invalidate_subscriptions_etags(sender, instance, **kwargs):
+    invalidate_subscriptions_version(instance.user_id)
+
+
+@receiver(delete_post)
+def sync_deleted_post_participants(sender, **kwargs):
+    set_threads_participants_unread_private_threads_sync([sender.thread_id])
+
+
+@receiver(delete_thread)
+def sync_deleted_thread_participants(sender, **kwargs):
+    set_threads_participants_unread_private_threads_sync([sender.pk])
+
+
 @receiver(merge_thread)
 def merge_threads(sender, **kwargs):
     other_thread = kwargs['other_thread']
@@ -67,13 +118,32 @@ def move_thread_content(sender, **kwargs):
     Poll.objects.filter(thread=sender).update(category=sender.category)
 
 
+@receiver(delete_threads_content)
+def delete_threads_related_content(sender, **kwargs):
+    threads = kwargs['threads']
+
+    Subscription.objects.filter(thread_id__in=threads).delete()
+    set_threads_participants_unread_private_threads_sync(threads)
+    ThreadParticipant.objects.filter(thread_id__in=threads).delete()
+    PollVote.objects.filter(thread_id__in=threads).delete()
+    Poll.objects.filter(thread_id__in=threads).delete()
+    PostLike.objects.filter(thread_id__in=threads).delete()
+    PostEdit.objects.filter(thread_id__in=threads).delete()
+    EmailNotification.objects.filter(post__thread_id__in=threads).delete()
+    Post.mentions.through.objects.filter(post__thread_id__in=threads).delete()
+
+    # attachments files are deleted in background by deleteattachmentsfiles
+    attachments = Attachment.objects.filter(post__thread_id__in=threads)
+    DeletedAttachmentFile.objects.delete_attachments(attachments)
+
+
 @receiver(delete_category_content)
 def delete_category_threads(sender, **kwargs):
     sender.subscription_set.all().delete()
     sender.pollvote_set.all().delete()
     sender.poll_set.all().delete()
     sender.postlike_set.all().delete()
-    sender.thread_set.all().delete()
+    delete_threads(sender.thread_set.all())
     sender.postedit_set.all().delete()
     sender.post_set.all().delete()
 
@@ -90,6 +160,8 @@ def move_category_threads(sender, **kwargs):
     sender.pollvote_set.update(category=new_category)
     sender.subscription_set.update(category=new_category)
 
+    invalidate_categories_version([sender.pk, new_category.pk])
+
 
 @receiver(delete_user_content)
 def delete_user_threads(sender, **kwargs):
@@ -102,10 +174,7 @@ def delete_user_threads(sender, **kwargs):
             post.last_likes = cleaned_likes
             post.save(update_fields=['last_likes'])
             
-    for thread in chunk_queryset(sender.thread_set):
-        recount_categories.add(thread.category_id)
-        with transaction.atomic():
-            thread.delete()
+    recount_categories.update(delete_threads(sender.thread_set.all()))
 
     for post in chunk_queryset(sender.post_set):
         recount_categories.add(post.category_id)
@@ -183,20 +252,14 @@ def archive_user_polls(sender, archive=None, **kwargs):
 
 @receiver(anonymize_user_data)
 def anonymize_user_in_events(sender, **kwargs):
-    queryset = Post.objects.filter(
-        is_event=True,
-        event_type__in=ANONYMIZABLE_EVENTS,
-        event_context__user__id=sender.id,
-    )
-
-    for event in chunk_queryset(queryset):
-        anonymize_event(sender, event)
+    queryset = Post.objects.filter(event_context__user__id=sender.id)
+    anonymize_events(sender, queryset)
 
 
 @receiver([anonymize_user_data])
 def anonymize_user_in_likes(sender, **kwargs):
-    for post in chunk_queryset(sender.liked_post_set):
-        anonymize_post_last_likes(sender, post)
+    queryset = Post.objects.filter(id__in=sender.postlike_set.values('post_id'))
+    anonymize_posts_last_likes(sender, queryset)
 
 
 @receiver([anonymize_user_data, username_changed])
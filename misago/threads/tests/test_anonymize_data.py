@@ -209,6 +209,27 @@ class AnonymizeLikesTests(AuthenticatedUserTestCase):
             },
         ])
 
+    def test_anonymize_user_likes_skips_other_posts(self):
+        """other users likes are left untouched by user.anonymize_data"""
+        category = Category.objects.get(slug='first-category')
+        thread = testutils.post_thread(category)
+        post = testutils.reply_thread(thread)
+        post.acl = {'can_like': True}
+
+        user = get_mock_user()
+
+        patch_is_liked(self.get_request(self.user), post, 1)
+
+        user.anonymize_data()
+
+        last_likes = Post.objects.get(pk=post.pk).last_likes
+        self.assertEqual(last_likes, [
+            {
+                'id': self.user.id,
+                'username': self.user.username,
+            },
+        ])
+
 
 class AnonymizePostsTests(AuthenticatedUserTestCase):
     def setUp(self):
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.test import override_settings
+
+from misago.categories.models import Category
+from misago.core import threadstore
+from misago.core.cachebuster import CACHE_KEY as CACHEBUSTER_KEY
+from misago.core.testutils import MisagoTestCase
+from misago.threads import testutils
+from misago.threads.models import Thread
+
+
+@override_settings(MISAGO_ANONYMOUS_CACHE_TIMEOUT=300)
+class AnonymousCacheTests(MisagoTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.category = Category.objects.get(slug='first-category')
+        self.thread = testutils.post_thread(self.category, title='Cached thread')
+
+    def test_page_is_cached(self):
+        """page rendered for guest is served from cache"""
+        response = self.client.get(self.thread.get_absolute_url())
+        self.assertContains(response, 'Cached thread')
+        self.assertTrue(response['ETag'])
+        self.assertTrue(response['Last-Modified'])
+
+        Thread.objects.filter(pk=self.thread.pk).update(title='Changed thread')
+
+        response = self.client.get(self.thread.get_absolute_url())
+        self.assertContains(response, 'Cached thread')
+        self.assertNotContains(response, '__MISAGO_CSRF_TOKEN__')
+
+    def test_cached_page_clears_threadstore(self):
+        """serving cached page leaves threadstore empty for next request"""
+        self.client.get(self.thread.get_absolute_url())
+        Thread.objects.filter(pk=self.thread.pk).update(title='Changed thread')
+
+        response = self.client.get(self.thread.get_absolute_url())
+        self.assertContains(response, 'Cached thread')
+        self.assertIsNone(threadstore.get(CACHEBUSTER_KEY))
+
+    def test_page_is_invalidated(self):
+        """cached page is invalidated when thread is changed"""
+        self.client.get(self.thread.get_absolute_url())
+
+        self.thread.set_title('Changed thread')
+        self.thread.save()
+
+        response = self.client.get(self.thread.get_absolute_url())
+        self.assertContains(response, 'Changed thread')
+
+    def test_conditional_request(self):
+        """cached page supports conditional requests"""
+        response = self.client.get(self.thread.get_absolute_url())
+
+        response = self.client.get(
+            self.thread.get_absolute_url(),
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_authenticated_page_is_not_cached(self):
+        """page is not cached for user with session"""
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'notasession'
+        self.client.get(self.thread.get_absolute_url())
+
+        Thread.objects.filter(pk=self.thread.pk).update(title='Changed thread')
+
+        response = self.client.get(self.thread.get_absolute_url())
+        self.assertContains(response, 'Changed thread')
@@ -1,12 +1,15 @@
 import os
+from io import StringIO
 
 from PIL import Image
 
+from django.core.management import call_command
 from django.urls import reverse
 
 from misago.acl.models import Role
 from misago.acl.testutils import override_acl
 from misago.conf import settings
+from misago.threads.management.commands import deleteattachmentsfiles, processattachments
 from misago.threads.models import Attachment, AttachmentType
 from misago.users.testutils import AuthenticatedUserTestCase
 
@@ -27,6 +30,10 @@ class AttachmentsApiTestCase(AuthenticatedUserTestCase):
 
         self.api_link = reverse('misago:api:attachment-list')
 
+    def process_attachment(self, attachment):
+        call_command(processattachments.Command(), stdout=StringIO())
+        return Attachment.objects.get(pk=attachment.pk)
+
     def override_acl(self, new_acl=None):
         if new_acl:
             acl = self.user.acl_cache.copy()
@@ -227,10 +234,13 @@ class AttachmentsApiTestCase(AuthenticatedUserTestCase):
 
         self.assertEqual(self.user.audittrail_set.count(), 1)
 
-        # files associated with attachment are deleted on its deletion
+        # files associated with attachment are queued for deletion on its deletion
         file_path = attachment.file.path
         self.assertTrue(os.path.exists(file_path))
         attachment.delete()
+        self.assertTrue(os.path.exists(file_path))
+
+        call_command(deleteattachmentsfiles.Command(), stdout=StringIO())
         self.assertFalse(os.path.exists(file_path))
 
     def test_small_image_upload(self):
@@ -259,17 +269,24 @@ class AttachmentsApiTestCase(AuthenticatedUserTestCase):
         self.assertTrue(not attachment.file)
         self.assertIsNotNone(attachment.image)
         self.assertTrue(not attachment.thumbnail)
+        self.assertFalse(attachment.is_processed)
 
         self.assertTrue(str(attachment.image).endswith('small.jpg'))
 
         self.assertIsNone(response_json['post'])
         self.assertEqual(response_json['uploader_name'], self.user.username)
         self.assertEqual(response_json['url']['index'], attachment.get_absolute_url())
-        self.assertIsNone(response_json['url']['thumb'])
+        self.assertEqual(response_json['url']['thumb'], attachment.get_thumbnail_url())
         self.assertEqual(response_json['url']['uploader'], self.user.get_absolute_url())
 
         self.assertEqual(self.user.audittrail_set.count(), 1)
 
+        # small image has no thumbnail after processing
+        attachment = self.process_attachment(attachment)
+        self.assertTrue(attachment.is_processed)
+        self.assertTrue(not attachment.thumbnail)
+        self.assertIsNone(attachment.get_thumbnail_url())
+
     def test_large_image_upload(self):
         """successful large image upload creates orphan attachment with thumbnail"""
         self.override_acl({'max_attachment_size': 10 * 1024})
@@ -297,6 +314,10 @@ class AttachmentsApiTestCase(AuthenticatedUserTestCase):
 
         self.assertTrue(not attachment.file)
         self.assertIsNotNone(attachment.image)
+        self.assertFalse(attachment.is_processed)
+
+        attachment = self.process_attachment(attachment)
+        self.assertTrue(attachment.is_processed)
         self.assertIsNotNone(attachment.thumbnail)
 
         self.assertTrue(str(attachment.image).endswith('large.png'))
@@ -324,6 +345,11 @@ class AttachmentsApiTestCase(AuthenticatedUserTestCase):
 
         attachment.delete()
 
+        self.assertTrue(os.path.exists(image_path))
+        self.assertTrue(os.path.exists(thumbnail_path))
+
+        call_command(deleteattachmentsfiles.Command(), stdout=StringIO())
+
         self.assertFalse(os.path.exists(image_path))
         self.assertFalse(os.path.exists(thumbnail_path))
 
@@ -352,6 +378,10 @@ class AttachmentsApiTestCase(AuthenticatedUserTestCase):
 
         self.assertTrue(not attachment.file)
         self.assertIsNotNone(attachment.image)
+        self.assertFalse(attachment.is_processed)
+
+        attachment = self.process_attachment(attachment)
+        self.assertTrue(attachment.is_processed)
         self.assertIsNotNone(attachment.thumbnail)
 
         self.assertTrue(str(attachment.image).endswith('animated.gif'))
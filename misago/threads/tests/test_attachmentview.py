@@ -1,5 +1,9 @@
 import os
+from io import StringIO
+from unittest.mock import patch
 
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 
 from misago.acl.models import Role
@@ -7,7 +11,8 @@ from misago.acl.testutils import override_acl
 from misago.categories.models import Category
 from misago.conf import settings
 from misago.threads import testutils
-from misago.threads.models import Attachment, AttachmentType
+from misago.threads.management.commands import processattachments
+from misago.threads.models import Attachment, AttachmentType, DeletedAttachmentFile
 from misago.users.testutils import AuthenticatedUserTestCase
 
 
@@ -244,3 +249,49 @@ class AttachmentViewTestCase(AuthenticatedUserTestCase):
 
         response = self.client.get(attachment.get_absolute_url() + '?shva=1')
         self.assertSuccess(response)
+
+    def test_unprocessed_image_thumb(self):
+        """user retrieves placeholder for thumbnail of image that wasn't processed yet"""
+        attachment = self.upload_image()
+
+        response = self.client.get(attachment.get_thumbnail_url() + '?shva=1')
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            response['location'].endswith(settings.MISAGO_ATTACHMENT_PROCESSING_IMAGE))
+
+    def test_processed_image_thumb(self):
+        """user retrieves image for thumbnail of image that didn't need one"""
+        attachment = self.upload_image()
+        thumbnail_url = attachment.get_thumbnail_url()
+
+        call_command(processattachments.Command(), stdout=StringIO())
+        attachment = Attachment.objects.get(pk=attachment.pk)
+
+        response = self.client.get(thumbnail_url + '?shva=1')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['location'], attachment.image.url)
+        self.assertIn('Accept', response['Vary'])
+
+    @override_settings(MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT=(10, 10))
+    def test_image_deleted_during_processing(self):
+        """renditions of image deleted during processing are queued for deletion"""
+        self.upload_image()
+
+        processed_attachments = []
+        set_renditions = Attachment.set_renditions
+
+        def delete_and_set_renditions(attachment, renditions):
+            DeletedAttachmentFile.objects.delete_attachments(
+                Attachment.objects.filter(pk=attachment.pk))
+            set_renditions(attachment, renditions)
+            processed_attachments.append(attachment)
+
+        with patch.object(Attachment, 'set_renditions', delete_and_set_renditions):
+            call_command(processattachments.Command(), stdout=StringIO())
+
+        attachment = processed_attachments[0]
+        self.assertTrue(attachment.thumbnail)
+
+        queued_paths = DeletedAttachmentFile.objects.values_list('path', flat=True)
+        self.assertIn(attachment.image.name, queued_paths)
+        self.assertIn(attachment.thumbnail.name, queued_paths)
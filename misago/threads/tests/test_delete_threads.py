@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from misago.categories.models import Category
+from misago.readtracker.models import PostRead
+from misago.threads import testutils
+from misago.threads.delete import delete_threads
+from misago.threads.models import (
+    Attachment, AttachmentType, DeletedAttachmentFile, EmailNotification, Poll, PollVote, Post,
+    PostLike, Thread)
+
+
+UserModel = get_user_model()
+
+
+class DeleteThreadsTests(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user("Bob", "bob@bob.com", "Pass.123")
+        self.category = Category.objects.get(slug='first-category')
+
+    def test_delete_threads(self):
+        """delete_threads deletes threads from queryset and their content"""
+        thread = testutils.post_thread(self.category, poster=self.user)
+        post = testutils.reply_thread(thread, poster=self.user)
+        testutils.like_post(post, self.user)
+        testutils.post_poll(thread, self.user)
+        PostRead.objects.create(
+            user=self.user,
+            category=self.category,
+            thread=thread,
+            post=post,
+        )
+
+        other_thread = testutils.post_thread(self.category)
+
+        deleted_categories = delete_threads(Thread.objects.filter(id=thread.id), chunk_size=1)
+        self.assertEqual(deleted_categories, set([self.category.id]))
+
+        self.assertFalse(Thread.objects.filter(id=thread.id).exists())
+        self.assertFalse(Post.objects.filter(thread_id=thread.id).exists())
+        self.assertFalse(PostLike.objects.filter(thread_id=thread.id).exists())
+        self.assertFalse(Poll.objects.filter(thread_id=thread.id).exists())
+        self.assertFalse(PollVote.objects.filter(thread_id=thread.id).exists())
+        self.assertFalse(PostRead.objects.filter(thread_id=thread.id).exists())
+
+        Thread.objects.get(id=other_thread.id)
+
+    def test_delete_threads_in_chunks(self):
+        """delete_threads deletes all threads in queryset in multiple chunks"""
+        for _ in range(5):
+            testutils.post_thread(self.category)
+
+        delete_threads(self.category.thread_set.all(), chunk_size=2)
+        self.assertFalse(self.category.thread_set.exists())
+        self.assertFalse(self.category.post_set.exists())
+
+    def test_delete_threads_attachments(self):
+        """delete_threads deletes attachments and queues their files for deletion"""
+        thread = testutils.post_thread(self.category, poster=self.user)
+
+        attachment = Attachment(
+            secret=Attachment.generate_new_secret(),
+            filetype=AttachmentType.objects.order_by('id').last(),
+            post=thread.first_post,
+            size=1000,
+            uploader=self.user,
+            uploader_name=self.user.username,
+            uploader_slug=self.user.slug,
+            filename='testfile.zip',
+        )
+        attachment.file = ContentFile(b'test', 'testfile.zip')
+        attachment.save()
+
+        delete_threads(Thread.objects.filter(id=thread.id))
+
+        self.assertFalse(Attachment.objects.filter(id=attachment.id).exists())
+        DeletedAttachmentFile.objects.get(path=attachment.file.name)
+
+    def test_delete_threads_email_notifications(self):
+        """delete_threads deletes e-mail notifications queued for threads posts"""
+        thread = testutils.post_thread(self.category)
+        post = testutils.reply_thread(thread)
+        EmailNotification.objects.queue_reply(post, [self.user])
+
+        delete_threads(Thread.objects.filter(id=thread.id))
+
+        self.assertFalse(EmailNotification.objects.exists())
+
+    def test_delete_threads_clears_category_last_thread(self):
+        """delete_threads clears deleted thread from category's last thread"""
+        thread = testutils.post_thread(self.category)
+
+        category = Category.objects.get(id=self.category.id)
+        self.assertEqual(category.last_thread_id, thread.id)
+
+        delete_threads(Thread.objects.filter(id=thread.id))
+
+        category = Category.objects.get(id=self.category.id)
+        self.assertIsNone(category.last_thread_id)
@@ -0,0 +1,69 @@
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase
+
+from misago.threads.management.commands import deleteattachmentsfiles
+from misago.threads.models import Attachment, AttachmentType, DeletedAttachmentFile
+
+
+class DeleteAttachmentsFilesTests(TestCase):
+    def create_attachment(self):
+        filetype = AttachmentType.objects.order_by('id').last()
+        attachment = Attachment(
+            secret=Attachment.generate_new_secret(),
+            filetype=filetype,
+            size=1000,
+            uploader_name='bob',
+            uploader_slug='bob',
+            filename='testfile_{}.zip'.format(Attachment.objects.count() + 1),
+        )
+        attachment.file = ContentFile(b'test', 'testfile.zip')
+        attachment.save()
+        return attachment
+
+    def test_no_files_delete(self):
+        """command works when there are no files queued"""
+        command = deleteattachmentsfiles.Command()
+
+        out = StringIO()
+        call_command(command, stdout=out)
+        command_output = out.getvalue().strip()
+
+        self.assertEqual(command_output, "No files were found")
+
+    def test_delete_attachments_queues_files(self):
+        """delete_attachments deletes attachments and queues their files"""
+        for _ in range(3):
+            self.create_attachment()
+
+        DeletedAttachmentFile.objects.delete_attachments(Attachment.objects.all())
+
+        self.assertFalse(Attachment.objects.exists())
+        self.assertEqual(DeletedAttachmentFile.objects.count(), 3)
+
+    def test_files_delete(self):
+        """command deletes queued files and clears queue"""
+        storage = Attachment._meta.get_field('file').storage
+
+        paths = []
+        for _ in range(3):
+            attachment = self.create_attachment()
+            paths.append(attachment.file.name)
+            attachment.delete()
+
+        for path in paths:
+            self.assertTrue(storage.exists(path))
+
+        command = deleteattachmentsfiles.Command()
+
+        out = StringIO()
+        call_command(command, batch_size=2, stdout=out)
+
+        command_output = out.getvalue().splitlines()[-1].strip()
+        self.assertEqual(command_output, "Deleted 3 files")
+
+        for path in paths:
+            self.assertFalse(storage.exists(path))
+        self.assertFalse(DeletedAttachmentFile.objects.exists())
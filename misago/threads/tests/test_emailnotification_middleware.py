@@ -1,8 +1,10 @@
 from copy import deepcopy
 from datetime import timedelta
+from io import StringIO
 
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.encoding import smart_str
@@ -10,6 +12,8 @@ from django.utils.encoding import smart_str
 from misago.acl.testutils import override_acl
 from misago.categories.models import Category
 from misago.threads import testutils
+from misago.threads.management.commands import sendemailnotifications
+from misago.threads.models import EmailNotification
 from misago.users.testutils import AuthenticatedUserTestCase
 
 
@@ -64,6 +68,9 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
 
         override_acl(self.other_user, new_acl)
 
+    def send_notifications(self):
+        call_command(sendemailnotifications.Command(), stdout=StringIO())
+
     def test_no_subscriptions(self):
         """no emails are sent because noone subscibes to thread"""
         response = self.client.post(
@@ -73,6 +80,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        self.send_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_poster_not_notified(self):
@@ -91,6 +99,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        self.send_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_other_user_no_email_subscription(self):
@@ -109,6 +118,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        self.send_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_other_user_no_permission(self):
@@ -128,6 +138,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        self.send_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_other_user_not_read(self):
@@ -149,6 +160,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        self.send_notifications()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_other_notified(self):
@@ -168,6 +180,11 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        # notification was queued instead of being sent in request
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailNotification.objects.count(), 1)
+
+        self.send_notifications()
         self.assertEqual(len(mail.outbox), 1)
         last_email = mail.outbox[-1]
 
@@ -200,6 +217,7 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        self.send_notifications()
         self.assertEqual(len(mail.outbox), 1)
         last_email = mail.outbox[-1]
 
@@ -214,3 +232,27 @@ class EmailNotificationTests(AuthenticatedUserTestCase):
 
         last_post = self.thread.post_set.order_by('id').last()
         self.assertIn(last_post.get_absolute_url(), message)
+
+    def test_sent_notifications_are_removed(self):
+        """sent notifications are removed from queue"""
+        self.other_user.subscription_set.create(
+            thread=self.thread,
+            category=self.category,
+            last_read_on=timezone.now(),
+            send_email=True,
+        )
+        self.override_other_user_acl()
+
+        response = self.client.post(
+            self.api_link, data={
+                'post': 'This is test response!',
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.send_notifications()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailNotification.objects.count(), 0)
+
+        self.send_notifications()
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,87 @@
+from django.urls import reverse
+
+from misago.categories.models import Category
+from misago.threads import testutils
+from misago.threads.etags import get_categories_version
+from misago.users.testutils import AuthenticatedUserTestCase
+
+
+class ApiETagsTests(AuthenticatedUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.category = Category.objects.get(slug='first-category')
+        self.thread = testutils.post_thread(category=self.category)
+
+    def assertNotModified(self, api_link):
+        response = self.client.get(api_link)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+
+        response = self.client.get(api_link, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        return response['ETag']
+
+    def test_threads_list(self):
+        """threads list api supports conditional requests"""
+        etag = self.assertNotModified(reverse('misago:api:thread-list'))
+
+        testutils.reply_thread(self.thread)
+
+        response = self.client.get(reverse('misago:api:thread-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_thread_move(self):
+        """moving thread invalidates versions of both categories"""
+        other_category = Category(name='Other Category', slug='other-category')
+        other_category.insert_at(self.category, position='last-child', save=True)
+
+        category_version = get_categories_version([self.category.pk])
+        other_category_version = get_categories_version([other_category.pk])
+
+        self.thread.move(other_category)
+        self.thread.save()
+
+        self.assertNotEqual(get_categories_version([self.category.pk]), category_version)
+        self.assertNotEqual(
+            get_categories_version([other_category.pk]), other_category_version)
+
+    def test_thread_posts(self):
+        """thread posts api supports conditional requests"""
+        api_link = self.thread.get_posts_api_url()
+        etag = self.assertNotModified(api_link)
+
+        testutils.reply_thread(self.thread)
+
+        response = self.client.get(api_link, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_thread_posts_other_thread(self):
+        """thread posts api etag stays same when other thread is replied to"""
+        api_link = self.thread.get_posts_api_url()
+        etag = self.assertNotModified(api_link)
+
+        other_thread = testutils.post_thread(category=self.category)
+        testutils.reply_thread(other_thread)
+
+        response = self.client.get(api_link, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_thread_posts_read(self):
+        """thread posts api etag changes when user reads posts"""
+        api_link = self.thread.get_posts_api_url()
+        etag = self.assertNotModified(api_link)
+
+        self.user.postread_set.create(
+            category=self.category,
+            thread=self.thread,
+            post=self.thread.first_post,
+        )
+
+        response = self.client.get(api_link, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_categories_list(self):
+        """categories api supports conditional requests"""
+        self.assertNotModified(reverse('misago:api:category-list'))
@@ -0,0 +1,68 @@
+from copy import deepcopy
+
+from django.contrib.auth import get_user_model
+
+from misago.acl.testutils import override_acl
+from misago.categories.models import Category
+from misago.core.testutils import MisagoTestCase
+from misago.threads import testutils
+from misago.threads.permissions import filter_users_that_can_see_post
+
+
+UserModel = get_user_model()
+
+
+class FilterUsersThatCanSeePostTests(MisagoTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.category = Category.objects.get(slug='first-category')
+        self.thread = testutils.post_thread(self.category)
+        self.post = testutils.reply_thread(self.thread)
+
+        self.users = [
+            UserModel.objects.create_user('Bob', 'bob@example.com', 'pass123'),
+            UserModel.objects.create_user('Alice', 'alice@example.com', 'pass123'),
+        ]
+
+    def override_category_acl(self, user, acl):
+        new_acl = deepcopy(user.acl_cache)
+        new_acl['categories'][self.category.pk].update(acl)
+        override_acl(user, new_acl)
+
+    def test_users_can_see_post(self):
+        """users with permission to see post are returned"""
+        visible_users = filter_users_that_can_see_post(self.users, self.thread, self.post)
+        self.assertEqual(visible_users, self.users)
+
+    def test_user_cant_see_thread(self):
+        """users without permission to see thread are excluded"""
+        self.override_category_acl(self.users[1], {'can_browse': False})
+
+        visible_users = filter_users_that_can_see_post(self.users, self.thread, self.post)
+        self.assertEqual(visible_users, self.users[:1])
+
+    def test_thread_starter_can_see_own_thread(self):
+        """thread starter is checked separately from other users with same acl"""
+        for user in self.users:
+            self.override_category_acl(user, {
+                'can_see_all_threads': False,
+                'can_see_own_threads': True,
+            })
+
+        self.thread.starter = self.users[0]
+        self.thread.save()
+
+        visible_users = filter_users_that_can_see_post(self.users, self.thread, self.post)
+        self.assertEqual(visible_users, self.users[:1])
+
+    def test_users_without_acl_key(self):
+        """users without acl_key are checked separately"""
+        self.override_category_acl(self.users[0], {'can_browse': False})
+        self.override_category_acl(self.users[1], {})
+
+        for user in self.users:
+            user.acl_key = None
+
+        visible_users = filter_users_that_can_see_post(self.users, self.thread, self.post)
+        self.assertEqual(visible_users, self.users[1:])
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+
+from misago.categories.models import Category
+from misago.threads import testutils
+from misago.threads.likes import (
+    LAST_LIKES_LENGTH, acquire_like_lock, like_post, release_like_lock, unlike_post)
+from misago.threads.models import Post
+from misago.users.testutils import AuthenticatedUserTestCase
+
+
+UserModel = get_user_model()
+
+
+def get_mock_user():
+    seed = UserModel.objects.count() + 1
+    return UserModel.objects.create_user('bob%s' % seed, 'user%s@test.com' % seed, 'Pass.123')
+
+
+class LikesTests(AuthenticatedUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        category = Category.objects.get(slug='first-category')
+        thread = testutils.post_thread(category)
+        self.post = testutils.reply_thread(thread)
+
+    def test_like_post(self):
+        """like_post increases likes and adds liker to last likes"""
+        like_post(self.user, self.post)
+
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.likes, 1)
+        self.assertEqual(post.last_likes, [{'id': self.user.pk, 'username': self.user.username}])
+        self.assertEqual(self.post.likes, post.likes)
+        self.assertEqual(self.post.last_likes, post.last_likes)
+
+    def test_last_likes_length(self):
+        """like_post keeps limited number of last likes, newest first"""
+        users = [get_mock_user() for _ in range(LAST_LIKES_LENGTH + 1)]
+        for user in users:
+            like_post(user, self.post)
+
+        self.assertEqual(self.post.likes, len(users))
+        self.assertEqual(
+            [like['id'] for like in self.post.last_likes],
+            [user.pk for user in reversed(users[1:])],
+        )
+
+    def test_stale_post_like(self):
+        """like_post doesn't overwrite likes from other post instance"""
+        post = Post.objects.get(pk=self.post.pk)
+
+        like_post(get_mock_user(), post)
+        like_post(self.user, self.post)
+
+        self.assertEqual(self.post.likes, 2)
+        self.assertEqual(len(self.post.last_likes), 2)
+
+    def test_unlike_post(self):
+        """unlike_post decreases likes and rebuilds last likes"""
+        users = [get_mock_user() for _ in range(LAST_LIKES_LENGTH + 1)]
+        for user in users:
+            like_post(user, self.post)
+
+        unlike_post(users[-1], self.post)
+
+        self.assertEqual(self.post.likes, LAST_LIKES_LENGTH)
+        self.assertEqual(
+            [like['id'] for like in self.post.last_likes],
+            [user.pk for user in reversed(users[:-1])],
+        )
+
+    def test_unlike_not_liked_post(self):
+        """unlike_post does nothing if user didn't like post"""
+        like_post(get_mock_user(), self.post)
+        unlike_post(self.user, self.post)
+
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes, 1)
+
+    def test_like_lock(self):
+        """user can't acquire like lock twice"""
+        self.assertTrue(acquire_like_lock(self.user))
+        self.assertFalse(acquire_like_lock(self.user))
+
+        release_like_lock(self.user)
+        self.assertTrue(acquire_like_lock(self.user))
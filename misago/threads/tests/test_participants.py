@@ -115,6 +115,37 @@ class ParticipantsTests(TestCase):
         else:
             self.fail("thread.participants_list didn't contain user")
 
+    def test_participants_cache(self):
+        """thread participants are cached until they change"""
+        user = UserModel.objects.create_user("Bob", "bob@boberson.com", "Pass.123")
+        other_user = UserModel.objects.create_user("Bob2", "bob2@boberson.com", "Pass.123")
+
+        ThreadParticipant.objects.create(thread=self.thread, user=user, is_owner=True)
+        ThreadParticipant.objects.create(thread=self.thread, user=other_user)
+
+        self.assertEqual(
+            sorted(ThreadParticipant.objects.get_participants(self.thread)),
+            sorted([(user.pk, True), (other_user.pk, False)]),
+        )
+
+        with self.assertNumQueries(0):
+            ThreadParticipant.objects.get_participants(self.thread)
+
+        ThreadParticipant.objects.remove_participant(self.thread, other_user)
+        self.assertEqual(ThreadParticipant.objects.get_participants(self.thread), [(user.pk, True)])
+
+    def test_participants_cache_pending_changes(self):
+        """participants changed in uncommitted transaction are not cached"""
+        user = UserModel.objects.create_user("Bob", "bob@boberson.com", "Pass.123")
+
+        # test case runs in transaction that is never committed
+        ThreadParticipant.objects.set_owner(self.thread, user)
+
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertEqual(
+                    ThreadParticipant.objects.get_participants(self.thread), [(user.pk, True)])
+
     def test_set_owner(self):
         """set_owner sets user as thread owner"""
         user = UserModel.objects.create_user("Bob", "bob@boberson.com", "Pass.123")
@@ -0,0 +1,34 @@
+from misago.threads.posterscache import clear_local_cache, get_poster_card, get_posters_cards
+from misago.users.testutils import AuthenticatedUserTestCase
+
+
+class PostersCacheTests(AuthenticatedUserTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_local_cache()
+
+    def test_get_poster_card(self):
+        """poster card is serialized with status"""
+        card = get_poster_card(self.user)
+        self.assertEqual(card['id'], self.user.pk)
+        self.assertEqual(card['username'], self.user.username)
+        self.assertEqual(card['rank']['id'], self.user.rank_id)
+        self.assertIsNone(card['status'])
+
+    def test_card_is_cached(self):
+        """poster card is reused for same profile"""
+        card = get_posters_cards([self.user])[self.user.pk]
+        self.assertIs(get_posters_cards([self.user])[self.user.pk], card)
+
+        clear_local_cache()
+        self.assertEqual(get_posters_cards([self.user])[self.user.pk], card)
+
+    def test_profile_change_invalidates_card(self):
+        """poster card is serialized again after profile change"""
+        get_posters_cards([self.user])
+
+        self.user.title = 'Changed title'
+        self.assertEqual(get_poster_card(self.user)['title'], 'Changed title')
+
+        self.user.rank.title = 'Changed rank'
+        self.assertEqual(get_poster_card(self.user)['rank']['title'], 'Changed rank')
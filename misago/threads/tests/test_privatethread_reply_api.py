@@ -21,7 +21,7 @@ class PrivateThreadReplyApiTestCase(PrivateThreadsTestCase):
         )
 
     def test_reply_private_thread(self):
-        """api sets other private thread participants sync thread flag"""
+        """api increases other private thread participants unread threads count"""
         ThreadParticipant.objects.set_owner(self.thread, self.user)
         ThreadParticipant.objects.add_participants(self.thread, [self.other_user])
 
@@ -39,6 +39,6 @@ class PrivateThreadReplyApiTestCase(PrivateThreadsTestCase):
 
         self.assertEqual(self.user.audittrail_set.count(), 1)
 
-        # valid user was flagged to sync
-        self.assertFalse(UserModel.objects.get(pk=self.user.pk).sync_unread_private_threads)
-        self.assertTrue(UserModel.objects.get(pk=self.other_user.pk).sync_unread_private_threads)
+        # other participant's unread threads count was increased
+        self.assertEqual(UserModel.objects.get(pk=self.user.pk).unread_private_threads, 0)
+        self.assertEqual(UserModel.objects.get(pk=self.other_user.pk).unread_private_threads, 1)
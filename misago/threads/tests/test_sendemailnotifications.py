@@ -0,0 +1,71 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+
+from misago.categories.models import Category
+from misago.threads import testutils
+from misago.threads.management.commands import sendemailnotifications
+from misago.threads.models import EmailNotification
+
+
+UserModel = get_user_model()
+
+build_mail = EmailNotification.build_mail
+
+
+def build_mail_failing_for_bob(notification):
+    if notification.recipient.username == 'Bob':
+        raise ValueError("notification can't be built")
+    return build_mail(notification)
+
+
+class SendEmailNotificationsTests(TestCase):
+    def setUp(self):
+        category = Category.objects.get(slug='first-category')
+        thread = testutils.post_thread(category)
+        self.post = testutils.reply_thread(thread)
+
+        self.users = [
+            UserModel.objects.create_user('Bob', 'bob@example.com', 'pass123'),
+            UserModel.objects.create_user('Alice', 'alice@example.com', 'pass123'),
+        ]
+
+    def send_notifications(self):
+        call_command(sendemailnotifications.Command(), stdout=StringIO(), stderr=StringIO())
+
+    def test_send_notifications(self):
+        """command sends queued notifications and removes them from queue"""
+        EmailNotification.objects.queue_reply(self.post, self.users)
+
+        self.send_notifications()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(EmailNotification.objects.exists())
+
+    @patch.object(EmailNotification, 'build_mail', build_mail_failing_for_bob)
+    def test_failing_notification(self):
+        """notification that fails to send doesn't stop notifications after it"""
+        EmailNotification.objects.queue_reply(self.post, self.users)
+
+        self.send_notifications()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['alice@example.com'])
+
+        failed_notification = EmailNotification.objects.get()
+        self.assertEqual(failed_notification.recipient, self.users[0])
+        self.assertEqual(failed_notification.attempts, 1)
+
+    @patch.object(EmailNotification, 'build_mail', build_mail_failing_for_bob)
+    def test_notification_failing_too_many_times(self):
+        """notification that keeps failing is dropped from queue"""
+        EmailNotification.objects.queue_reply(self.post, self.users[:1])
+        EmailNotification.objects.update(attempts=sendemailnotifications.MAX_ATTEMPTS - 1)
+
+        self.send_notifications()
+
+        self.assertFalse(EmailNotification.objects.exists())
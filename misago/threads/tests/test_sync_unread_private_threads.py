@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
 
 from misago.threads import testutils
-from misago.threads.models import ThreadParticipant
+from misago.threads.delete import delete_threads
+from misago.threads.models import Thread, ThreadParticipant
+from misago.threads.participants import increase_unread_private_threads, make_participants_aware
 
 from .test_privatethreads import PrivateThreadsTestCase
 
@@ -61,3 +63,57 @@ class SyncUnreadPrivateThreadsTestCase(PrivateThreadsTestCase):
         self.reload_user()
         self.assertFalse(self.user.sync_unread_private_threads)
         self.assertEqual(self.user.unread_private_threads, 1)
+
+    def test_reply_increases_count(self):
+        """reply to read thread increases participant's unread threads count"""
+        self.client.post(self.thread.last_post.get_read_api_url())
+
+        post = testutils.reply_thread(self.thread, poster=self.other_user)
+        make_participants_aware(self.user, self.thread)
+        increase_unread_private_threads(self.thread, post, exclude_user=self.other_user)
+
+        self.reload_user()
+        self.assertFalse(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 1)
+
+        # reply to unread thread is not counted again
+        post = testutils.reply_thread(self.thread, poster=self.other_user)
+        increase_unread_private_threads(self.thread, post, exclude_user=self.other_user)
+
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 1)
+
+        # other participant's count is not changed
+        self.assertEqual(UserModel.objects.get(pk=self.other_user.pk).unread_private_threads, 0)
+
+    def test_reply_keeps_category_acl(self):
+        """counting unread threads doesn't replace acl on thread's category"""
+        post = testutils.reply_thread(self.thread, poster=self.other_user)
+        make_participants_aware(self.user, self.thread)
+
+        self.thread.category.acl = {'marker': True}
+        increase_unread_private_threads(self.thread, post, exclude_user=self.other_user)
+
+        self.assertEqual(self.thread.category.acl, {'marker': True})
+
+    def test_deleted_post_flags_participants(self):
+        """deleting post flags thread participants for recount"""
+        post = testutils.reply_thread(self.thread, poster=self.other_user)
+        post.delete()
+
+        self.reload_user()
+        self.assertTrue(self.user.sync_unread_private_threads)
+
+    def test_deleted_thread_flags_participants(self):
+        """deleting thread flags its participants for recount"""
+        self.thread.delete()
+
+        self.reload_user()
+        self.assertTrue(self.user.sync_unread_private_threads)
+
+    def test_bulk_deleted_thread_flags_participants(self):
+        """bulk deleting threads flags their participants for recount"""
+        delete_threads(Thread.objects.filter(pk=self.thread.pk))
+
+        self.reload_user()
+        self.assertTrue(self.user.sync_unread_private_threads)
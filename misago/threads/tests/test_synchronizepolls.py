@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from misago.categories.models import Category
+from misago.threads import testutils
+from misago.threads.etags import get_thread_version
+from misago.threads.management.commands import synchronizepolls
+from misago.threads.models import Poll
+
+
+UserModel = get_user_model()
+
+
+class SynchronizePollsTests(TestCase):
+    def test_no_polls_sync(self):
+        """command works when there are no polls"""
+        command = synchronizepolls.Command()
+
+        out = StringIO()
+        call_command(command, stdout=out)
+        command_output = out.getvalue().strip()
+
+        self.assertEqual(command_output, "No polls were found")
+
+    def test_polls_sync(self):
+        """command recounts polls votes"""
+        category = Category.objects.get(slug='first-category')
+        user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'pass123')
+
+        thread = testutils.post_thread(category)
+        poll = testutils.post_poll(thread, user)
+
+        choices = poll.choices
+        for choice in choices:
+            choice['votes'] = 5
+        Poll.objects.filter(pk=poll.pk).update(choices=choices, votes=20)
+
+        thread_version = get_thread_version(thread.pk)
+
+        command = synchronizepolls.Command()
+
+        out = StringIO()
+        call_command(command, stdout=out)
+        command_output = out.getvalue().splitlines()[-1].strip()
+
+        self.assertEqual(command_output, "Synchronized 1 polls")
+
+        db_poll = Poll.objects.get(pk=poll.pk)
+        self.assertEqual(db_poll.votes, 4)
+        self.assertEqual([c['votes'] for c in db_poll.choices], [1, 0, 2, 1])
+        self.assertEqual([c['label'] for c in db_poll.choices], ['Alpha', 'Beta', 'Gamma', 'Delta'])
+
+        self.assertNotEqual(get_thread_version(thread.pk), thread_version)
+
+    def test_update_votes(self):
+        """update_votes changes votes counts without overwriting other changes"""
+        category = Category.objects.get(slug='first-category')
+        user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'pass123')
+
+        thread = testutils.post_thread(category)
+        poll = testutils.post_poll(thread, user)
+
+        Poll.objects.get(pk=poll.pk).update_votes(['bbbbbbbbbbbb'], [])
+        poll.update_votes(['bbbbbbbbbbbb', 'dddddddddddd'], ['aaaaaaaaaaaa'])
+
+        self.assertEqual(poll.votes, 6)
+        self.assertEqual([c['votes'] for c in poll.choices], [0, 2, 2, 2])
@@ -1,7 +1,9 @@
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from misago.categories.models import Category
@@ -224,6 +226,40 @@ class ThreadModelTests(TestCase):
         self.thread.synchronize()
         self.assertTrue(self.thread.has_poll)
 
+    def test_posts_positions(self):
+        """posts are numbered among approved posts, and renumbered by synchronize"""
+        reply = testutils.reply_thread(self.thread)
+        unapproved = testutils.reply_thread(self.thread, is_unapproved=True)
+        event = testutils.reply_thread(self.thread, is_event=True)
+        last_reply = testutils.reply_thread(self.thread)
+
+        positions = dict(self.thread.post_set.values_list('id', 'position'))
+        self.assertEqual(positions[self.thread.first_post_id], 1)
+        self.assertEqual(positions[reply.id], 2)
+        self.assertEqual(positions[unapproved.id], 2)
+        self.assertEqual(positions[event.id], 2)
+        self.assertEqual(positions[last_reply.id], 3)
+
+        unapproved.is_unapproved = False
+        unapproved.save()
+
+        self.thread.synchronize()
+
+        positions = dict(self.thread.post_set.values_list('id', 'position'))
+        self.assertEqual(positions[unapproved.id], 3)
+        self.assertEqual(positions[event.id], 3)
+        self.assertEqual(positions[last_reply.id], 4)
+
+    def test_new_post_position_locks_thread(self):
+        """new post's position is read with thread's row locked"""
+        with CaptureQueriesContext(connection) as queries:
+            reply = testutils.reply_thread(self.thread)
+
+        locks = [q['sql'] for q in queries.captured_queries if 'FOR UPDATE' in q['sql']]
+        self.assertTrue(locks)
+        self.assertIn('misago_threads_thread', locks[0])
+        self.assertEqual(reply.position, 2)
+
     def test_set_first_post(self):
         """set_first_post sets first post and poster data on thread"""
         user = UserModel.objects.create_user("Bob", "bob@boberson.com", "Pass.123")
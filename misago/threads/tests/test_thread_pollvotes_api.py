@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 
+from misago.threads.etags import get_thread_version
 from misago.threads.models import Poll
 
 from .test_thread_poll_api import ThreadPollApiTestCase
@@ -346,3 +347,14 @@ class ThreadPostVotesTests(ThreadPollApiTestCase):
                          [True, True, False, False])
 
         self.assertTrue(response_json['acl']['can_vote'])
+
+    def test_vote_invalidates_thread_version(self):
+        """api invalidates thread version after vote"""
+        self.delete_user_votes()
+
+        thread_version = get_thread_version(self.thread.pk)
+
+        response = self.post(self.api_link, data=['aaaaaaaaaaaa'])
+        self.assertEqual(response.status_code, 200)
+
+        self.assertNotEqual(get_thread_version(self.thread.pk), thread_version)
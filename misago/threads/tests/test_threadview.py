@@ -6,6 +6,7 @@ from misago.threads.checksums import update_post_checksum
 from misago.threads.events import record_event
 from misago.threads.moderation import threads as threads_moderation
 from misago.threads.moderation import hide_post
+from misago.threads.viewmodels import ForumThread, ThreadPosts
 from misago.users.testutils import AuthenticatedUserTestCase
 
 
@@ -344,6 +345,22 @@ class ThreadEventVisibilityTests(ThreadViewTestCase):
         for post in posts[posts_limit - 1:]:
             self.assertContains(response, post.get_absolute_url())
 
+    def test_posts_share_posters(self):
+        """posts by same user share single poster instance"""
+        posts = [testutils.reply_thread(self.thread, poster=self.user) for _ in range(3)]
+        event = record_event(MockRequest(self.user), self.thread, 'closed')
+
+        request = MockRequest(self.user)
+        thread = ForumThread(request, self.thread.pk)
+        viewmodel = ThreadPosts(request, thread, 0)
+        self.assertEqual(
+            [post.pk for post in viewmodel.posts],
+            [self.thread.first_post_id] + [post.pk for post in posts] + [event.pk],
+        )
+
+        posters = set(id(post.poster) for post in viewmodel.posts[1:])
+        self.assertEqual(len(posters), 1)
+
     def test_changed_thread_title_event_renders(self):
         """changed thread title event renders"""
         threads_moderation.change_thread_title(
@@ -4,6 +4,7 @@ from misago.acl import add_acl
 from misago.categories.models import Category
 from misago.categories.permissions import allow_browse_category, allow_see_category
 from misago.categories.serializers import CategorySerializer
+from misago.categories.tree import get_tree
 from misago.core.shortcuts import validate_slug
 from misago.core.viewmodel import ViewModel as BaseViewModel
 from misago.threads.permissions import allow_use_private_threads
@@ -49,10 +50,9 @@ class ViewModel(BaseViewModel):
 
 class ThreadsRootCategory(ViewModel):
     def get_categories(self, request):
-        return [Category.objects.root_category()] + list(
-            Category.objects.all_categories().filter(
-                id__in=request.user.acl_cache['visible_categories'],
-            ).select_related('parent')
+        return get_tree().get_categories(
+            request.user.acl_cache['visible_categories'],
+            include_root=True,
         )
 
 
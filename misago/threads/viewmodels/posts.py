@@ -1,9 +1,13 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
 from misago.acl import add_acl
 from misago.conf import settings
 from misago.core.shortcuts import paginate, pagination_dict
 from misago.readtracker.poststracker import make_read_aware
 from misago.threads.paginator import PostsPaginator
 from misago.threads.permissions import exclude_invisible_posts
+from misago.threads.posterscache import add_posters_cards
 from misago.threads.serializers import PostSerializer
 from misago.threads.utils import add_likes_to_posts
 from misago.users.online.utils import make_users_status_aware
@@ -11,6 +15,8 @@ from misago.users.online.utils import make_users_status_aware
 
 __all__ = ['ThreadPosts']
 
+UserModel = get_user_model()
+
 
 class ViewModel(object):
     def __init__(self, request, thread, page):
@@ -19,18 +25,40 @@ class ViewModel(object):
         except AttributeError:
             thread_model = thread
 
-        posts_queryset = self.get_posts_queryset(request, thread_model)
+        visible_posts = self.get_visible_posts_queryset(request, thread_model)
+        posts_queryset = visible_posts.filter(is_event=False).order_by('id')
 
         posts_limit = settings.MISAGO_POSTS_PER_PAGE
         posts_orphans = settings.MISAGO_POSTS_TAIL
         list_page = paginate(
-            posts_queryset, page, posts_limit, posts_orphans, paginator=PostsPaginator
+            posts_queryset.values_list('id', flat=True),
+            page,
+            posts_limit,
+            posts_orphans,
+            paginator=PostsPaginator,
         )
         paginator = pagination_dict(list_page)
 
-        posts = list(list_page.object_list)
-        posters = []
+        posts_ids = list(list_page.object_list)
+        page_filter = Q(id__in=posts_ids)
+
+        # add events to posts
+        if thread_model.has_events:
+            events_queryset = visible_posts.filter(is_event=True)
+            if list_page.has_previous():
+                events_queryset = events_queryset.filter(pk__gt=posts_ids[0])
+            if list_page.has_next():
+                events_queryset = events_queryset.filter(pk__lt=posts_ids[-1])
+
+            events_limit = settings.MISAGO_EVENTS_PER_PAGE
+            events_ids = events_queryset.order_by('-id').values('id')[:events_limit]
+            page_filter = page_filter | Q(id__in=events_ids)
+
+        posts = list(thread_model.post_set.filter(page_filter).order_by('id'))
+
+        add_posters_to_posts(posts)
 
+        posters = []
         for post in posts:
             post.category = thread.category
             post.thread = thread_model
@@ -39,26 +67,10 @@ class ViewModel(object):
                 posters.append(post.poster)
 
         make_users_status_aware(request.user, posters)
+        add_posters_cards(posters)
 
         if thread.category.acl['can_see_posts_likes']:
-            add_likes_to_posts(request.user, posts)
-
-        # add events to posts
-        if thread_model.has_events:
-            first_post = None
-            if list_page.has_previous():
-                first_post = posts[0]
-            last_post = None
-            if list_page.has_next():
-                last_post = posts[-1]
-
-            events_limit = settings.MISAGO_EVENTS_PER_PAGE
-            posts += self.get_events_queryset(
-                request, thread_model, events_limit, first_post, last_post
-            )
-
-            # sort both by pk
-            posts.sort(key=lambda p: p.pk)
+            add_likes_to_posts(request.user, [p for p in posts if not p.is_event])
 
         # make posts and events ACL and reads aware
         add_acl(request.user, posts)
@@ -69,32 +81,8 @@ class ViewModel(object):
         self.posts = posts
         self.paginator = paginator
 
-    def get_posts_queryset(self, request, thread):
-        queryset = thread.post_set.select_related(
-            'category',
-            'poster',
-            'poster__rank',
-            'poster__ban_cache',
-            'poster__online_tracker',
-        ).filter(is_event=False).order_by('id')
-        return exclude_invisible_posts(request.user, thread.category, queryset)
-
-    def get_events_queryset(self, request, thread, limit, first_post=None, last_post=None):
-        queryset = thread.post_set.select_related(
-            'category',
-            'poster',
-            'poster__rank',
-            'poster__ban_cache',
-            'poster__online_tracker',
-        ).filter(is_event=True)
-
-        if first_post:
-            queryset = queryset.filter(pk__gt=first_post.pk)
-        if last_post:
-            queryset = queryset.filter(pk__lt=last_post.pk)
-
-        queryset = exclude_invisible_posts(request.user, thread.category, queryset)
-        return list(queryset.order_by('-id')[:limit])
+    def get_visible_posts_queryset(self, request, thread):
+        return exclude_invisible_posts(request.user, thread.category, thread.post_set)
 
     def get_frontend_context(self):
         context = {
@@ -114,3 +102,17 @@ class ViewModel(object):
 
 class ThreadPosts(ViewModel):
     pass
+
+
+def add_posters_to_posts(posts):
+    """loads every poster once, no matter on how many posts on page they appear"""
+    posters_ids = set(p.poster_id for p in posts if p.poster_id)
+    posters = UserModel.objects.select_related(
+        'rank',
+        'ban_cache',
+        'online_tracker',
+    ).in_bulk(posters_ids)
+
+    for post in posts:
+        if post.poster_id:
+            post.poster = posters.get(post.poster_id)
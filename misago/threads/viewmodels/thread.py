@@ -3,7 +3,7 @@ from django.utils.translation import ugettext as _
 
 from misago.acl import add_acl
 from misago.categories import PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
-from misago.categories.models import Category
+from misago.categories.tree import get_tree
 from misago.core.shortcuts import validate_slug
 from misago.core.viewmodel import ViewModel as BaseViewModel
 from misago.readtracker.threadstracker import make_read_aware
@@ -76,10 +76,7 @@ class ViewModel(BaseViewModel):
         thread_path = []
 
         if category.level:
-            categories = Category.objects.filter(
-                tree_id=category.tree_id, lft__lte=category.lft, rght__gte=category.rght
-            ).order_by('level')
-            thread_path = list(categories)
+            thread_path = get_tree().get_path(category)
         else:
             thread_path = [category]
 
@@ -131,8 +128,8 @@ class PrivateThread(ViewModel):
             category__tree_id=trees_map.get_tree_id_for_root(PRIVATE_THREADS_ROOT_NAME),
         )
 
-        make_participants_aware(request.user, thread)
         allow_see_private_thread(request.user, thread)
+        make_participants_aware(request.user, thread)
 
         if slug:
             validate_slug(thread, slug)
@@ -4,7 +4,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from misago.admin.views import generic
 from misago.threads.forms import SearchAttachmentsForm
-from misago.threads.models import Attachment, Post
+from misago.threads.models import Attachment, DeletedAttachmentFile, Post
 
 
 class AttachmentAdmin(generic.AdminBaseMixin):
@@ -57,8 +57,9 @@ class AttachmentsList(AttachmentAdmin, generic.ListView):
                 for post in Post.objects.filter(id__in=desynced_posts):
                     self.delete_from_cache(post, deleted_attachments)
 
-        for attachment in attachments:
-            attachment.delete()
+        DeletedAttachmentFile.objects.delete_attachments(
+            Attachment.objects.filter(pk__in=[a.pk for a in attachments])
+        )
 
         message = _("Selected attachments have been deleted.")
         messages.success(request, message)
@@ -1,6 +1,7 @@
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
+from django.utils.cache import patch_vary_headers
 
 from misago.conf import settings
 from misago.threads.models import Attachment, AttachmentType
@@ -8,12 +9,18 @@ from misago.threads.models import Attachment, AttachmentType
 
 ATTACHMENT_404_URL = ''.join((settings.STATIC_URL, settings.MISAGO_404_IMAGE))
 ATTACHMENT_403_URL = ''.join((settings.STATIC_URL, settings.MISAGO_403_IMAGE))
+ATTACHMENT_PROCESSING_URL = ''.join(
+    (settings.STATIC_URL, settings.MISAGO_ATTACHMENT_PROCESSING_IMAGE))
 
 
 def attachment_server(request, pk, secret, thumbnail=False):
     try:
         url = serve_file(request, pk, secret, thumbnail)
-        return redirect(url)
+        response = redirect(url)
+        if thumbnail:
+            # thumbnail redirects to webp rendition if client accepts it
+            patch_vary_headers(response, ['Accept'])
+        return response
     except Http404:
         return redirect(ATTACHMENT_404_URL)
     except PermissionDenied:
@@ -34,7 +41,7 @@ def serve_file(request, pk, secret, thumbnail):
 
     if attachment.is_image:
         if thumbnail:
-            return attachment.thumbnail.url
+            return get_thumbnail_url(request, attachment)
         else:
             return attachment.image.url
     else:
@@ -44,6 +51,17 @@ def serve_file(request, pk, secret, thumbnail):
             return attachment.file.url
 
 
+def get_thumbnail_url(request, attachment):
+    if not attachment.is_processed:
+        return ATTACHMENT_PROCESSING_URL
+    if not attachment.thumbnail:
+        # thumbnail link may be cached in post before image was processed
+        return attachment.image.url
+    if attachment.webp and 'image/webp' in request.META.get('HTTP_ACCEPT', ''):
+        return attachment.webp.url
+    return attachment.thumbnail.url
+
+
 def allow_file_download(request, attachment):
     is_authenticated = request.user.is_authenticated
 
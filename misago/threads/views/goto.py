@@ -22,7 +22,7 @@ class GotoView(View):
         posts_queryset = exclude_invisible_posts(request.user, thread.category, thread.post_set)
 
         target_post = self.get_target_post(request.user, thread, posts_queryset.order_by('id'), **kwargs)
-        target_page = self.compute_post_page(target_post, posts_queryset)
+        target_page = self.compute_post_page(thread, target_post, posts_queryset)
 
         return self.get_redirect(thread, target_post, target_page)
 
@@ -35,20 +35,21 @@ class GotoView(View):
     def get_target_post(self, user, thread, posts_queryset):
         raise NotImplementedError("goto views should define their own get_target_post method")
 
-    def compute_post_page(self, target_post, posts_queryset):
-        # filter out events, order queryset
-        posts_queryset = posts_queryset.filter(is_event=False).order_by('id')
-
-        thread_length = posts_queryset.count()
-
-        # is target an event?
-        if target_post.is_event:
-            target_event = target_post
-            previous_posts = posts_queryset.filter(id__lt=target_event.id)
-        else:
-            previous_posts = posts_queryset.filter(id__lte=target_post.id)
-
-        post_position = previous_posts.count()
+    def compute_post_page(self, thread, target_post, posts_queryset):
+        # posts know their position among thread's approved posts,
+        # so only unapproved posts visible to user have to be counted
+        thread_length = thread.replies + 1
+        post_position = target_post.position
+
+        if thread.has_unapproved_posts:
+            unapproved_posts = posts_queryset.filter(is_event=False, is_unapproved=True)
+            thread_length += unapproved_posts.count()
+
+            if target_post.is_event:
+                previous_posts = unapproved_posts.filter(id__lt=target_post.id)
+            else:
+                previous_posts = unapproved_posts.filter(id__lte=target_post.id)
+            post_position += previous_posts.count()
 
         per_page = settings.MISAGO_POSTS_PER_PAGE - 1
         orphans = settings.MISAGO_POSTS_TAIL
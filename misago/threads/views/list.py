@@ -4,6 +4,7 @@ from django.urls import reverse
 from django.views import View
 
 from misago.core.shortcuts import get_int_or_404
+from misago.threads.anonymouscache import make_response_cacheable
 from misago.threads.viewmodels import (
     ForumThreads, PrivateThreads, PrivateThreadsCategory, ThreadsCategory, ThreadsRootCategory)
 
@@ -24,7 +25,10 @@ class ThreadsList(View):
         request.frontend_context.update(frontend_context)
 
         template_context = self.get_template_context(request, category, threads)
-        return render(request, self.template_name, template_context)
+        response = render(request, self.template_name, template_context)
+
+        make_response_cacheable(request, response)
+        return response
 
     def get_category(self, request, **kwargs):
         return self.category(request, **kwargs)
@@ -2,6 +2,7 @@ from django.shortcuts import render
 from django.urls import reverse
 from django.views import View
 
+from misago.threads.anonymouscache import make_response_cacheable
 from misago.threads.viewmodels import ForumThread, PrivateThread, ThreadPosts
 
 
@@ -19,7 +20,10 @@ class ThreadBase(View):
         request.frontend_context.update(frontend_context)
 
         template_context = self.get_template_context(request, thread, posts)
-        return render(request, self.template_name, template_context)
+        response = render(request, self.template_name, template_context)
+
+        make_response_cacheable(request, response, thread.last_post_on)
+        return response
 
     def get_thread(self, request, pk, slug):
         return self.thread(
@@ -1,17 +1,25 @@
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
-from django.db.models import Count
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 
+from misago.categories import THREADS_ROOT_NAME
 from misago.categories.models import Category
 from misago.conf import settings
 
-from .models import ActivityRanking
+from .models import ActivityRanking, ActivityRankingBucket
 
 
 UserModel = get_user_model()
 
+RECORD_POST_SQL = """
+    INSERT INTO {table} (user_id, day, posts) VALUES (%s, %s, 1)
+    ON CONFLICT (user_id, day) DO UPDATE SET posts = {table}.posts + 1
+""".format(table=ActivityRankingBucket._meta.db_table)
+
 
 def get_active_posters_ranking():
     users = []
@@ -27,29 +35,91 @@ def get_active_posters_ranking():
     }
 
 
-def build_active_posters_ranking():
+def get_tracked_since():
     tracked_period = settings.MISAGO_RANKING_LENGTH
-    tracked_since = timezone.now() - timedelta(days=tracked_period)
+    return timezone.localdate() - timedelta(days=tracked_period)
 
-    ActivityRanking.objects.all().delete()
 
-    ranked_categories = []
-    for category in Category.objects.all_categories():
-        ranked_categories.append(category.pk)
+def record_user_post(user, post):
+    """increases user's posts count in bucket for the day post was made on"""
+    record_post(user.pk, post)
+
+
+def record_approved_post(post):
+    """records post made in threads that was approved by moderator in poster's bucket"""
+    if post.poster_id and not post.is_event and post.thread_type.root_name == THREADS_ROOT_NAME:
+        record_post(post.poster_id, post)
+
+
+def record_post(user_id, post):
+    with connection.cursor() as cursor:
+        cursor.execute(RECORD_POST_SQL, [user_id, timezone.localdate(post.posted_on)])
+
+
+def build_active_posters_ranking():
+    # buckets table is empty after upgrade until it is filled from posts
+    if not ActivityRankingBucket.objects.exists():
+        rebuild_activity_ranking_buckets()
+
+    tracked_since = get_tracked_since()
 
     queryset = (
-        UserModel.objects
+        ActivityRankingBucket.objects
         .filter(
-            is_active=True,
-            post__posted_on__gte=tracked_since,
-            post__category__in=ranked_categories,	
+            day__gte=tracked_since,
+            user__is_active=True,
         )
-        .annotate(score=Count('post'))
+        .values('user_id')
+        .annotate(score=Sum('posts'))
         .filter(score__gt=0)
         .order_by('-score')
     )[:settings.MISAGO_RANKING_SIZE]
 
     new_ranking = []
-    for ranking in queryset.iterator():
-        new_ranking.append(ActivityRanking(user=ranking, score=ranking.score))
-    ActivityRanking.objects.bulk_create(new_ranking)    
+    for ranking in queryset:
+        new_ranking.append(ActivityRanking(user_id=ranking['user_id'], score=ranking['score']))
+
+    # readers see old ranking until new one is committed
+    with transaction.atomic():
+        ActivityRanking.objects.all().delete()
+        ActivityRanking.objects.bulk_create(new_ranking)
+
+    ActivityRankingBucket.objects.filter(day__lt=tracked_since).delete()
+
+
+def rebuild_activity_ranking_buckets():
+    """recounts posts buckets from posts made in tracked period"""
+    from misago.threads.models import Post
+
+    tracked_since = get_tracked_since()
+
+    ranked_categories = []
+    for category in Category.objects.all_categories():
+        ranked_categories.append(category.pk)
+
+    queryset = (
+        Post.objects
+        .filter(
+            posted_on__date__gte=tracked_since,
+            category__in=ranked_categories,
+            is_event=False,
+            is_unapproved=False,
+            poster__isnull=False,
+        )
+        .annotate(day=TruncDate('posted_on'))
+        .values('poster_id', 'day')
+        .annotate(posts=Count('id'))
+        .order_by()
+    )
+
+    new_buckets = []
+    for bucket in queryset.iterator():
+        new_buckets.append(ActivityRankingBucket(
+            user_id=bucket['poster_id'],
+            day=bucket['day'],
+            posts=bucket['posts'],
+        ))
+
+    with transaction.atomic():
+        ActivityRankingBucket.objects.all().delete()
+        ActivityRankingBucket.objects.bulk_create(new_buckets)
@@ -8,8 +8,7 @@ from .views.admin.bans import BansList, DeleteBan, EditBan, NewBan
 from .views.admin.datadownloads import DataDownloadsList, RequestDataDownloads
 from .views.admin.ranks import (
     DefaultRank, DeleteRank, EditRank, MoveDownRank, MoveUpRank, NewRank, RanksList, RankUsers)
-from .views.admin.users import (
-    DeleteAccountStep, DeletePostsStep, DeleteThreadsStep, EditUser, NewUser, UsersList)
+from .views.admin.users import EditUser, NewUser, UsersList
 
 
 djadmin.site.register(model_or_iterable=get_user_model(), admin_class=UserAdminModel)
@@ -28,17 +27,6 @@ class MisagoAdminExtension(object):
             url(r'^(?P<page>\d+)/$', UsersList.as_view(), name='index'),
             url(r'^new/$', NewUser.as_view(), name='new'),
             url(r'^edit/(?P<pk>\d+)/$', EditUser.as_view(), name='edit'),
-            url(
-                r'^delete-threads/(?P<pk>\d+)/$',
-                DeleteThreadsStep.as_view(),
-                name='delete-threads'
-            ),
-            url(r'^delete-posts/(?P<pk>\d+)/$', DeletePostsStep.as_view(), name='delete-posts'),
-            url(
-                r'^delete-account/(?P<pk>\d+)/$',
-                DeleteAccountStep.as_view(),
-                name='delete-account'
-            ),
         )
 
         # Ranks
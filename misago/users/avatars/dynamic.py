@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from PIL import Image, ImageColor, ImageDraw, ImageFont
 
@@ -21,8 +22,18 @@ FONT_FILE = os.path.join(os.path.dirname(__file__), 'font.ttf')
 def set_avatar(user):
     drawer_function = import_string(settings.MISAGO_DYNAMIC_AVATAR_DRAWER)
 
-    image = drawer_function(user)
-    store.store_new_avatar(user, image)
+    if drawer_function is draw_default:
+        # default avatars differ only by color and letter, so they are shared
+        key = get_default_avatar_key(user)
+        store.store_new_shared_avatar(user, key, lambda: drawer_function(user))
+    else:
+        image = drawer_function(user)
+        store.store_new_avatar(user, image)
+
+
+def get_default_avatar_key(user):
+    color = get_avatar_color(user).lstrip('#').lower()
+    return 'dynamic-{}-{:x}'.format(color, ord(user.username[0]))
 
 
 def draw_default(user):
@@ -36,13 +47,15 @@ def draw_default(user):
     return image
 
 
+def get_avatar_color(user):
+    color_index = user.pk - COLOR_WHEEL_LEN * (user.pk // COLOR_WHEEL_LEN)
+    return COLOR_WHEEL[color_index]
+
+
 def draw_avatar_bg(user, image):
     image_size = image.size
 
-    color_index = user.pk - COLOR_WHEEL_LEN * (user.pk // COLOR_WHEEL_LEN)
-    main_color = COLOR_WHEEL[color_index]
-
-    rgb = ImageColor.getrgb(main_color)
+    rgb = ImageColor.getrgb(get_avatar_color(user))
 
     bg_drawer = ImageDraw.Draw(image)
     bg_drawer.rectangle([(0, 0), image_size], rgb)
@@ -56,7 +69,7 @@ def draw_avatar_flavour(user, image):
     image_size = image.size[0]
 
     size = int(image_size * 0.7)
-    font = ImageFont.truetype(FONT_FILE, size=size)
+    font = get_font(size)
 
     text_size = font.getsize(string)
     text_pos = ((image_size - text_size[0]) / 2, (image_size - text_size[1]) / 2, )
@@ -65,3 +78,8 @@ def draw_avatar_flavour(user, image):
     writer.text(text_pos, string, font=font)
 
     return image
+
+
+@lru_cache(maxsize=8)
+def get_font(size):
+    return ImageFont.truetype(FONT_FILE, size=size)
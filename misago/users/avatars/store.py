@@ -5,11 +5,15 @@ from io import BytesIO
 from PIL import Image
 
 from django.core.files.base import ContentFile
+from django.db import connection, transaction
 from django.utils.crypto import get_random_string
 
 from misago.conf import settings
 
 
+SHARED_AVATARS_DIR = os.path.join('avatars', 'shared')
+
+
 def normalize_image(image):
     """strip image of animation, convert to RGBA"""
     image.seek(0)
@@ -23,30 +27,145 @@ def delete_avatar(user, delete_tmp=True, delete_src=True):
     if delete_src and user.avatar_src:
         user.avatar_src.delete(save=False)
 
+    shared_avatars = []
     for avatar in user.avatar_set.all():
-        avatar.image.delete(save=False)
+        if is_shared_avatar(avatar.image.name):
+            shared_avatars.append(avatar)
+        else:
+            avatar.image.delete(save=False)
     user.avatar_set.all().delete()
 
+    delete_unused_shared_avatars(shared_avatars)
 
-def store_avatar(user, image):
+
+def is_shared_avatar(name):
+    return name.startswith(SHARED_AVATARS_DIR + os.sep)
+
+
+def get_shared_avatar_key(name):
+    return os.path.basename(os.path.dirname(name))
+
+
+def lock_shared_avatars(keys):
+    """
+    lock shared avatars until the end of transaction
+
+    this stops other processes from deleting shared avatar files before
+    users starting to use them have their avatars committed
+    """
+    with connection.cursor() as cursor:
+        for key in sorted(keys):
+            lock_name = os.path.join(SHARED_AVATARS_DIR, key)
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [lock_name])
+
+
+def delete_unused_shared_avatars(avatars):
+    """deletes shared avatars files that are no longer used by any user"""
     from misago.users.models import Avatar
+
+    if not avatars:
+        return
+
+    names = [avatar.image.name for avatar in avatars]
+
+    with transaction.atomic():
+        lock_shared_avatars(set(get_shared_avatar_key(name) for name in names))
+
+        used_names = Avatar.objects.filter(image__in=names).values_list('image', flat=True)
+        used_names = set(used_names)
+
+        for avatar in avatars:
+            if avatar.image.name not in used_names:
+                avatar.image.delete(save=False)
+
+
+def render_avatars(image):
+    """
+    downscale image to all avatar sizes
+
+    every size is downscaled from smallest already rendered image that is at
+    least twice as big, so large source images are resized only once
+    """
     image = normalize_image(image)
 
-    avatars = []
+    renders = []
+    source = image
     for size in sorted(settings.MISAGO_AVATARS_SIZES, reverse=True):
-        image_stream = BytesIO()
+        for _, render in renders:
+            if render.size[0] >= size * 2:
+                source = render
+
+        render = source.resize((size, size), Image.ANTIALIAS)
+        renders.append((size, render))
+
+    return renders
+
+
+def get_image_data(image):
+    image_stream = BytesIO()
+    image.save(image_stream, "PNG")
+    return image_stream.getvalue()
 
-        image = image.resize((size, size), Image.ANTIALIAS)
-        image.save(image_stream, "PNG")
 
+def store_avatar(user, image):
+    from misago.users.models import Avatar
+
+    avatars = []
+    for size, render in render_avatars(image):
         avatars.append(
-            Avatar.objects.create(
+            Avatar(
                 user=user,
                 size=size,
-                image=ContentFile(image_stream.getvalue(), 'avatar'),
+                image=ContentFile(get_image_data(render), 'avatar'),
             )
         )
 
+    save_avatars(user, avatars)
+
+
+def store_shared_avatar(user, key, draw_image):
+    """
+    set avatar that is identical for many users
+
+    avatar images are rendered with draw_image and stored only once for key,
+    then reused by all users having avatar with same key
+    """
+    from misago.users.models import Avatar
+
+    with transaction.atomic():
+        lock_shared_avatars([key])
+
+        avatars = []
+        for size, name in get_shared_avatar_images(key, draw_image):
+            avatars.append(Avatar(user=user, size=size, image=name))
+
+        save_avatars(user, avatars)
+
+
+def get_shared_avatar_images(key, draw_image):
+    """returns shared avatar images for key, storing missing ones first"""
+    from misago.users.models import Avatar
+
+    storage = Avatar._meta.get_field('image').storage
+
+    images = []
+    for size in sorted(settings.MISAGO_AVATARS_SIZES, reverse=True):
+        images.append((size, os.path.join(SHARED_AVATARS_DIR, key, '%s.png' % size)))
+
+    if not all(storage.exists(name) for _, name in images):
+        renders = dict(render_avatars(draw_image()))
+        for i, (size, name) in enumerate(images):
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(get_image_data(renders[size])))
+                images[i] = (size, name)
+
+    return images
+
+
+def save_avatars(user, avatars):
+    from misago.users.models import Avatar
+    Avatar.objects.bulk_create(avatars)
+
     user.avatars = [{'size': a.size, 'url': a.url} for a in avatars]
     user.save(update_fields=['avatars'])
 
@@ -56,6 +175,11 @@ def store_new_avatar(user, image, delete_tmp=True, delete_src=True):
     store_avatar(user, image)
 
 
+def store_new_shared_avatar(user, key, draw_image):
+    delete_avatar(user)
+    store_shared_avatar(user, key, draw_image)
+
+
 def store_temporary_avatar(user, image):
     image_stream = BytesIO()
 
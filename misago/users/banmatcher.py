@@ -0,0 +1,136 @@
+"""
+In-memory matcher for checked bans
+
+Instead of scanning bans table and compiling wildcard bans on every check,
+checked bans are loaded once per process and indexed by their values.
+Matcher is rebuilt lazily when bans cachebuster's version changes.
+
+Matcher returns only ids of candidate bans, whose state should be confirmed
+against the database before they are used.
+"""
+import re
+from ipaddress import ip_address, ip_network
+from threading import Lock
+
+from misago.core import cachebuster
+
+from .constants import BANS_CACHEBUSTER
+
+
+_matcher_cache = {}
+_matcher_lock = Lock()
+
+
+class BanMatcher(object):
+    def __init__(self, version, bans):
+        self.version = version
+
+        self.exact = {}
+        self.prefixes = {}
+        self.suffixes = {}
+        self.patterns = {}
+        self.networks = {}
+
+        for ban_id, check_type, registration_only, banned_value in bans:
+            self.add_ban(ban_id, check_type, registration_only, banned_value)
+
+        self.prefixes_lengths = get_affixes_lengths(self.prefixes)
+        self.suffixes_lengths = get_affixes_lengths(self.suffixes)
+
+    def add_ban(self, ban_id, check_type, registration_only, banned_value):
+        from .models import Ban
+
+        ban = (ban_id, registration_only)
+        wildcards = banned_value.count('*')
+
+        if not wildcards:
+            if check_type == Ban.IP and '/' in banned_value:
+                try:
+                    network = ip_network(banned_value, strict=False)
+                    index = self.networks.setdefault(check_type, {})
+                    key = (network.version, network.prefixlen)
+                    index.setdefault(key, {}).setdefault(network, []).append(ban)
+                    return
+                except ValueError:
+                    pass
+            self.exact.setdefault((check_type, banned_value), []).append(ban)
+        elif wildcards == 1 and banned_value.endswith('*'):
+            index = self.prefixes.setdefault(check_type, {})
+            index.setdefault(banned_value[:-1], []).append(ban)
+        elif wildcards == 1 and banned_value.startswith('*'):
+            index = self.suffixes.setdefault(check_type, {})
+            index.setdefault(banned_value[1:], []).append(ban)
+        else:
+            regex = re.escape(banned_value).replace('\\*', '(.*?)')
+            pattern = re.compile('^%s$' % regex)
+            self.patterns.setdefault(check_type, []).append((pattern, ban))
+
+    def match(self, check_type, value, registration_only=False):
+        bans = []
+        bans += self.exact.get((check_type, value), [])
+
+        prefixes = self.prefixes.get(check_type)
+        for length in self.prefixes_lengths.get(check_type, []):
+            if length <= len(value):
+                bans += prefixes.get(value[:length], [])
+
+        suffixes = self.suffixes.get(check_type)
+        for length in self.suffixes_lengths.get(check_type, []):
+            if length <= len(value):
+                bans += suffixes.get(value[len(value) - length:], [])
+
+        for pattern, ban in self.patterns.get(check_type, []):
+            if pattern.search(value):
+                bans.append(ban)
+
+        if check_type in self.networks:
+            bans += self.match_networks(self.networks[check_type], value)
+
+        if registration_only:
+            return [ban_id for ban_id, _ in bans]
+        return [ban_id for ban_id, is_registration_ban in bans if not is_registration_ban]
+
+    def match_networks(self, networks, value):
+        try:
+            address = ip_address(value)
+        except ValueError:
+            return []
+
+        bans = []
+        for (version, prefixlen), index in networks.items():
+            if version == address.version:
+                network = ip_network('%s/%s' % (address, prefixlen), strict=False)
+                bans += index.get(network, [])
+        return bans
+
+
+def get_affixes_lengths(indexes):
+    lengths = {}
+    for check_type, index in indexes.items():
+        lengths[check_type] = sorted(set(len(affix) for affix in index))
+    return lengths
+
+
+def get_matcher():
+    version = cachebuster.get_version(BANS_CACHEBUSTER)
+
+    matcher = _matcher_cache.get('matcher')
+    if matcher is None or matcher.version != version:
+        with _matcher_lock:
+            matcher = _matcher_cache.get('matcher')
+            if matcher is None or matcher.version != version:
+                matcher = build_matcher(version)
+                _matcher_cache['matcher'] = matcher
+    return matcher
+
+
+def build_matcher(version):
+    from .models import Ban
+
+    queryset = Ban.objects.filter(is_checked=True).values_list(
+        'id', 'check_type', 'registration_only', 'banned_value')
+    return BanMatcher(version, queryset.iterator())
+
+
+def clear_matcher():
+    _matcher_cache.pop('matcher', None)
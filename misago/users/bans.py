@@ -47,43 +47,64 @@ def get_user_ban(user):
     get_email_ban(user.email) and get_username_ban(user.username)
     because it sets ban cache on user model
     """
-    try:
-        ban_cache = user.ban_cache
-        if not ban_cache.is_valid:
-            _set_user_ban_cache(user)
-    except BanCache.DoesNotExist:
-        user.ban_cache = BanCache(user=user)
-        user.ban_cache = _set_user_ban_cache(user)
+    make_users_ban_aware([user])
 
-    if user.ban_cache.ban:
+    if user.ban_cache.ban_id:
         return user.ban_cache
     else:
         return None
 
 
-def _set_user_ban_cache(user):
-    ban_cache = user.ban_cache
-    ban_cache.bans_version = cachebuster.get_version(VERSION_KEY)
+def make_users_ban_aware(users):
+    """
+    Revalidates outdated ban caches for list of users
 
-    try:
-        user_ban = Ban.objects.get_ban(
-            username=user.username,
-            email=user.email,
-            registration_only=False,
-        )
-
-        ban_cache.ban = user_ban
-        ban_cache.expires_on = user_ban.expires_on
-        ban_cache.user_message = user_ban.user_message
-        ban_cache.staff_message = user_ban.staff_message
-    except Ban.DoesNotExist:
-        ban_cache.ban = None
-        ban_cache.expires_on = None
-        ban_cache.user_message = None
-        ban_cache.staff_message = None
+    Users are checked against in-memory bans matcher and all matched bans are
+    fetched with single query. Ban cache is saved only if user's ban changed,
+    so revalidation after bans version change doesn't write to the database.
+    """
+    outdated_caches = []
+    for user in users:
+        try:
+            if not user.ban_cache.is_valid:
+                outdated_caches.append(user)
+        except BanCache.DoesNotExist:
+            user.ban_cache = BanCache(user=user)
+            outdated_caches.append(user)
+
+    if not outdated_caches:
+        return
+
+    bans_version = cachebuster.get_version(VERSION_KEY)
+    users_bans = Ban.objects.get_users_bans(outdated_caches)
+
+    # same user may appear on list more than once, eg. as poster of many posts
+    saved_caches = set()
+    for user in outdated_caches:
+        ban_cache = user.ban_cache
+        ban_cache.bans_version = bans_version
+        if _set_ban_cache_ban(ban_cache, users_bans[user.pk]) and user.pk not in saved_caches:
+            ban_cache.save()
+            saved_caches.add(user.pk)
+
+
+def _set_ban_cache_ban(ban_cache, ban):
+    if ban:
+        new_state = (ban.pk, ban.expires_on, ban.user_message, ban.staff_message)
+    else:
+        new_state = (None, None, None, None)
+
+    old_state = (
+        ban_cache.ban_id,
+        ban_cache.expires_on,
+        ban_cache.user_message,
+        ban_cache.staff_message,
+    )
+
+    ban_cache.ban = ban
+    ban_cache.expires_on, ban_cache.user_message, ban_cache.staff_message = new_state[1:]
 
-    ban_cache.save()
-    return ban_cache
+    return new_state != old_state
 
 
 def get_request_ip_ban(request):
@@ -27,6 +27,23 @@ def request_user_data_download(user, requester=None):
     )
 
 
+def request_users_data_downloads(users, requester):
+    """places data download requests for users that don't have one already"""
+    users_with_requests = DataDownload.objects.filter(
+        user__in=users,
+        status__in=STATUS_REQUEST,
+    ).values_list('user_id', flat=True)
+
+    return DataDownload.objects.bulk_create([
+        DataDownload(
+            user=user,
+            requester=requester,
+            requester_name=requester.username,
+        )
+        for user in users.exclude(pk__in=users_with_requests)
+    ])
+
+
 def prepare_user_data_download(download, logger=None):
     working_dir = settings.MISAGO_USER_DATA_DOWNLOADS_WORKING_DIR
     user = download.user
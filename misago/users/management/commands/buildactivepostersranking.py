@@ -1,16 +1,29 @@
 from time import time
 from django.core.management.base import BaseCommand
 
-from misago.users.activepostersranking import build_active_posters_ranking
+from misago.users.activepostersranking import (
+    build_active_posters_ranking, rebuild_activity_ranking_buckets)
 
 
 class Command(BaseCommand):
     help = 'Builds active posters ranking'
 
-    def handle(self, *args, **options):
-        self.stdout.write("\nBuilding active posters ranking...")
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild-buckets',
+            action='store_true',
+            dest='rebuild_buckets',
+            help="Recount users daily posts from posts made in ranked period.",
+        )
 
+    def handle(self, *args, **options):
         start_time = time()
+
+        if options['rebuild_buckets']:
+            self.stdout.write("\nRecounting users daily posts...")
+            rebuild_activity_ranking_buckets()
+
+        self.stdout.write("\nBuilding active posters ranking...")
         build_active_posters_ranking()
         end_time = time() - start_time
 
@@ -12,8 +12,9 @@ UserModel = get_user_model()
 
 class Command(BaseCommand):
     help = (
-        "Deletes accounts of users that have requested it. "
-        "Leaves their content behind, but anonymises it."
+        "Deletes accounts of users that have requested it or were queued for deletion "
+        "by administrator. Leaves their content behind, but anonymises it, unless "
+        "content was queued for deletion too."
     )
 
     def handle(self, *args, **options):
@@ -23,7 +24,7 @@ class Command(BaseCommand):
 
         for user in chunk_queryset(queryset):
             if can_delete_own_account(user, user):
-                user.delete()
+                user.delete(delete_content=user.is_deleting_content)
                 users_deleted += 1
 
         self.stdout.write("Deleted users: {}".format(users_deleted))
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('misago_users', '0015_user_agreements'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='is_deleting_content',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from .rank import Rank
 from .user import AnonymousUser, Online, User, UsernameChange
-from .activityranking import ActivityRanking
+from .activityranking import ActivityRanking, ActivityRankingBucket
 from .avatar import Avatar
 from .audittrail import AuditTrail
 from .avatargallery import AvatarGallery
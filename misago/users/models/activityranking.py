@@ -9,3 +9,17 @@ class ActivityRanking(models.Model):
         on_delete=models.CASCADE,
     )
     score = models.PositiveIntegerField(default=0, db_index=True)
+
+
+class ActivityRankingBucket(models.Model):
+    """number of posts user has made on given day"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='+',
+        on_delete=models.CASCADE,
+    )
+    day = models.DateField(db_index=True)
+    posts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [['user', 'day']]
@@ -1,4 +1,5 @@
 import re
+from ipaddress import ip_address, ip_network
 
 from django.conf import settings
 from django.db import IntegrityError, models
@@ -28,41 +29,80 @@ class BansManager(models.Manager):
             registration_only=registration_only,
         )
 
+    def create_bans(self, bans):
+        """inserts bans in one query, remember to call invalidate_cache afterwards"""
+        for ban in bans:
+            ban.banned_value = ban.banned_value.lower()
+            ban.is_checked = not ban.is_expired
+        return self.bulk_create(bans)
+
     def invalidate_cache(self):
+        from misago.users.banmatcher import clear_matcher
+
         cachebuster.invalidate(BANS_CACHEBUSTER)
+        clear_matcher()
 
     def get_ban(self, username=None, email=None, ip=None, registration_only=False):
-        checks = []
-
-        if username:
-            username = username.lower()
-            checks.append(self.model.USERNAME)
-        if email:
-            email = email.lower()
-            checks.append(self.model.EMAIL)
-        if ip:
-            checks.append(self.model.IP)
-
-        queryset = self.filter(is_checked=True)
+        checks = get_ban_checks(username=username, email=email, ip=ip)
+
+        bans = self.get_matched_bans([checks], registration_only)
+        ban = find_ban(checks, bans)
+        if ban:
+            return ban
+
+        raise Ban.DoesNotExist('specified values are not banned')
+
+    def get_users_bans(self, users):
+        """returns dict of bans for users, resolved with single query"""
+        users_checks = {}
+        for user in users:
+            users_checks[user.pk] = get_ban_checks(username=user.username, email=user.email)
+
+        bans = self.get_matched_bans(users_checks.values())
+
+        users_bans = {}
+        for user_id, checks in users_checks.items():
+            users_bans[user_id] = find_ban(checks, bans)
+        return users_bans
+
+    def get_matched_bans(self, checks_list, registration_only=False):
+        from misago.users.banmatcher import get_matcher
+
+        matcher = get_matcher()
+
+        candidates = set()
+        for checks in checks_list:
+            for check_type, value in checks.items():
+                candidates.update(matcher.match(check_type, value, registration_only))
+
+        if not candidates:
+            return []
+
+        # matcher may be stale, so candidates are confirmed against the database
+        queryset = self.filter(pk__in=candidates)
         if not registration_only:
-            queryset = self.filter(registration_only=False)
-
-        if len(checks) == 1:
-            queryset = queryset.filter(check_type=checks[0])
-        elif checks:
-            queryset = queryset.filter(check_type__in=checks)
-
-        for ban in queryset.order_by('-id').iterator():
-            if ban.is_expired:
-                continue
-            elif (ban.check_type == self.model.USERNAME and username and ban.check_value(username)):
-                return ban
-            elif (ban.check_type == self.model.EMAIL and email and ban.check_value(email)):
-                return ban
-            elif ban.check_type == self.model.IP and ip and ban.check_value(ip):
-                return ban
-        else:
-            raise Ban.DoesNotExist('specified values are not banned')
+            queryset = queryset.filter(registration_only=False)
+        return list(queryset.order_by('-id'))
+
+
+def get_ban_checks(username=None, email=None, ip=None):
+    checks = {}
+    if username:
+        checks[Ban.USERNAME] = username.lower()
+    if email:
+        checks[Ban.EMAIL] = email.lower()
+    if ip:
+        checks[Ban.IP] = ip
+    return checks
+
+
+def find_ban(checks, bans):
+    for ban in bans:
+        if ban.is_expired or ban.check_type not in checks:
+            continue
+        if ban.check_value(checks[ban.check_type]):
+            return ban
+    return None
 
 
 class Ban(models.Model):
@@ -87,10 +127,20 @@ class Ban(models.Model):
     objects = BansManager()
 
     def save(self, *args, **kwargs):
+        from misago.users.banmatcher import clear_matcher
+
         self.banned_value = self.banned_value.lower()
         self.is_checked = not self.is_expired
 
-        return super().save(*args, **kwargs)
+        super().save(*args, **kwargs)
+        clear_matcher()
+
+    def delete(self, *args, **kwargs):
+        from misago.users.banmatcher import clear_matcher
+
+        deleted = super().delete(*args, **kwargs)
+        clear_matcher()
+        return deleted
 
     def get_serialized_message(self):
         from misago.users.serializers import BanMessageSerializer
@@ -108,6 +158,12 @@ class Ban(models.Model):
             return False
 
     def check_value(self, value):
+        if self.check_type == self.IP and '/' in self.banned_value:
+            try:
+                return ip_address(value) in ip_network(self.banned_value, strict=False)
+            except ValueError:
+                pass
+
         if '*' in self.banned_value:
             regex = re.escape(self.banned_value).replace('\*', '(.*?)')
             return re.search('^%s$' % regex, value) is not None
@@ -204,6 +204,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active_staff_message = models.TextField(null=True, blank=True)
 
     is_deleting_account = models.BooleanField(default=False)
+    is_deleting_content = models.BooleanField(default=False)
 
     avatar_tmp = models.ImageField(
         max_length=255,
@@ -0,0 +1,126 @@
+"""
+Online presence index
+
+Time of user's last click is kept in cache under key of its own, expiring
+after activity cutoff period. Marking user online can't overwrite other
+users clicks, and telling if users are online takes single cache read for
+all of them.
+
+For listing and counting users online, users are also indexed in buckets
+covering short periods of time. User joins bucket once, by atomically
+adding bucket membership key and taking next slot from bucket's counter,
+so nothing reads and writes back whole bucket. Users online are users from
+slots of buckets from activity cutoff period that still have their last
+click in cache.
+
+To save cache writes, process remembers users it has marked online in
+current bucket, and doesn't mark them again until next bucket begins.
+"""
+from datetime import timedelta
+from time import time
+
+from misago.core.cache import cache
+
+
+ACTIVITY_CUTOFF = timedelta(minutes=2)
+
+PRESENCE_CACHE = 'misago_online_presence'
+BUCKET_LENGTH = 30  # seconds
+BUCKETS_COUNT = int(ACTIVITY_CUTOFF.total_seconds() // BUCKET_LENGTH) + 1
+BUCKET_TIMEOUT = (BUCKETS_COUNT + 1) * BUCKET_LENGTH
+
+_local_marks = {}
+
+
+def get_bucket(timestamp):
+    return int(timestamp // BUCKET_LENGTH)
+
+
+def get_user_key(user_id):
+    return '%s_%s' % (PRESENCE_CACHE, user_id)
+
+
+def get_bucket_key(bucket):
+    return '%s_bucket_%s' % (PRESENCE_CACHE, bucket)
+
+
+def get_bucket_member_key(bucket, user_id):
+    return '%s_user_%s' % (get_bucket_key(bucket), user_id)
+
+
+def get_bucket_slot_key(bucket, slot):
+    return '%s_slot_%s' % (get_bucket_key(bucket), slot)
+
+
+def mark_user_online(user):
+    now = time()
+    bucket = get_bucket(now)
+    if _local_marks.get(user.pk) == bucket:
+        return
+
+    cache.set(get_user_key(user.pk), now, int(ACTIVITY_CUTOFF.total_seconds()))
+    add_user_to_bucket(bucket, user.pk)
+
+    # mark is recorded only after user was written to presence index
+    if len(_local_marks) > 10000:
+        _local_marks.clear()
+    _local_marks[user.pk] = bucket
+
+
+def add_user_to_bucket(bucket, user_id):
+    if not cache.add(get_bucket_member_key(bucket, user_id), True, BUCKET_TIMEOUT):
+        return  # user is already in bucket
+
+    bucket_key = get_bucket_key(bucket)
+    cache.add(bucket_key, 0, BUCKET_TIMEOUT)
+    try:
+        slot = cache.incr(bucket_key)
+    except ValueError:
+        # bucket's counter has expired between add and incr
+        cache.add(bucket_key, 0, BUCKET_TIMEOUT)
+        slot = cache.incr(bucket_key)
+
+    cache.set(get_bucket_slot_key(bucket, slot), user_id, BUCKET_TIMEOUT)
+
+
+def mark_user_offline(user):
+    _local_marks.pop(user.pk, None)
+    cache.delete(get_user_key(user.pk))
+
+
+def get_users_last_clicks(users_ids):
+    """returns dict of online users ids and timestamps of their last clicks"""
+    cutoff = time() - ACTIVITY_CUTOFF.total_seconds()
+
+    users_keys = {get_user_key(user_id): user_id for user_id in users_ids}
+    last_clicks = {}
+    for user_key, last_click in cache.get_many(users_keys.keys()).items():
+        if last_click >= cutoff:
+            last_clicks[users_keys[user_key]] = last_click
+    return last_clicks
+
+
+def get_online_users():
+    """returns dict of all online users ids and timestamps of their last clicks"""
+    current_bucket = get_bucket(time())
+    buckets = [current_bucket - i for i in range(BUCKETS_COUNT)]
+
+    buckets_keys = {get_bucket_key(bucket): bucket for bucket in buckets}
+    slots_keys = []
+    for bucket_key, slots in cache.get_many(buckets_keys.keys()).items():
+        bucket = buckets_keys[bucket_key]
+        slots_keys += [get_bucket_slot_key(bucket, slot) for slot in range(1, slots + 1)]
+
+    if not slots_keys:
+        return {}
+
+    users_ids = set(cache.get_many(slots_keys).values())
+    return get_users_last_clicks(users_ids)
+
+
+def count_online_users():
+    return len(get_online_users())
+
+
+def clear_local_marks():
+    _local_marks.clear()
@@ -2,8 +2,11 @@ from rest_framework.request import Request
 
 from django.utils import timezone
 
+from misago.conf import settings
 from misago.users.models import Online
 
+from . import presence
+
 
 def mute_tracker(request):
     request._misago_online_tracker = None
@@ -17,14 +20,21 @@ def start_tracking(request, user):
 
 
 def update_tracker(request, tracker):
-    tracker.last_click = timezone.now()
+    presence.mark_user_online(request.user)
 
-    tracker.save(update_fields=['last_click'])
+    if settings.MISAGO_ONLINE_TRACKER_SAVE_CLICKS:
+        tracker.last_click = timezone.now()
+        tracker.save(update_fields=['last_click'])
 
 
 def stop_tracking(request, tracker):
     user = tracker.user
-    user.last_login = tracker.last_click
+    presence.mark_user_offline(user)
+
+    if settings.MISAGO_ONLINE_TRACKER_SAVE_CLICKS:
+        user.last_login = tracker.last_click
+    else:
+        user.last_login = timezone.now()
     user.save(update_fields=['last_login'])
 
     tracker.delete()
@@ -1,15 +1,17 @@
-from datetime import timedelta
+from datetime import datetime
 
 from django.utils import timezone
 
-from misago.users.bans import get_user_ban
+from misago.users.bans import get_user_ban, make_users_ban_aware
 from misago.users.models import BanCache, Online
 
+from .presence import ACTIVITY_CUTOFF, get_users_last_clicks
 
-ACTIVITY_CUTOFF = timedelta(minutes=2)
 
+def get_user_status(viewer, user, online_users=None):
+    if online_users is None:
+        online_users = get_users_last_clicks([user.pk])
 
-def get_user_status(viewer, user):
     user_status = {
         'is_banned': False,
         'is_hidden': user.is_hiding_presence,
@@ -26,16 +28,12 @@ def get_user_status(viewer, user):
         user_status['is_banned'] = True
         user_status['banned_until'] = user_ban.expires_on
 
-    try:
-        online_tracker = user.online_tracker
-        is_hidden = user.is_hiding_presence and not viewer.acl_cache['can_see_hidden_users']
-
-        if online_tracker and not is_hidden:
-            if online_tracker.last_click >= timezone.now() - ACTIVITY_CUTOFF:
-                user_status['is_online'] = True
-                user_status['last_click'] = online_tracker.last_click
-    except Online.DoesNotExist:
-        pass
+    is_hidden = user.is_hiding_presence and not viewer.acl_cache['can_see_hidden_users']
+    if not is_hidden:
+        last_click = get_user_last_click(user, online_users)
+        if last_click and last_click >= timezone.now() - ACTIVITY_CUTOFF:
+            user_status['is_online'] = True
+            user_status['last_click'] = last_click
 
     if user_status['is_hidden']:
         if viewer.acl_cache['can_see_hidden_users']:
@@ -57,6 +55,22 @@ def get_user_status(viewer, user):
     return user_status
 
 
+def get_user_last_click(user, online_users):
+    last_clicks = []
+    if user.pk in online_users:
+        last_clicks.append(datetime.fromtimestamp(online_users[user.pk], timezone.utc))
+
+    try:
+        if user.online_tracker:
+            last_clicks.append(user.online_tracker.last_click)
+    except Online.DoesNotExist:
+        pass
+
+    if last_clicks:
+        return max(last_clicks)
+    return None
+
+
 def make_users_status_aware(viewer, users, fetch_state=False):
     users_dict = {}
     for user in users:
@@ -71,6 +85,10 @@ def make_users_status_aware(viewer, users, fetch_state=False):
         for online_tracker in Online.objects.filter(user__in=users_dict.keys()):
             users_dict[online_tracker.user_id].online_tracker = online_tracker
 
+    # Revalidate outdated ban caches in bulk
+    make_users_ban_aware(users)
+
     # Fill user states
+    online_users = get_users_last_clicks(users_dict.keys())
     for user in users:
-        user.status = get_user_status(viewer, user)
+        user.status = get_user_status(viewer, user, online_users)
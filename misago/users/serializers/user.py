@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 
 from misago.core.serializers import MutableFields
+from misago.users.signatures import get_user_signature
 
 from . import RankSerializer
 
@@ -98,10 +99,7 @@ class UserSerializer(serializers.ModelSerializer, MutableFields):
         return obj.get_real_name()
 
     def get_signature(self, obj):
-        if obj.has_valid_signature:
-            return obj.signature_parsed
-        else:
-            return None
+        return get_user_signature(obj)
 
     def get_status(self, obj):
         try:
@@ -3,14 +3,16 @@ from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.db.models import Q
+from django.db.models.signals import m2m_changed
 from django.dispatch import Signal, receiver
 from django.utils import timezone
 from django.utils.translation import ugettext as _
 
+from misago.acl import version as acl_version
 from misago.conf import settings
 from misago.core.pgutils import chunk_queryset
 
-from .models import AuditTrail
+from .models import AuditTrail, Rank
 from .profilefields import profilefields
 
 
@@ -23,6 +25,12 @@ remove_old_ips = Signal()
 username_changed = Signal()
 
 
+@receiver(m2m_changed, sender=Rank.roles.through)
+def invalidate_acl_version(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        acl_version.invalidate()
+
+
 @receiver(archive_user_data)
 def archive_user_details(sender, archive=None, **kwargs):
     archive.add_dict('details', OrderedDict([
@@ -1,7 +1,13 @@
+from misago.core.cache import cache
 from misago.markup import checksums, signature_flavour
 
 
+SIGNATURE_CACHE = 'misago_signature'
+
+
 def set_user_signature(request, user, signature):
+    clear_user_signature_cache(user)
+
     user.signature = signature
 
     if signature:
@@ -20,5 +26,31 @@ def is_user_signature_valid(user):
         return False
 
 
+def get_user_signature(user):
+    """returns user's signature html if it's valid, validating it only once"""
+    if not user.signature:
+        return None
+
+    cache_key = get_signature_cache_key(user)
+    signature = cache.get(cache_key)
+    if signature is None:
+        if is_user_signature_valid(user):
+            signature = user.signature_parsed
+        else:
+            signature = False
+        cache.set(cache_key, signature)
+
+    return signature or None
+
+
+def clear_user_signature_cache(user):
+    if user.signature_checksum:
+        cache.delete(get_signature_cache_key(user))
+
+
+def get_signature_cache_key(user):
+    return '%s_%s_%s' % (SIGNATURE_CACHE, user.pk, user.signature_checksum)
+
+
 def make_signature_checksum(parsed_signature, user):
     return checksums.make_checksum(parsed_signature, [user.pk])
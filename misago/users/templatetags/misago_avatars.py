@@ -6,8 +6,11 @@ register = template.Library()
 
 @register.filter(name='avatar')
 def avatar(user, size=200):
-    found_avatar = user.avatars[0]
-    for user_avatar in user.avatars:
+    # user may be model instance or its serialized representation
+    avatars = user['avatars'] if isinstance(user, dict) else user.avatars
+
+    found_avatar = avatars[0]
+    for user_avatar in avatars:
         if user_avatar['size'] >= size:
             found_avatar = user_avatar
     return found_avatar['url']
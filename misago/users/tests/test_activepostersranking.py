@@ -6,9 +6,12 @@ from django.utils import timezone
 from misago.categories.models import Category
 from misago.core import threadstore
 from misago.core.cache import cache
-from misago.threads.testutils import post_thread
+from misago.threads import moderation
+from misago.threads.testutils import post_thread, reply_thread
 from misago.users.activepostersranking import (
-    build_active_posters_ranking, get_active_posters_ranking)
+    build_active_posters_ranking, get_active_posters_ranking, rebuild_activity_ranking_buckets,
+    record_user_post)
+from misago.users.models import ActivityRankingBucket
 from misago.users.testutils import AuthenticatedUserTestCase
 
 
@@ -55,6 +58,7 @@ class TestActivePostersRanking(AuthenticatedUserTestCase):
         # Start testing scenarios
         post_thread(self.category, poster=other_user)
 
+        rebuild_activity_ranking_buckets()
         build_active_posters_ranking()
         ranking = get_active_posters_ranking()
 
@@ -65,6 +69,7 @@ class TestActivePostersRanking(AuthenticatedUserTestCase):
         post_thread(self.category, poster=self.user)
         post_thread(self.category, poster=self.user)
 
+        rebuild_activity_ranking_buckets()
         build_active_posters_ranking()
         ranking = get_active_posters_ranking()
 
@@ -87,6 +92,7 @@ class TestActivePostersRanking(AuthenticatedUserTestCase):
         disabled.posts = 3
         disabled.save()
 
+        rebuild_activity_ranking_buckets()
         build_active_posters_ranking()
         ranking = get_active_posters_ranking()
 
@@ -95,3 +101,52 @@ class TestActivePostersRanking(AuthenticatedUserTestCase):
 
         self.assertEqual(ranking['users'][0].score, 2)
         self.assertEqual(ranking['users'][1].score, 1)
+
+    def test_record_user_post(self):
+        """record_user_post increases user's posts count for post's day"""
+        thread = post_thread(self.category, poster=self.user)
+        record_user_post(self.user, thread.first_post)
+        record_user_post(self.user, thread.first_post)
+
+        bucket = ActivityRankingBucket.objects.get(user=self.user)
+        self.assertEqual(bucket.day, timezone.localdate(thread.first_post.posted_on))
+        self.assertEqual(bucket.posts, 2)
+
+        build_active_posters_ranking()
+        ranking = get_active_posters_ranking()
+
+        self.assertEqual(ranking['users'], [self.user])
+        self.assertEqual(ranking['users'][0].score, 2)
+
+    def test_build_ranking_fills_empty_buckets(self):
+        """build_active_posters_ranking fills buckets from posts if they are empty"""
+        post_thread(self.category, poster=self.user)
+
+        build_active_posters_ranking()
+        ranking = get_active_posters_ranking()
+
+        self.assertEqual(ranking['users'], [self.user])
+        self.assertEqual(ranking['users'][0].score, 1)
+
+    def test_approved_post_is_recorded(self):
+        """approving post records it in poster's bucket"""
+        thread = post_thread(self.category)
+        post = reply_thread(thread, poster=self.user, is_unapproved=True)
+
+        self.assertFalse(ActivityRankingBucket.objects.filter(user=self.user).exists())
+
+        moderation.approve_post(self.user, post)
+
+        bucket = ActivityRankingBucket.objects.get(user=self.user)
+        self.assertEqual(bucket.posts, 1)
+
+    def test_build_ranking_removes_old_buckets(self):
+        """build_active_posters_ranking removes buckets outside of ranked period"""
+        started_on = timezone.now() - timedelta(days=400)
+        thread = post_thread(self.category, poster=self.user, started_on=started_on)
+        record_user_post(self.user, thread.first_post)
+
+        build_active_posters_ranking()
+
+        self.assertEqual(get_active_posters_ranking()['users'], [])
+        self.assertFalse(ActivityRankingBucket.objects.exists())
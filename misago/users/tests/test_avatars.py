@@ -83,6 +83,100 @@ class AvatarsStoreTests(TestCase):
                 Avatar.objects.get(pk=removed_avatar.pk)
 
 
+class SharedAvatarsStoreTests(TestCase):
+    def test_store_shared(self):
+        """shared avatar is stored once and reused by users"""
+        user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'pass123')
+        other_user = UserModel.objects.create_user('Bobby', 'bobby@bob.com', 'pass123')
+
+        drawn_images = []
+
+        def draw_image():
+            image = Image.new("RGBA", (100, 100), 0)
+            drawn_images.append(image)
+            return image
+
+        key = 'test-{}'.format(get_random_string(8))
+        store.store_new_shared_avatar(user, key, draw_image)
+        store.store_new_shared_avatar(other_user, key, draw_image)
+
+        self.assertEqual(len(drawn_images), 1)
+        self.assertEqual(user.avatars, other_user.avatars)
+        self.assertEqual(len(user.avatars), len(settings.MISAGO_AVATARS_SIZES))
+
+        # deleting avatar doesn't delete shared files
+        user_avatars = list(user.avatar_set.all())
+        store.delete_avatar(user)
+
+        self.assertFalse(user.avatar_set.exists())
+        for avatar in user_avatars:
+            self.assertTrue(store.is_shared_avatar(avatar.image.name))
+            self.assertTrue(Path(avatar.image.path).exists())
+
+    def test_delete_unused_shared(self):
+        """shared avatar files are deleted when last user using them deletes avatar"""
+        user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'pass123')
+        other_user = UserModel.objects.create_user('Bobby', 'bobby@bob.com', 'pass123')
+
+        def draw_image():
+            return Image.new("RGBA", (100, 100), 0)
+
+        key = 'test-{}'.format(get_random_string(8))
+        store.store_new_shared_avatar(user, key, draw_image)
+        store.store_new_shared_avatar(other_user, key, draw_image)
+
+        shared_avatars = list(user.avatar_set.all())
+
+        store.delete_avatar(user)
+        for avatar in shared_avatars:
+            self.assertTrue(Path(avatar.image.path).exists())
+
+        store.delete_avatar(other_user)
+        for avatar in shared_avatars:
+            self.assertFalse(Path(avatar.image.path).exists())
+
+        # deleted shared avatar is stored again for next user
+        store.store_new_shared_avatar(user, key, draw_image)
+        for avatar in user.avatar_set.all():
+            self.assertTrue(Path(avatar.image.path).exists())
+
+    def test_store_shared_missing_files(self):
+        """every missing shared avatar file is stored again before being reused"""
+        user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'pass123')
+        other_user = UserModel.objects.create_user('Bobby', 'bobby@bob.com', 'pass123')
+
+        def draw_image():
+            return Image.new("RGBA", (100, 100), 0)
+
+        key = 'test-{}'.format(get_random_string(8))
+        store.store_new_shared_avatar(user, key, draw_image)
+
+        # other process deleted smallest shared file
+        smallest_avatar = user.avatar_set.order_by('size').first()
+        Path(smallest_avatar.image.path).unlink()
+
+        store.store_new_shared_avatar(other_user, key, draw_image)
+        for avatar in other_user.avatar_set.all():
+            self.assertTrue(Path(avatar.image.path).exists())
+
+    def test_dynamic_avatars_are_shared(self):
+        """users with same avatar color and letter share dynamic avatar"""
+        user = UserModel(pk=1, username='Bob')
+
+        self.assertEqual(
+            dynamic.get_default_avatar_key(user),
+            dynamic.get_default_avatar_key(UserModel(pk=1, username='Bobby')),
+        )
+        self.assertNotEqual(
+            dynamic.get_default_avatar_key(user),
+            dynamic.get_default_avatar_key(UserModel(pk=2, username='Bob')),
+        )
+        self.assertNotEqual(
+            dynamic.get_default_avatar_key(user),
+            dynamic.get_default_avatar_key(UserModel(pk=1, username='Alice')),
+        )
+
+
 class AvatarSetterTests(TestCase):
     def setUp(self):
         self.user = UserModel.objects.create_user('Bob', 'kontakt@rpiton.com', 'pass123')
@@ -10,6 +10,7 @@ class BansManagerTests(TestCase):
             Ban(check_type=Ban.EMAIL, banned_value='bob@test.com'),
             Ban(check_type=Ban.IP, banned_value='127.0.0.1'),
         ])
+        Ban.objects.invalidate_cache()
 
     def test_get_ban_for_banned_name(self):
         """get_ban finds ban for given username"""
@@ -38,6 +39,29 @@ class BansManagerTests(TestCase):
         with self.assertRaises(Ban.DoesNotExist):
             Ban.objects.get_ban(**invalid_kwargs)
 
+    def test_get_ban_for_ip_range(self):
+        """get_ban finds ban for ip in banned range"""
+        Ban.objects.create(check_type=Ban.IP, banned_value='10.0.0.0/8')
+
+        self.assertIsNotNone(Ban.objects.get_ban(ip='10.42.0.1'))
+        with self.assertRaises(Ban.DoesNotExist):
+            Ban.objects.get_ban(ip='11.0.0.1')
+
+    def test_get_ban_newest_ban(self):
+        """get_ban returns newest ban matching given values"""
+        Ban.objects.create(banned_value='bo*')
+        newest_ban = Ban.objects.create(banned_value='*ob')
+
+        self.assertEqual(Ban.objects.get_ban(username='bob'), newest_ban)
+
+    def test_get_ban_deleted_ban(self):
+        """get_ban skips bans deleted without invalidating cache"""
+        self.assertIsNotNone(Ban.objects.get_ban(username='bob'))
+        Ban.objects.filter(banned_value='bob').delete()
+
+        with self.assertRaises(Ban.DoesNotExist):
+            Ban.objects.get_ban(username='bob')
+
 
 class BanTests(TestCase):
     def test_check_value_literal(self):
@@ -67,3 +91,11 @@ class BanTests(TestCase):
 
         self.assertTrue(test_ban.check_value('lebob'))
         self.assertFalse(test_ban.check_value('bobby'))
+
+    def test_check_value_ip_range(self):
+        """ban correctly tests given values against ip range"""
+        test_ban = Ban(check_type=Ban.IP, banned_value='192.168.0.0/16')
+
+        self.assertTrue(test_ban.check_value('192.168.12.1'))
+        self.assertFalse(test_ban.check_value('192.169.0.1'))
+        self.assertFalse(test_ban.check_value('::1'))
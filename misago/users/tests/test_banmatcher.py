@@ -0,0 +1,59 @@
+from django.test import TestCase
+
+from misago.users.banmatcher import BanMatcher, clear_matcher, get_matcher
+from misago.users.models import Ban
+
+
+class BanMatcherTests(TestCase):
+    def setUp(self):
+        self.matcher = BanMatcher(0, [
+            (1, Ban.USERNAME, False, 'bob'),
+            (2, Ban.USERNAME, False, 'adm*'),
+            (3, Ban.USERNAME, True, 'b*b'),
+            (4, Ban.EMAIL, False, '*@spam.com'),
+            (5, Ban.IP, False, '10.0.0.0/8'),
+            (6, Ban.IP, False, '192.168.*'),
+        ])
+
+    def test_match_exact(self):
+        """matcher matches exact values"""
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'bob'), [1])
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'bobby'), [])
+        self.assertEqual(self.matcher.match(Ban.EMAIL, 'bob'), [])
+
+    def test_match_prefix(self):
+        """matcher matches values starting with banned prefix"""
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'admiral'), [2])
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'adm'), [2])
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'ad'), [])
+        self.assertEqual(self.matcher.match(Ban.IP, '192.168.1.1'), [6])
+
+    def test_match_suffix(self):
+        """matcher matches values ending with banned suffix"""
+        self.assertEqual(self.matcher.match(Ban.EMAIL, 'bob@spam.com'), [4])
+        self.assertEqual(self.matcher.match(Ban.EMAIL, 'bob@spam.co'), [])
+
+    def test_match_pattern(self):
+        """matcher matches values against wildcard patterns"""
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'bob', True), [1, 3])
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'beeb', True), [3])
+
+    def test_match_registration_only(self):
+        """matcher skips registration only bans for non-registration checks"""
+        self.assertEqual(self.matcher.match(Ban.USERNAME, 'beeb'), [])
+
+    def test_match_network(self):
+        """matcher matches ip addresses in banned ranges"""
+        self.assertEqual(self.matcher.match(Ban.IP, '10.1.2.3'), [5])
+        self.assertEqual(self.matcher.match(Ban.IP, '11.1.2.3'), [])
+        self.assertEqual(self.matcher.match(Ban.IP, '::1'), [])
+        self.assertEqual(self.matcher.match(Ban.IP, 'invalid'), [])
+
+    def test_get_matcher(self):
+        """get_matcher rebuilds matcher when bans are changed"""
+        clear_matcher()
+        matcher = get_matcher()
+        self.assertIs(get_matcher(), matcher)
+
+        Ban.objects.create(banned_value='bob')
+        self.assertIsNot(get_matcher(), matcher)
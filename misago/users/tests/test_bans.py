@@ -5,8 +5,9 @@ from django.test import TestCase
 from django.utils import timezone
 
 from misago.users.bans import (
-    ban_ip, ban_user, get_email_ban, get_ip_ban, get_request_ip_ban, get_user_ban, get_username_ban)
-from misago.users.models import Ban
+    ban_ip, ban_user, get_email_ban, get_ip_ban, get_request_ip_ban, get_user_ban, get_username_ban,
+    make_users_ban_aware)
+from misago.users.models import Ban, BanCache
 
 
 UserModel = get_user_model()
@@ -185,6 +186,55 @@ class UserBansTests(TestCase):
         self.assertFalse(self.user.ban_cache.is_banned)
 
 
+class UsersBanAwareTests(TestCase):
+    def test_no_ban_cache_is_not_saved(self):
+        """ban cache is not saved for user that is not banned"""
+        user = UserModel.objects.create_user('Bob', 'bob@boberson.com', 'pass123')
+
+        self.assertIsNone(get_user_ban(user))
+        self.assertFalse(BanCache.objects.filter(user=user).exists())
+
+    def test_unchanged_ban_cache_is_not_saved(self):
+        """ban cache is not saved when bans version changes but user's ban doesn't"""
+        user = UserModel.objects.create_user('Bob', 'bob@boberson.com', 'pass123')
+        ban = ban_user(user)
+
+        self.assertIsNotNone(get_user_ban(user))
+        bans_version = BanCache.objects.get(user=user).bans_version
+
+        Ban.objects.invalidate_cache()
+
+        user = UserModel.objects.get(pk=user.pk)
+        self.assertEqual(get_user_ban(user).ban_id, ban.pk)
+        self.assertEqual(BanCache.objects.get(user=user).bans_version, bans_version)
+
+    def test_changed_ban_cache_is_saved(self):
+        """ban cache is saved when user's ban changes"""
+        user = UserModel.objects.create_user('Bob', 'bob@boberson.com', 'pass123')
+        ban = ban_user(user)
+        self.assertIsNotNone(get_user_ban(user))
+
+        ban.delete()
+        Ban.objects.invalidate_cache()
+
+        user = UserModel.objects.get(pk=user.pk)
+        self.assertIsNone(get_user_ban(user))
+        self.assertIsNone(BanCache.objects.get(user=user).ban_id)
+
+    def test_make_users_ban_aware(self):
+        """make_users_ban_aware resolves bans for many users"""
+        banned_user = UserModel.objects.create_user('Bob', 'bob@boberson.com', 'pass123')
+        other_user = UserModel.objects.create_user('Alice', 'alice@example.com', 'pass123')
+        ban = ban_user(banned_user)
+
+        users = [banned_user, other_user, UserModel.objects.get(pk=banned_user.pk)]
+        make_users_ban_aware(users)
+
+        self.assertEqual(users[0].ban_cache.ban_id, ban.pk)
+        self.assertIsNone(users[1].ban_cache.ban_id)
+        self.assertEqual(users[2].ban_cache.ban_id, ban.pk)
+
+
 class MockRequest(object):
     def __init__(self):
         self.user_ip = '127.0.0.1'
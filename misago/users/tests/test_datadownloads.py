@@ -1,5 +1,6 @@
 import os
 
+from django.contrib.auth import get_user_model
 from django.core.files import File
 
 from misago.categories.models import Category
@@ -8,12 +9,14 @@ from misago.threads.testutils import post_thread, post_poll
 from misago.users.audittrail import create_user_audit_trail
 from misago.users.datadownloads import (
     expire_user_data_download, prepare_user_data_download, request_user_data_download,
-    user_has_data_download_request
+    request_users_data_downloads, user_has_data_download_request
 )
 from misago.users.models import DataDownload
 from misago.users.testutils import AuthenticatedUserTestCase
 
 
+UserModel = get_user_model()
+
 TESTFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testfiles')
 TEST_FILE_PATH = os.path.join(TESTFILES_DIR, 'avatar.png')
 
@@ -321,4 +324,21 @@ class UserHasRequestedDataDownloadTests(AuthenticatedUserTestCase):
         data_download.status = DataDownload.STATUS_PROCESSING
         data_download.save()
         
-        self.assertTrue(user_has_data_download_request(self.user))
\ No newline at end of file
+        self.assertTrue(user_has_data_download_request(self.user))
+
+
+class RequestUsersDataDownloadsTests(AuthenticatedUserTestCase):
+    def test_util_creates_downloads_for_users(self):
+        """request_users_data_downloads creates data downloads for users without one"""
+        other_user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'Pass.123')
+        request_user_data_download(other_user)
+
+        users = UserModel.objects.filter(pk__in=[self.user.pk, other_user.pk])
+        created = request_users_data_downloads(users, self.user)
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(DataDownload.objects.filter(user=other_user).count(), 1)
+
+        data_download = DataDownload.objects.get(user=self.user)
+        self.assertEqual(data_download.requester, self.user)
+        self.assertEqual(data_download.requester_name, self.user.username)
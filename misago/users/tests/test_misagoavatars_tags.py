@@ -42,3 +42,23 @@ class TemplateTagsTests(TestCase):
         self.assertEqual(render[1].strip(), user.avatars[1]['url'])
         self.assertEqual(render[2].strip(), user.avatars[2]['url'])
         self.assertEqual(render[3].strip(), user.avatars[2]['url'])
+
+    def test_serialized_user_avatar_filter(self):
+        """avatar filter returns url to avatar image for serialized user"""
+        user = {
+            'avatars': [
+                {
+                    'size': 400,
+                    'url': '/avatar/400.png'
+                },
+                {
+                    'size': 30,
+                    'url': '/avatar/30.png'
+                },
+            ],
+        }
+
+        tpl = Template("{% load misago_avatars %}{{ user|avatar:100 }}")
+        render = tpl.render(Context({'user': user})).strip()
+
+        self.assertEqual(render, '/avatar/400.png')
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from misago.users.models import Online
+from misago.users.online.presence import (
+    clear_local_marks, count_online_users, get_online_users, get_users_last_clicks,
+    mark_user_offline, mark_user_online)
+from misago.users.online.utils import get_user_status
+from misago.users.testutils import AuthenticatedUserTestCase
+
+
+UserModel = get_user_model()
+
+
+class OnlinePresenceTests(AuthenticatedUserTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_local_marks()
+
+        self.other_user = UserModel.objects.create_user('Tyrael', 't123@test.com', 'pass123')
+
+    def tearDown(self):
+        clear_local_marks()
+        super().tearDown()
+
+    def test_mark_user_online(self):
+        """mark_user_online adds user to online users"""
+        users_ids = [self.user.pk, self.other_user.pk]
+        self.assertNotIn(self.other_user.pk, get_users_last_clicks(users_ids))
+
+        mark_user_online(self.other_user)
+        mark_user_online(self.user)
+
+        self.assertEqual(sorted(get_users_last_clicks(users_ids)), sorted(users_ids))
+
+    def test_mark_user_offline(self):
+        """mark_user_offline removes user from online users"""
+        mark_user_online(self.other_user)
+        mark_user_online(self.user)
+        mark_user_offline(self.other_user)
+
+        last_clicks = get_users_last_clicks([self.user.pk, self.other_user.pk])
+        self.assertNotIn(self.other_user.pk, last_clicks)
+        self.assertIn(self.user.pk, last_clicks)
+
+    def test_get_online_users(self):
+        """get_online_users lists users marked online"""
+        self.assertEqual(get_online_users(), {})
+
+        mark_user_online(self.other_user)
+        mark_user_online(self.user)
+
+        online_users = get_online_users()
+        self.assertEqual(sorted(online_users), sorted([self.user.pk, self.other_user.pk]))
+
+        mark_user_offline(self.other_user)
+        self.assertEqual(list(get_online_users()), [self.user.pk])
+
+    def test_count_online_users(self):
+        """count_online_users counts every user online once"""
+        self.assertEqual(count_online_users(), 0)
+
+        mark_user_online(self.other_user)
+        mark_user_online(self.user)
+        self.assertEqual(count_online_users(), 2)
+
+        # marking user online again doesn't count them twice
+        clear_local_marks()
+        mark_user_online(self.user)
+        self.assertEqual(count_online_users(), 2)
+
+        mark_user_offline(self.user)
+        self.assertEqual(count_online_users(), 1)
+
+    def test_user_status(self):
+        """get_user_status reports user from presence index as online"""
+        Online.objects.filter(user=self.other_user).delete()
+        self.other_user = UserModel.objects.get(pk=self.other_user.pk)
+
+        self.assertFalse(get_user_status(self.user, self.other_user)['is_online'])
+
+        mark_user_online(self.other_user)
+        self.assertTrue(get_user_status(self.user, self.other_user)['is_online'])
+
+    @override_settings(MISAGO_ONLINE_TRACKER_SAVE_CLICKS=False)
+    def test_tracker_without_saving_clicks(self):
+        """online tracker updates presence index without saving clicks in database"""
+        last_click = Online.objects.get(user=self.user).last_click
+
+        response = self.client.get('/api/auth/')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(Online.objects.get(user=self.user).last_click, last_click)
+        self.assertIn(self.user.pk, get_users_last_clicks([self.user.pk]))
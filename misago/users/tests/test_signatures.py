@@ -33,3 +33,28 @@ class SignaturesTests(TestCase):
 
         test_user.signature_parsed = '<p>Injected evil HTML!</p>'
         self.assertFalse(signatures.is_user_signature_valid(test_user))
+
+    def test_get_user_signature(self):
+        """get_user_signature returns validated signature from cache"""
+        test_user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'pass123')
+        self.assertIsNone(signatures.get_user_signature(test_user))
+
+        signatures.set_user_signature(MockRequest(), test_user, 'Hello, world!')
+        self.assertEqual(signatures.get_user_signature(test_user), '<p>Hello, world!</p>')
+
+        # cached signature is returned for same checksum
+        test_user.signature_parsed = '<p>Injected evil HTML!</p>'
+        self.assertEqual(signatures.get_user_signature(test_user), '<p>Hello, world!</p>')
+
+        # changing signature invalidates cache
+        signatures.set_user_signature(MockRequest(), test_user, 'Changed!')
+        self.assertEqual(signatures.get_user_signature(test_user), '<p>Changed!</p>')
+
+    def test_get_invalid_user_signature(self):
+        """get_user_signature returns None for invalid signature"""
+        test_user = UserModel.objects.create_user('Bob', 'bob@bob.com', 'pass123')
+
+        signatures.set_user_signature(MockRequest(), test_user, 'Hello, world!')
+        test_user.signature_parsed = '<p>Injected evil HTML!</p>'
+
+        self.assertIsNone(signatures.get_user_signature(test_user))
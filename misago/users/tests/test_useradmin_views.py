@@ -1,5 +1,8 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.management import call_command
 from django.urls import reverse
 
 from misago.acl.models import Role
@@ -7,8 +10,9 @@ from misago.admin.testutils import AdminTestCase
 from misago.categories.models import Category
 from misago.legal.models import Agreement
 from misago.legal.utils import save_user_agreement_acceptance
-from misago.threads.testutils import post_thread, reply_thread
+from misago.threads.testutils import post_thread
 from misago.users.datadownloads import request_user_data_download
+from misago.users.management.commands import deletemarkedusers
 from misago.users.models import Ban, DataDownload, Rank
 
 
@@ -16,8 +20,6 @@ UserModel = get_user_model()
 
 
 class UserAdminViewsTests(AdminTestCase):
-    AJAX_HEADER = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
-
     def test_link_registered(self):
         """admin index view contains users link"""
         response = self.client.get(reverse('misago:admin:index'))
@@ -33,6 +35,27 @@ class UserAdminViewsTests(AdminTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, self.user.username)
 
+    def test_list_next_page_cursor(self):
+        """users list next page starts after last user on current page"""
+        for i in range(30):
+            UserModel.objects.create_user('Bob%s' % i, 'bob%s@test.com' % i, 'pass123')
+
+        response = self.client.get(reverse('misago:admin:users:accounts:index'))
+        response = self.client.get(response['location'])
+        self.assertEqual(response.status_code, 200)
+
+        last_user = UserModel.objects.order_by('-id')[23]
+        next_page_link = '%s?sort=id&direction=desc&redirected=1&cursor=%s' % (
+            reverse('misago:admin:users:accounts:index', kwargs={'page': 2}),
+            last_user.pk,
+        )
+        self.assertContains(response, 'cursor=%s' % last_user.pk)
+
+        response = self.client.get(next_page_link)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.user.username)
+        self.assertNotContains(response, last_user.username)
+
     def test_list_search(self):
         """users list is searchable"""
         response = self.client.get(reverse('misago:admin:users:accounts:index'))
@@ -311,7 +334,7 @@ class UserAdminViewsTests(AdminTestCase):
         self.assertEqual(UserModel.objects.count(), 11)
 
     def test_mass_delete_accounts(self):
-        """users list deletes users"""
+        """users list queues users for deletion"""
         # create 10 users to delete
         user_pks = []
         for i in range(10):
@@ -340,6 +363,14 @@ class UserAdminViewsTests(AdminTestCase):
             }
         )
         self.assertEqual(response.status_code, 302)
+
+        queued_users = UserModel.objects.filter(is_deleting_account=True)
+        self.assertEqual(sorted(u.pk for u in queued_users), sorted(user_pks))
+        for user in queued_users:
+            self.assertFalse(user.is_active)
+            self.assertFalse(user.is_deleting_content)
+
+        call_command(deletemarkedusers.Command(), stdout=StringIO())
         self.assertEqual(UserModel.objects.count(), 11)
 
     def test_mass_delete_all_self(self):
@@ -417,7 +448,9 @@ class UserAdminViewsTests(AdminTestCase):
         self.assertEqual(UserModel.objects.count(), 11)
 
     def test_mass_delete_all(self):
-        """users list mass deleting view has no showstoppers"""
+        """users list queues users and their content for deletion"""
+        category = Category.objects.get(slug='first-category')
+
         user_pks = []
         for i in range(10):
             test_user = UserModel.objects.create_user(
@@ -428,6 +461,8 @@ class UserAdminViewsTests(AdminTestCase):
             )
             user_pks.append(test_user.pk)
 
+            post_thread(category, poster=test_user)
+
         response = self.client.post(
             reverse('misago:admin:users:accounts:index'),
             data={
@@ -435,10 +470,17 @@ class UserAdminViewsTests(AdminTestCase):
                 'selected_items': user_pks,
             }
         )
-        self.assertEqual(response.status_code, 200)
-         # asser that no user has been deleted, because actuall deleting happens in
-         # dedicated views called via ajax from JavaScript
-        self.assertEqual(UserModel.objects.count(), 11)
+        self.assertEqual(response.status_code, 302)
+
+        queued_users = UserModel.objects.filter(is_deleting_account=True)
+        self.assertEqual(sorted(u.pk for u in queued_users), sorted(user_pks))
+        for user in queued_users:
+            self.assertFalse(user.is_active)
+            self.assertTrue(user.is_deleting_content)
+
+        call_command(deletemarkedusers.Command(), stdout=StringIO())
+        self.assertEqual(UserModel.objects.count(), 1)
+        self.assertEqual(category.thread_set.count(), 0)
 
     def test_new_view(self):
         """new user view creates account"""
@@ -1067,221 +1109,3 @@ class UserAdminViewsTests(AdminTestCase):
         response = self.client.get(test_link)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, agreement.title)
-
-    def test_delete_threads_view_self(self):
-        """delete user threads view validates if user deletes self"""
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-threads', kwargs={
-                'pk': self.user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "delete yourself");
-
-    def test_delete_threads_view_staff(self):
-        """delete user threads view validates if user deletes staff"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_user.is_staff = True
-        test_user.save()
-
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-threads', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "is admin and");
-
-    def test_delete_threads_view_superuser(self):
-        """delete user threads view validates if user deletes superuser"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_user.is_superuser = True
-        test_user.save()
-
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-threads', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "is admin and");
-
-    def test_delete_threads_view(self):
-        """delete user threads view deletes threads"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-threads', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        category = Category.objects.all_categories()[:1][0]
-        [post_thread(category, poster=test_user) for _ in range(10)]
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 200)
-
-        response_dict = response.json()
-        self.assertEqual(response_dict['deleted_count'], 10)
-        self.assertFalse(response_dict['is_completed'])
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 200)
-
-        response_dict = response.json()
-        self.assertEqual(response_dict['deleted_count'], 0)
-        self.assertTrue(response_dict['is_completed'])
-
-    def test_delete_posts_view_self(self):
-        """delete user posts view validates if user deletes self"""
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-posts', kwargs={
-                'pk': self.user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "delete yourself");
-
-    def test_delete_posts_view_staff(self):
-        """delete user posts view validates if user deletes staff"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_user.is_staff = True
-        test_user.save()
-
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-posts', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "is admin and");
-
-    def test_delete_posts_view_superuser(self):
-        """delete user posts view validates if user deletes superuser"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_user.is_superuser = True
-        test_user.save()
-
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-posts', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "is admin and");
-
-    def test_delete_posts_view(self):
-        """delete user posts view deletes posts"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-posts', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        category = Category.objects.all_categories()[:1][0]
-        thread = post_thread(category)
-        [reply_thread(thread, poster=test_user) for _ in range(10)]
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 200)
-
-        response_dict = response.json()
-        self.assertEqual(response_dict['deleted_count'], 10)
-        self.assertFalse(response_dict['is_completed'])
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 200)
-
-        response_dict = response.json()
-        self.assertEqual(response_dict['deleted_count'], 0)
-        self.assertTrue(response_dict['is_completed'])
-
-    def test_delete_account_view_self(self):
-        """delete user account view validates if user deletes self"""
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-account', kwargs={
-                'pk': self.user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "delete yourself");
-
-    def test_delete_account_view_staff(self):
-        """delete user account view validates if user deletes staff"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_user.is_staff = True
-        test_user.save()
-
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-account', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "is admin and");
-
-    def test_delete_account_view_superuser(self):
-        """delete user account view validates if user deletes superuser"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_user.is_superuser = True
-        test_user.save()
-
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-account', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 302)
-
-        response = self.client.get(reverse('misago:admin:index'))
-        self.assertContains(response, "is admin and");
-
-    def test_delete_account_view(self):
-        """delete user account view deletes user account"""
-        test_user = UserModel.objects.create_user('Bob', 'bob@test.com', 'pass123')
-        test_link = reverse(
-            'misago:admin:users:accounts:delete-account', kwargs={
-                'pk': test_user.pk,
-            }
-        )
-
-        response = self.client.post(test_link, **self.AJAX_HEADER)
-        self.assertEqual(response.status_code, 200)
-
-        response_dict = response.json()
-        self.assertTrue(response_dict['is_completed'])
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from misago.core.testutils import MisagoTestCase
 
 from .models import AnonymousUser, Online
+from .online.presence import mark_user_offline
 
 
 UserModel = get_user_model()
@@ -44,6 +45,7 @@ class UserTestCase(MisagoTestCase):
     def logout_user(self):
         if self.user.is_authenticated:
             Online.objects.filter(user=self.user).delete()
+            mark_user_offline(self.user)
         self.client.logout()
 
 
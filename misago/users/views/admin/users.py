@@ -1,19 +1,14 @@
 from django.contrib import messages
 from django.contrib.auth import get_user_model, update_session_auth_hash
-from django.db import transaction
-from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.utils.translation import ugettext_lazy as _
 
 from misago.admin.auth import start_admin_session
 from misago.admin.views import generic
-from misago.categories.models import Category
 from misago.conf import settings
 from misago.core.mail import mail_users
-from misago.core.pgutils import chunk_queryset
-from misago.threads.models import Thread
 from misago.users.avatars.dynamic import set_avatar as set_dynamic_avatar
-from misago.users.datadownloads import request_user_data_download, user_has_data_download_request
+from misago.users.datadownloads import request_users_data_downloads
 from misago.users.forms.admin import (
     BanUsersForm, EditUserForm, EditUserFormFactory, NewUserForm, SearchUsersForm)
 from misago.users.models import Ban
@@ -92,7 +87,6 @@ class UsersList(UserAdmin, generic.ListView):
                 "Are you sure you want to delete selected users? "
                 "This will also delete all content associated with their accounts."
             ),
-            'is_atomic': False,
         },
     ]
 
@@ -138,6 +132,7 @@ class UsersList(UserAdmin, generic.ListView):
             if form.is_valid():
                 cleaned_data = form.cleaned_data
                 banned_values = []
+                new_bans = []
 
                 ban_kwargs = {
                     'user_message': cleaned_data.get('user_message'),
@@ -183,13 +178,14 @@ class UsersList(UserAdmin, generic.ListView):
                             banned_value = '%s*' % (''.join(formats))
 
                         if banned_value and banned_value not in banned_values:
-                            ban_kwargs.update({
-                                'check_type': check_type,
-                                'banned_value': banned_value,
-                            })
-                            Ban.objects.create(**ban_kwargs)
+                            new_bans.append(Ban(
+                                check_type=check_type,
+                                banned_value=banned_value,
+                                **ban_kwargs
+                            ))
                             banned_values.append(banned_value)
 
+                Ban.objects.create_bans(new_bans)
                 Ban.objects.invalidate_cache()
                 messages.success(request, _("Selected users have been banned."))
                 return None
@@ -204,27 +200,33 @@ class UsersList(UserAdmin, generic.ListView):
         )
 
     def action_request_data_download(self, request, users):
-        for user in users:
-            if not user_has_data_download_request(user):
-                request_user_data_download(user, requester=request.user)
+        request_users_data_downloads(users, request.user)
 
         messages.success(
             request, _("Data download requests have been placed for selected users."))
 
     def action_delete_accounts(self, request, users):
-        for user in users:
-            if user == request.user:
-                raise generic.MassActionError(_("You can't delete yourself."))
-            if user.is_staff or user.is_superuser:
-                message = _("%(user)s is admin and can't be deleted.") % {'user': user.username}
-                raise generic.MassActionError(message)
-
-        for user in users:
-            user.delete()
+        self.check_users_deletion(request, users)
+        self.queue_users_deletion(users)
 
-        messages.success(request, _("Selected users have been deleted."))
+        messages.success(
+            request,
+            _("Selected users have been deactivated and will be deleted in background."),
+        )
 
     def action_delete_all(self, request, users):
+        self.check_users_deletion(request, users)
+        self.queue_users_deletion(users, delete_content=True)
+
+        messages.success(
+            request,
+            _(
+                "Selected users have been deactivated and will be deleted "
+                "together with their content in background."
+            ),
+        )
+
+    def check_users_deletion(self, request, users):
         for user in users:
             if user == request.user:
                 raise generic.MassActionError(_("You can't delete yourself."))
@@ -232,13 +234,13 @@ class UsersList(UserAdmin, generic.ListView):
                 message = _("%(user)s is admin and can't be deleted.") % {'user': user.username}
                 raise generic.MassActionError(message)
 
-        return self.render(
-            request,
-            template='misago/admin/users/delete.html',
-            context={
-                'users': users,
-            },
-        )
+    def queue_users_deletion(self, users, delete_content=False):
+        """deactivates users, leaving their deletion to deletemarkedusers command"""
+        queryset = UserModel.objects.filter(pk__in=[u.pk for u in users])
+        if delete_content:
+            queryset.update(is_active=False, is_deleting_account=True, is_deleting_content=True)
+        else:
+            queryset.update(is_active=False, is_deleting_account=True)
 
 
 class NewUser(UserAdmin, generic.ModelFormView):
@@ -333,91 +335,3 @@ class EditUser(UserAdmin, generic.ModelFormView):
         target.save()
 
         messages.success(request, self.message_submit % {'user': target.username})
-
-
-class DeletionStep(UserAdmin, generic.ButtonView):
-    is_atomic = False
-
-    def check_permissions(self, request, target):
-        if not request.is_ajax():
-            return _("This action can't be accessed directly.")
-
-        if target == request.user:
-            return _("You can't delete yourself.")
-
-        if target.is_staff or target.is_superuser:
-            return _("%(user)s is admin and can't be deleted.") % {'user': target.username}
-
-    def execute_step(self, user):
-        raise NotImplementedError(
-            "execute_step method should return dict with "
-            "number of deleted_count and is_completed keys"
-        )
-
-    def button_action(self, request, target):
-        return JsonResponse(self.execute_step(target))
-
-
-class DeleteThreadsStep(DeletionStep):
-    def execute_step(self, user):
-        recount_categories = set()
-
-        deleted_threads = 0
-        is_completed = False
-
-        for thread in user.thread_set.order_by('-id')[:50]:
-            recount_categories.add(thread.category_id)
-            with transaction.atomic():
-                thread.delete()
-                deleted_threads += 1
-
-        if recount_categories:
-            for category in Category.objects.filter(id__in=recount_categories):
-                category.synchronize()
-                category.save()
-        else:
-            is_completed = True
-
-        return {
-            'deleted_count': deleted_threads,
-            'is_completed': is_completed,
-        }
-
-
-class DeletePostsStep(DeletionStep):
-    def execute_step(self, user):
-        recount_categories = set()
-        recount_threads = set()
-
-        deleted_posts = 0
-        is_completed = False
-
-        for post in user.post_set.order_by('-id')[:50]:
-            recount_categories.add(post.category_id)
-            recount_threads.add(post.thread_id)
-            with transaction.atomic():
-                post.delete()
-                deleted_posts += 1
-
-        if recount_categories:
-            changed_threads_qs = Thread.objects.filter(id__in=recount_threads)
-            for thread in chunk_queryset(changed_threads_qs, 50):
-                thread.synchronize()
-                thread.save()
-
-            for category in Category.objects.filter(id__in=recount_categories):
-                category.synchronize()
-                category.save()
-        else:
-            is_completed = True
-
-        return {
-            'deleted_count': deleted_posts,
-            'is_completed': is_completed,
-        }
-
-
-class DeleteAccountStep(DeletionStep):
-    def execute_step(self, user):
-        user.delete(delete_content=True)
-        return {'is_completed': True}